@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Request, Depends
+
+from app.db.vocabulary import vocabulary
+from app.dependencies.internal import require_internal_token
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats(request: Request):
+    pool = request.app.state.db
+    return {"pools": pool.all_stats()}
+
+
+@router.post("/vocabulary/refresh")
+async def refresh_vocabulary(request: Request):
+    # reloads this worker's copy; other workers pick changes up within VOCAB_CACHE_TTL_SECONDS
+    vocab = await vocabulary.refresh(request.app.state.db)
+    return {"version": vocab.version}
@@ -1,18 +1,28 @@
 # app/api/item_api.py
 
-from fastapi import APIRouter, Request, HTTPException, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Body, Request, HTTPException, Depends, Query
 
 from app.dependencies.auth import get_current_user
+from app.dependencies.db import DBConnection, DBTransaction
 from app.services.item_service import (
     get_item_by_id_service,
+    get_items_by_ids_service,
     get_items_by_user_service,
     create_item_service, delete_item_service, update_item_service, get_unworn_items_service,
     get_most_worn_items_service,
 
 )
-from app.models.item_modal import ClothingItemCreate
+from app.helpers.json_response import FastJSONResponse
+from app.helpers.etag import etag_matches, get_user_etag, not_modified, set_etag
+from app.helpers.item_import import read_import_rows
+from app.models.item_modal import ClothingItemCreate, ItemBatchRequest
+from app.services.item_import_service import import_items_service
 router = APIRouter(prefix="/items", tags=["Items"])
 
+ITEMS_PAGE_MAX_SIZE = 200
+
 
 # /items/{item_id}
 
@@ -39,28 +49,53 @@ async def get_unworn_items(
     items = await get_unworn_items_service(pool, user_id, days)
     return {"items": items}
 
+# /items/batch - many items (with tags) in one call, e.g. for an outfit or a calendar day
+@router.post("/batch")
+async def get_items_batch(body: ItemBatchRequest, current_user=Depends(get_current_user), conn=DBConnection):
+    items = await get_items_by_ids_service(conn, str(current_user.id), body.item_ids)
+    return FastJSONResponse({"items": items})
+
+
 @router.get("/{item_id}")
-async def get_item_by_id(item_id: str, request: Request,current_user=Depends(get_current_user),):
-    pool = request.app.state.db
-    result = await get_item_by_id_service(pool, item_id)
+async def get_item_by_id(item_id: str, current_user=Depends(get_current_user), conn=DBConnection):
+    result = await get_item_by_id_service(conn, item_id)
 
     if not result:
         raise HTTPException(status_code=404, detail="Item not found")
 
     if str(result["user_id"]) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to access this item")
-    return {"item": result}
+    return FastJSONResponse({"item": result})
 
 
-# /items/user/{user_id}
+# /items/user/{user_id}?limit=&cursor=&category_id=&in_laundry=
+# without limit and cursor: the whole wardrobe as {"items"}, like before paging existed
 @router.get("/user/{user_id}")
-async def get_items_by_user(user_id: str, request: Request, current_user=Depends(get_current_user),):
+async def get_items_by_user(
+    user_id: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=ITEMS_PAGE_MAX_SIZE),
+    cursor: Optional[str] = None,
+    category_id: Optional[int] = None,
+    in_laundry: Optional[bool] = None,
+    current_user=Depends(get_current_user),
+):
     if str(current_user.id) != str(user_id):
         raise HTTPException(status_code=403, detail="Not allowed")
 
     pool = request.app.state.db
-    items = await get_items_by_user_service(pool, str(current_user.id))
-    return {"items": items}
+
+    # unchanged wardrobe: answer 304 without running the listing query
+    etag = await get_user_etag(pool, str(current_user.id), read_only=True)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    page = await get_items_by_user_service(
+        pool, str(current_user.id), limit, cursor, category_id, in_laundry
+    )
+    response = FastJSONResponse(page)
+    set_etag(response, etag)
+    return response
 
 @router.post("/")
 async def create_item(item: ClothingItemCreate, request: Request, current_user=Depends(get_current_user)):
@@ -71,35 +106,41 @@ async def create_item(item: ClothingItemCreate, request: Request, current_user=D
     return result
 
 
-@router.delete("/{item_id}")
-async def delete_item(item_id: str, request: Request, current_user=Depends(get_current_user),):
+# /items/import - bulk wardrobe import, NDJSON (application/x-ndjson) or CSV (text/csv) body
+@router.post("/import")
+async def import_items(request: Request, current_user=Depends(get_current_user)):
+    rows = await read_import_rows(request.stream(), request.headers.get("content-type", ""))
     pool = request.app.state.db
-    existing = await get_item_by_id_service(pool, item_id) #find user first
+    return await import_items_service(pool, str(current_user.id), rows)
+
+
+@router.delete("/{item_id}")
+async def delete_item(item_id: str, current_user=Depends(get_current_user), conn=DBTransaction):
+    # one connection + transaction for the ownership check and the delete
+    existing = await get_item_by_id_service(conn, item_id) #find user first
     if not existing:
         raise HTTPException(status_code=404, detail="Item not found")
 
     if str(existing["user_id"]) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to delete this item")
 
-    await delete_item_service(pool, item_id)
+    await delete_item_service(conn, item_id, str(current_user.id))
     return {"message": "Item deleted"}
 
 
+# the body is a declared parameter, so it is read before the connection is acquired
 @router.patch("/{item_id}")
-async def update_item(item_id: str, request: Request, current_user=Depends(get_current_user),):
-    pool = request.app.state.db
-    existing = await get_item_by_id_service(pool, item_id)
+async def update_item(item_id: str, data: dict = Body(...), current_user=Depends(get_current_user), conn=DBTransaction):
+    existing = await get_item_by_id_service(conn, item_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Item not found")
 
     if str(existing["user_id"]) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to update this item")
 
-    data = await request.json()
-
     if "user_id" in data and str(data["user_id"]) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Cannot change user_id")
 
-    result = await update_item_service(pool, item_id, data)
+    result = await update_item_service(conn, item_id, data, existing)
     return result
 
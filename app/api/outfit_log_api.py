@@ -4,6 +4,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 
 from app.dependencies.auth import get_current_user
+from app.helpers.json_response import RawJSONResponse
 from app.services.log_outfit_service import log_outfit_service, get_logged_outfits_month_service, \
     get_logged_outfits_day_service, delete_logged_outfit_service
 
@@ -66,4 +67,4 @@ async def get_logged_outfits_day(request: Request, user_id: str, date_str: str,
     if str(user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed")
     pool = request.app.state.db
-    return await get_logged_outfits_day_service(pool, user_id, date_str)
\ No newline at end of file
+    return RawJSONResponse(await get_logged_outfits_day_service(pool, user_id, date_str))
\ No newline at end of file
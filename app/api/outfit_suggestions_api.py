@@ -1,13 +1,18 @@
+import os
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Depends
 from pydantic import BaseModel
 
 from app.dependencies.auth import get_current_user
+from app.helpers.deadline import run_with_deadline
+from app.helpers.json_response import FastJSONResponse
 from app.services.outfit_suggestions_service import get_outfit_suggestions_service
 
 router = APIRouter(prefix="/outfitSuggestions", tags=["OutfitSuggestions"])
 
+SUGGESTIONS_DEADLINE_SECONDS = float(os.getenv("SUGGESTIONS_DEADLINE_SECONDS", "20"))
+
 class SuggestionRequest(BaseModel):
     user_id: str
     lat: float
@@ -20,12 +25,22 @@ async def get_outfit_suggestions(payload: SuggestionRequest, request: Request,
         raise HTTPException(status_code=403, detail="Token user does not match payload user_id")
     pool = request.app.state.db
     try:
-        return await get_outfit_suggestions_service(
-            pool=pool,
-            lat=payload.lat,
-            lon=payload.lon,
-            user_id=payload.user_id,
-            occasion_id = payload.master_occasion_id
+        # stop working (and free the DB) if the app gives up or the deadline passes
+        # FastJSONResponse: items carry NumPy vectors in pgvector mode
+        result = await run_with_deadline(
+            request,
+            get_outfit_suggestions_service(
+                pool=pool,
+                http=request.app.state.http,
+                lat=payload.lat,
+                lon=payload.lon,
+                user_id=payload.user_id,
+                occasion_id = payload.master_occasion_id
+            ),
+            SUGGESTIONS_DEADLINE_SECONDS,
         )
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,8 @@
 # app/routes/category_api.py
-from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 
 from app.dependencies.auth import get_current_user
+from app.helpers.etag import etag_matches, get_user_etag, not_modified, set_etag
 from app.services.subcategory_service import (
     get_subcategories_service,
     create_subcategory_service, delete_subcategory_service, get_all_user_subcategories_service,
@@ -12,6 +13,7 @@ router = APIRouter(prefix="/subcategories", tags=["Subcategories"])
 @router.get("/")
 async def get_subcategories_api(
     request: Request,
+    response: Response,
     user_id: str,
     category_id: int,
     current_user=Depends(get_current_user),
@@ -19,17 +21,30 @@ async def get_subcategories_api(
     if str(user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed")
     pool = request.app.state.db
+
+    etag = await get_user_etag(pool, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return await get_subcategories_service(pool, user_id, category_id)
 
 @router.get("/all")
 async def get_all_user_subcategories_api(
     request: Request,
+    response: Response,
     user_id: str,
     current_user=Depends(get_current_user)
 ):
     if str(user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed")
     pool = request.app.state.db
+
+    etag = await get_user_etag(pool, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return await get_all_user_subcategories_service(pool, user_id)
 
 @router.post("/create_subcategory")
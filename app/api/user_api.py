@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request, HTTPException, UploadFile, File, Depends
 
 from app.dependencies.auth import get_current_user
+from app.helpers.json_response import FastJSONResponse
 from app.services.user_service import delete_my_account_service, create_user_service
 from app.services.virtual_try_on_image_service import (
     upload_tryon_image_service,
@@ -22,7 +23,8 @@ async def ensure_profile(
     if not user:
         raise HTTPException(status_code=500, detail="Failed to create user profile")
 
-    return {"user": user}
+    # the row includes style_vec, a NumPy array in pgvector mode
+    return FastJSONResponse({"user": user})
 
 
 @router.post("/{user_id}/tryon-image")
@@ -37,13 +39,13 @@ async def upload_user_tryon_image(
 
     file_bytes = await file.read()
 
-    async with request.app.state.db.acquire() as conn:
-        return await upload_tryon_image_service(
-            conn=conn,
-            user_id=user_id,
-            file_content_type=file.content_type,
-            file_bytes=file_bytes,
-        )
+    return await upload_tryon_image_service(
+        pool=request.app.state.db,
+        storage=request.app.state.storage,
+        user_id=user_id,
+        file_content_type=file.content_type,
+        file_bytes=file_bytes,
+    )
 
 
 @router.get("/{user_id}/tryon-image")
@@ -55,8 +57,7 @@ async def get_user_tryon_image(
     if str(user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    async with request.app.state.db.acquire() as conn:
-        return await get_tryon_image_service(conn, user_id)
+    return await get_tryon_image_service(request.app.state.db, request.app.state.storage, user_id)
 
 
 @router.delete("/{user_id}/tryon-image")
@@ -68,8 +69,7 @@ async def delete_user_tryon_image(
     if str(user_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    async with request.app.state.db.acquire() as conn:
-        return await delete_tryon_image_service(conn, user_id)
+    return await delete_tryon_image_service(request.app.state.db, request.app.state.storage, user_id)
 
 @router.delete("/me")
 async def delete_my_account(
@@ -6,12 +6,15 @@ from fastapi import APIRouter, HTTPException, Request, Depends
 from pydantic import BaseModel
 
 from app.dependencies.auth import get_current_user
+from app.helpers.deadline import run_with_deadline
 from app.services.virtual_try_on_service import quick_try_on_service
 
 load_dotenv()
 
 router = APIRouter(prefix="/virtual_tryon", tags=["virtual_tryon"])
 
+TRYON_DEADLINE_SECONDS = float(os.getenv("TRYON_DEADLINE_SECONDS", "90"))
+
 
 class QuickTryOnRequest(BaseModel):
     user_id: str
@@ -33,8 +36,17 @@ async def quick_try_on(
         raise HTTPException(status_code=403, detail="Token user does not match payload user_id")
 
     try:
-        async with request.app.state.db.acquire() as conn:
-            return await quick_try_on_service(conn, payload)
+        # the Gemini call is slow, drop it if the user leaves the screen
+        return await run_with_deadline(
+            request,
+            quick_try_on_service(
+                request.app.state.db,
+                request.app.state.http,
+                request.app.state.storage,
+                payload,
+            ),
+            TRYON_DEADLINE_SECONDS,
+        )
 
     except HTTPException:
         raise
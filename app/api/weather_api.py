@@ -1,8 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from app.services.weather_service import get_weather_service
 
 router = APIRouter(prefix="/weather", tags=["Weather"])
 
 @router.get("/")
-async def get_weather_api(lat: float, lon: float):
-    return await get_weather_service(lat, lon)
+async def get_weather_api(request: Request, lat: float, lon: float):
+    return await get_weather_service(request.app.state.http, lat, lon)
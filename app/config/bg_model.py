@@ -0,0 +1,20 @@
+import os
+
+from rembg import new_session
+
+BG_MODEL_NAME = os.getenv("BG_MODEL_NAME", "u2net")
+
+_session = None
+
+
+def get_bg_session():
+    """
+    Background removal session, loaded once per process.
+    Under gunicorn with several workers it is loaded in the master before fork
+    (see gunicorn.conf.py, which also caps its threads), so workers share the
+    model pages copy-on-write instead of loading their own.
+    """
+    global _session
+    if _session is None:
+        _session = new_session(BG_MODEL_NAME)
+    return _session
@@ -0,0 +1,39 @@
+import os
+
+import httpx
+
+from app.db.connection import DB_DEBUG_HELD_CONNECTIONS, warn_if_connection_held
+
+# Outbound HTTP settings (weather API, image downloads, ...)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+
+async def _check_held_connection(request: httpx.Request):
+    warn_if_connection_held(f"HTTP {request.method} {request.url.host}")
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    One pooled client per app.
+    Created on startup and shared by every outbound call so connections are reused.
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        follow_redirects=True,
+        event_hooks={"request": [_check_held_connection]} if DB_DEBUG_HELD_CONNECTIONS else None,
+    )
+
+
+async def close_http_client(client: httpx.AsyncClient):
+    await client.aclose()
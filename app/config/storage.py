@@ -0,0 +1,28 @@
+import os
+from urllib.parse import urlparse
+
+from app.storage.storage_backend import StorageBackend
+
+# "supabase" (default) or "local"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "local_storage")
+LOCAL_STORAGE_BASE_URL = os.getenv("LOCAL_STORAGE_BASE_URL", "/local_storage")
+# path main.py serves LOCAL_STORAGE_DIR under, e.g. "/files" for "https://cdn.example.com/files"
+LOCAL_STORAGE_MOUNT_PATH = urlparse(LOCAL_STORAGE_BASE_URL).path.rstrip("/")
+
+if STORAGE_BACKEND == "local" and not LOCAL_STORAGE_MOUNT_PATH:
+    raise RuntimeError("LOCAL_STORAGE_BASE_URL needs a path, e.g. /local_storage")
+
+
+def create_storage() -> StorageBackend:
+    if STORAGE_BACKEND == "local":
+        from app.storage.local_storage import LocalStorage
+        return LocalStorage(LOCAL_STORAGE_DIR, LOCAL_STORAGE_BASE_URL)
+
+    if STORAGE_BACKEND == "supabase":
+        # imported lazily so the local backend works without Supabase env vars
+        from app.config.supabase_client import supabase
+        from app.storage.supabase_storage import SupabaseStorage
+        return SupabaseStorage(supabase)
+
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
@@ -1,15 +1,289 @@
-import asyncpg
+import asyncio
+import logging
 import os
+import time
+from contextvars import ContextVar
+
+import asyncpg
+import orjson
 from dotenv import load_dotenv
 
+from app.db.pgvector import PGVECTOR_ENABLED, register_vector_codec
+from app.db.queries import DB_POOL_MODE, pool_options
+
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica, replica tolerant reads go here when it is set
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
 
-import asyncpg
+# Pool sizing - keep max_size (x workers) under the Supabase connection limit
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# a connection is replaced after this many queries
+DB_POOL_MAX_QUERIES = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
+# idle connections are closed after this many seconds (0 disables)
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+DB_POOL_WARM_UP = os.getenv("DB_POOL_WARM_UP", "true").lower() == "true"
+# default statement_timeout for every connection (unset = server default)
+DB_STATEMENT_TIMEOUT_MS = os.getenv("DB_STATEMENT_TIMEOUT_MS")
+DB_REPLICA_POOL_MIN_SIZE = int(os.getenv("DB_REPLICA_POOL_MIN_SIZE", str(DB_POOL_MIN_SIZE)))
+DB_REPLICA_POOL_MAX_SIZE = int(os.getenv("DB_REPLICA_POOL_MAX_SIZE", str(DB_POOL_MAX_SIZE)))
 
-async def connect_to_db():
+# Debug: warn when a task keeps a pooled connection checked out across external I/O
+DB_DEBUG_HELD_CONNECTIONS = os.getenv("DB_DEBUG_HELD_CONNECTIONS", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+# Absolute end (time.monotonic()) of the current request's deadline, set by
+# helpers/deadline.py. In session mode a connection acquired under it gets
+# statement_timeout = the time left; RESET ALL on release puts it back.
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def statement_timeout_left_ms() -> int | None:
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    # at least 1 ms: statement_timeout = 0 would mean no timeout at all
+    return max(1, int((deadline - time.monotonic()) * 1000))
+
+# upper bounds (ms) of the acquire latency histogram
+ACQUIRE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Counters for pool.acquire(): how long callers wait and how many are waiting."""
+
+    def __init__(self):
+        self.acquired_total = 0
+        self.timeouts_total = 0
+        self.waiting = 0
+        self.max_wait_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.bucket_counts = [0] * (len(ACQUIRE_BUCKETS_MS) + 1)  # last one is +Inf
+
+    def observe(self, wait_ms: float) -> None:
+        self.acquired_total += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+        for i, upper in enumerate(ACQUIRE_BUCKETS_MS):
+            if wait_ms <= upper:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def histogram(self) -> dict:
+        # cumulative counts, prometheus style
+        result = {}
+        running = 0
+        for upper, count in zip(ACQUIRE_BUCKETS_MS, self.bucket_counts):
+            running += count
+            result[f"le_{upper}ms"] = running
+        result["le_inf"] = running + self.bucket_counts[-1]
+        return result
+
+
+# task -> acquire timestamps of the connections it currently holds
+_held_connections: dict[asyncio.Task, list[float]] = {}
+
+
+def _track_acquire() -> None:
+    task = asyncio.current_task()
+    if task is not None:
+        _held_connections.setdefault(task, []).append(time.perf_counter())
+
+
+def _track_release() -> None:
+    task = asyncio.current_task()
+    held = _held_connections.get(task)
+    if held:
+        held.pop()
+        if not held:
+            del _held_connections[task]
+
+
+def warn_if_connection_held(operation: str) -> None:
+    """
+    Call right before slow external I/O (HTTP, storage, model calls).
+    With DB_DEBUG_HELD_CONNECTIONS on, logs a warning if the current task still
+    holds a pooled connection, because the connection sits idle for the whole call.
+    """
+    if not DB_DEBUG_HELD_CONNECTIONS:
+        return
+
+    held = _held_connections.get(asyncio.current_task())
+    if held:
+        held_ms = (time.perf_counter() - held[0]) * 1000
+        logger.warning(
+            "DB connection held across external I/O (%s): %d connection(s), held for %.0f ms",
+            operation,
+            len(held),
+            held_ms,
+        )
+
+
+class _MeteredAcquire:
+    def __init__(self, pool: "MeteredPool", timeout: float | None):
+        self.pool = pool
+        self.timeout = timeout
+        self.conn = None
+
+    async def __aenter__(self):
+        metrics = self.pool.metrics
+        metrics.waiting += 1
+        started = time.perf_counter()
+        try:
+            self.conn = await self.pool.raw.acquire(timeout=self.timeout)
+        except asyncio.TimeoutError:
+            metrics.timeouts_total += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        metrics.observe((time.perf_counter() - started) * 1000)
+
+        timeout_ms = statement_timeout_left_ms()
+        if timeout_ms is not None and DB_POOL_MODE == "session":
+            # behind the transaction pooler a session SET would leak to other clients,
+            # there the task cancellation (asyncpg sends a cancel request) does the job
+            try:
+                await self.conn.execute("SELECT set_config('statement_timeout', $1, false)", str(timeout_ms))
+            except BaseException:
+                await self.pool.raw.release(self.conn)
+                raise
+
+        if DB_DEBUG_HELD_CONNECTIONS:
+            _track_acquire()
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if DB_DEBUG_HELD_CONNECTIONS:
+            _track_release()
+        await self.pool.raw.release(self.conn)
+
+
+class MeteredPool:
+    """
+    Thin wrapper around asyncpg.Pool that records acquire wait times.
+    Services keep using `async with pool.acquire() as conn`.
+
+    Services whose reads can tolerate replica lag declare it with
+    `pool.acquire(read_only=True)`; those go to the replica pool when one is
+    configured and to the primary otherwise. Reads that must see the caller's
+    own writes keep using the plain acquire().
+    """
+
+    def __init__(self, pool: asyncpg.Pool, name: str = "primary", replica: "MeteredPool | None" = None):
+        self.raw = pool
+        self.name = name
+        self.replica = replica
+        self.metrics = PoolMetrics()
+
+    def acquire(self, *, timeout: float | None = DB_POOL_ACQUIRE_TIMEOUT, read_only: bool = False):
+        if read_only and self.replica is not None:
+            return self.replica.acquire(timeout=timeout)
+        return _MeteredAcquire(self, timeout)
+
+    async def close(self):
+        if self.replica is not None:
+            await self.replica.close()
+        await self.raw.close()
+
+    def __getattr__(self, item):
+        # close(), get_size(), fetch(), ... go straight to asyncpg
+        return getattr(self.raw, item)
+
+    def all_stats(self) -> list[dict]:
+        stats = [self.stats()]
+        if self.replica is not None:
+            stats.append(self.replica.stats())
+        return stats
+
+    def stats(self) -> dict:
+        size = self.raw.get_size()
+        idle = self.raw.get_idle_size()
+        metrics = self.metrics
+        return {
+            "name": self.name,
+            "min_size": self.raw.get_min_size(),
+            "max_size": self.raw.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": metrics.waiting,
+            "acquired_total": metrics.acquired_total,
+            "acquire_timeouts_total": metrics.timeouts_total,
+            "acquire_wait_ms": {
+                "avg": round(metrics.total_wait_ms / metrics.acquired_total, 3) if metrics.acquired_total else 0.0,
+                "max": round(metrics.max_wait_ms, 3),
+                "histogram": metrics.histogram(),
+            },
+        }
+
+
+async def warm_up_pool(pool: MeteredPool) -> None:
+    """
+    Check out min_size connections at once and run a trivial query on each,
+    so TLS + auth are done before the first real request arrives.
+    """
+    count = pool.raw.get_min_size()
+    if count <= 0:
+        return
+
+    conns = await asyncio.gather(*(pool.raw.acquire() for _ in range(count)))
+    try:
+        await asyncio.gather(*(conn.execute("SELECT 1") for conn in conns))
+    finally:
+        for conn in conns:
+            await pool.raw.release(conn)
+
+
+def _encode_json(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(conn) -> None:
+    # json / jsonb columns (json_agg, ...) arrive as Python objects, decoded by orjson
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, schema="pg_catalog", encoder=_encode_json, decoder=orjson.loads, format="text"
+        )
+    if PGVECTOR_ENABLED:
+        await register_vector_codec(conn)
+
+
+async def _create_pool(dsn: str, name: str, min_size: int, max_size: int) -> MeteredPool:
     # Supabase requires SSL
-    return await asyncpg.create_pool(DATABASE_URL, ssl="require")
+    pool = await asyncpg.create_pool(
+        dsn,
+        ssl="require",
+        min_size=min_size,
+        max_size=max_size,
+        max_queries=DB_POOL_MAX_QUERIES,
+        max_inactive_connection_lifetime=DB_POOL_MAX_IDLE_SECONDS,
+        server_settings={"statement_timeout": DB_STATEMENT_TIMEOUT_MS} if DB_STATEMENT_TIMEOUT_MS else None,
+        init=_init_connection,
+        **pool_options(),
+    )
+    pool = MeteredPool(pool, name)
+
+    if DB_POOL_WARM_UP:
+        await warm_up_pool(pool)
+
+    return pool
+
+
+async def connect_to_db():
+    pool = await _create_pool(DATABASE_URL, "primary", DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE)
+
+    if DATABASE_REPLICA_URL:
+        pool.replica = await _create_pool(
+            DATABASE_REPLICA_URL, "replica", DB_REPLICA_POOL_MIN_SIZE, DB_REPLICA_POOL_MAX_SIZE
+        )
+
+    return pool
 
 
 async def close_db(pool):
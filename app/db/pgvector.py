@@ -0,0 +1,67 @@
+"""
+Optional pgvector backend (VECTOR_BACKEND=pgvector).
+
+With migrations/006 applied, attr_vector, outfit_vec and style_vec are
+`vector` columns and the suggestion engine asks Postgres for a per-category
+shortlist ranked against the user's style vector (items.shortlist_by_style)
+instead of scoring the whole wardrobe in Python.
+
+The codec below uses pgvector's binary format, so `vector` values decode
+straight into contiguous float32 NumPy arrays and encode back from them (or
+from any sequence of numbers) without a text round trip. COPY works with it
+too. In the default mode the columns are Postgres arrays, which asyncpg does
+not allow custom codecs for; services turn them into arrays with as_vector().
+"""
+import os
+import struct
+
+import numpy as np
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "python").lower()
+
+if VECTOR_BACKEND not in ("python", "pgvector"):
+    raise RuntimeError(f"Unknown VECTOR_BACKEND: {VECTOR_BACKEND}")
+
+PGVECTOR_ENABLED = VECTOR_BACKEND == "pgvector"
+
+# items per category the shortlist query returns (pick_top_k then picks among the best 6)
+SUGGESTIONS_SHORTLIST_SIZE = int(os.getenv("SUGGESTIONS_SHORTLIST_SIZE", "12"))
+
+
+# binary vector: dimensions (uint16), unused (uint16), then big-endian float32s
+_HEADER = struct.Struct("!HH")
+
+
+def encode_vector(value) -> bytes:
+    data = np.asarray(value, dtype=">f4")
+    return _HEADER.pack(len(data), 0) + data.tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    dim, _ = _HEADER.unpack_from(data)
+    # astype: native byte order, contiguous and writable
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=_HEADER.size).astype(np.float32)
+
+
+def to_db_vector(vec: np.ndarray):
+    """Parameter for a vector column: the array itself for the codec, a list for a Postgres array."""
+    return vec if PGVECTOR_ENABLED else vec.tolist()
+
+
+async def register_vector_codec(conn) -> None:
+    # the extension may live outside public (Supabase installs it in "extensions")
+    schema = await conn.fetchval(
+        """
+        SELECT n.nspname
+        FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = 'vector'
+        LIMIT 1;
+        """
+    )
+    if schema is None:
+        raise RuntimeError("VECTOR_BACKEND=pgvector but the vector extension is not installed (migrations/006)")
+
+    await conn.set_type_codec(
+        "vector", schema=schema, encoder=encode_vector, decoder=decode_vector, format="binary"
+    )
@@ -0,0 +1,500 @@
+"""
+Central registry of named SQL for the hot paths.
+
+Two modes (DB_POOL_MODE):
+- "session": direct / session pooled connection. Each statement is prepared
+  once per connection and reused, so parse + plan is paid once.
+- "transaction": behind Supabase's transaction mode pooler (port 6543).
+  Server side prepared statements are not safe there, so the pool runs with
+  asyncpg's statement cache disabled and queries go out as unnamed statements.
+"""
+import os
+
+import asyncpg
+
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "session").lower()
+
+if DB_POOL_MODE not in ("session", "transaction"):
+    raise RuntimeError(f"Unknown DB_POOL_MODE: {DB_POOL_MODE}")
+
+
+# Wear stats come from item_wear_stats (migrations/002). Future dated logs wait in
+# item_wear_pending; the ones that are already due are added here on read so
+# reads never write (and can run on the replica).
+_DUE_PENDING_FOR_ITEM = """
+    SELECT COUNT(*)::int AS wear_count,
+           MIN(p.worn_at) AS first_worn_at,
+           MAX(p.worn_at) AS last_worn_at
+    FROM item_wear_pending p
+    WHERE p.item_id = ci.id
+      AND p.worn_at <= NOW()
+"""
+
+# Item row + wear stats (ignoring future logs) + every tag family as an array,
+# in one statement. Correlated array_agg subqueries instead of joins so the tag
+# families do not multiply each other's rows.
+_ITEM_DETAIL_SELECT = """
+    SELECT ci.*,
+           GREATEST(ws.last_worn_at, due.last_worn_at) AS last_worn_at,
+           LEAST(ws.first_worn_at, due.first_worn_at) AS first_worn_at,
+           COALESCE(ws.wear_count, 0) + COALESCE(due.wear_count, 0) AS wear_count,
+           COALESCE((
+               SELECT array_agg(c.name ORDER BY c.name)
+               FROM ItemColors ic
+               JOIN Colors c ON c.id = ic.color_id
+               WHERE ic.item_id = ci.id
+           ), '{}') AS colors,
+           COALESCE((
+               SELECT array_agg(m.name ORDER BY m.name)
+               FROM ItemMaterials im
+               JOIN Materials m ON m.id = im.material_id
+               WHERE im.item_id = ci.id
+           ), '{}') AS materials,
+           COALESCE((
+               SELECT array_agg(s.name ORDER BY s.name)
+               FROM ItemSeasons is2
+               JOIN Seasons s ON s.id = is2.season_id
+               WHERE is2.item_id = ci.id
+           ), '{}') AS seasons,
+           COALESCE((
+               SELECT array_agg(o.name ORDER BY o.name)
+               FROM ItemOccasions io
+               JOIN Occasions o ON o.id = io.occasion_id
+               WHERE io.item_id = ci.id
+           ), '{}') AS occasions
+    FROM ClothingItems ci
+    LEFT JOIN item_wear_stats ws ON ws.item_id = ci.id
+    LEFT JOIN LATERAL (""" + _DUE_PENDING_FOR_ITEM + """) due ON TRUE
+"""
+
+# Columns the wardrobe grid needs, last_worn_at ignoring future logs
+_ITEM_LIST_SELECT = """
+    SELECT ci.id,
+           ci.user_id,
+           ci.img_description,
+           ci.image_url,
+           ci.processed_img_url,
+           ci.category,
+           ci.category_id,
+           ci.subcategory_id,
+           ci.in_laundry,
+           ci.created_at,
+           GREATEST(ws.last_worn_at, due.last_worn_at) AS last_worn_at
+    FROM ClothingItems ci
+    LEFT JOIN item_wear_stats ws ON ws.item_id = ci.id
+    LEFT JOIN LATERAL (""" + _DUE_PENDING_FOR_ITEM + """) due ON TRUE
+"""
+
+# Shared filter of the suggestion queries: $1 user, $2 season names, $3 optional occasion
+_SUGGESTION_ITEMS_WHERE = """
+        WHERE ci.user_id = $1
+          AND (ci.in_laundry IS NULL OR ci.in_laundry = FALSE)
+
+          -- Season filter:
+          AND (
+                -- no season tags => allow
+                NOT EXISTS (
+                    SELECT 1
+                    FROM ItemSeasons is2
+                    WHERE is2.item_id = ci.id
+                )
+                OR EXISTS (
+                    SELECT 1
+                    FROM ItemSeasons is2
+                    JOIN Seasons s ON s.id = is2.season_id
+                    WHERE is2.item_id = ci.id
+                      AND s.name = ANY($2::text[])
+                )
+              )
+
+          -- Occasion filter: only if occasion_id is provided
+          AND (
+                $3::uuid IS NULL
+                OR EXISTS (
+                    SELECT 1
+                    FROM ItemOccasions io
+                    JOIN Occasions o ON o.id = io.occasion_id
+                    WHERE io.item_id = ci.id
+                      AND o.mapped_occasion_id = $3::uuid
+                )
+              )
+"""
+
+QUERIES: dict[str, str] = {
+    # ITEMS
+    "item.by_id": _ITEM_DETAIL_SELECT + """
+        WHERE ci.id = $1;
+    """,
+    # many items at once, only the caller's, in the order they were asked for
+    "items.by_ids": _ITEM_DETAIL_SELECT + """
+        WHERE ci.id = ANY($1::uuid[])
+          AND ci.user_id = $2::uuid
+        ORDER BY array_position($1::uuid[], ci.id);
+    """,
+    # Wardrobe listing, keyset paginated on (created_at, id) newest first.
+    # Slim columns only (no attr_vector); $2/$3 optional category / laundry filters, $4 page size.
+    "items.by_user": _ITEM_LIST_SELECT + """
+        WHERE ci.user_id = $1
+          AND ($2::int IS NULL OR ci.category_id = $2)
+          AND ($3::boolean IS NULL OR COALESCE(ci.in_laundry, FALSE) = $3)
+        ORDER BY ci.created_at DESC, ci.id DESC
+        LIMIT $4;
+    """,
+    # next pages: rows strictly after the cursor ($5, $6)
+    "items.by_user_after": _ITEM_LIST_SELECT + """
+        WHERE ci.user_id = $1
+          AND ($2::int IS NULL OR ci.category_id = $2)
+          AND ($3::boolean IS NULL OR COALESCE(ci.in_laundry, FALSE) = $3)
+          AND (ci.created_at, ci.id) < ($5::timestamptz, $6::uuid)
+        ORDER BY ci.created_at DESC, ci.id DESC
+        LIMIT $4;
+    """,
+    "items.unworn": """
+        SELECT
+            ci.id,
+            ci.image_url,
+            ci.processed_img_url,
+            ci.img_description,
+            GREATEST(ws.last_worn_at, due.last_worn_at) AS last_worn_at
+        FROM ClothingItems ci
+        LEFT JOIN item_wear_stats ws ON ws.item_id = ci.id
+        LEFT JOIN LATERAL (""" + _DUE_PENDING_FOR_ITEM + """) due ON TRUE
+        WHERE ci.user_id = $1
+          AND (
+                GREATEST(ws.last_worn_at, due.last_worn_at) IS NULL
+                OR GREATEST(ws.last_worn_at, due.last_worn_at) < $2
+              )
+        ORDER BY last_worn_at NULLS FIRST
+    """,
+    "items.most_worn": """
+        WITH due AS (
+            SELECT p.item_id, COUNT(*)::int AS wear_count, MAX(p.worn_at) AS last_worn_at
+            FROM item_wear_pending p
+            WHERE p.user_id = $1
+              AND p.worn_at <= NOW()
+            GROUP BY p.item_id
+        )
+        SELECT
+            ci.id,
+            ci.image_url,
+            ci.img_description,
+            COALESCE(ws.wear_count, 0) + COALESCE(due.wear_count, 0) AS wear_count,
+            GREATEST(ws.last_worn_at, due.last_worn_at) AS last_worn_at
+        FROM ClothingItems ci
+        LEFT JOIN item_wear_stats ws ON ws.item_id = ci.id
+        LEFT JOIN due ON due.item_id = ci.id
+        WHERE ci.user_id = $1
+          AND (ws.wear_count > 0 OR due.wear_count > 0)
+        ORDER BY wear_count DESC, last_worn_at DESC
+        LIMIT $2;
+    """,
+
+    # SUGGESTIONS
+    # Items not in laundry, matching the season (or untagged) and optionally the occasion
+    "items.for_suggestions": """
+        SELECT DISTINCT ci.*
+        FROM ClothingItems ci
+""" + _SUGGESTION_ITEMS_WHERE + """;
+    """,
+
+    # VECTOR_BACKEND=pgvector (migrations/006): same items, ranked per category against
+    # the style vector ($4) in Postgres, only the best $5 of each category come back.
+    # Vectors of another length (older schema) or all zeros rank last, without a score.
+    "items.shortlist_by_style": """
+        SELECT *
+        FROM (
+            SELECT ci.*,
+                   1 - d.distance AS style_score,
+                   row_number() OVER (
+                       PARTITION BY ci.category_id
+                       ORDER BY d.distance ASC NULLS LAST, ci.created_at DESC
+                   ) AS slot_rank
+            FROM ClothingItems ci
+            CROSS JOIN LATERAL (
+                SELECT CASE
+                    WHEN vector_dims(ci.attr_vector) = vector_dims($4::vector)
+                     AND vector_norm(ci.attr_vector) > 0
+                     AND vector_norm($4::vector) > 0
+                    THEN ci.attr_vector <=> $4::vector
+                END AS distance
+            ) d
+""" + _SUGGESTION_ITEMS_WHERE + """
+        ) ranked
+        WHERE ranked.slot_rank <= $5;
+    """,
+
+    # WEAR LOG
+    "wear_log.insert": """
+        INSERT INTO outfit_wear_log (worn_at, outfit_id)
+        VALUES ($1, $2)
+        RETURNING id::text AS wear_log_id, outfit_id::text;
+    """,
+    "wear_log.month": """
+        SELECT (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date AS date,
+               COUNT(*)::int AS count
+        FROM outfit_wear_log owl
+        JOIN Outfits o ON o.id = owl.outfit_id
+        WHERE o.user_id = $1::uuid
+          AND (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date BETWEEN $2 AND $3
+        GROUP BY 1
+        ORDER BY 1;
+    """,
+    # the whole response document, rendered by Postgres and returned as text
+    # (::text so the pool's json codec leaves it alone); the API sends it as is
+    "wear_log.day": """
+        SELECT COALESCE(json_agg(day_log ORDER BY day_log.worn_at DESC), '[]'::json)::text
+        FROM (
+            SELECT
+              owl.id::text AS wear_log_id,
+              owl.worn_at,
+              o.id::text AS outfit_id,
+
+              COALESCE(
+                json_agg(
+                  json_build_object(
+                    'item_id', ci.id::text,
+                    'image_url', ci.image_url,
+                    'category', ci.category,
+                    'position', oi.position
+                  )
+                  ORDER BY oi.position
+                ) FILTER (WHERE ci.id IS NOT NULL),
+                '[]'::json
+              ) AS items
+
+            FROM outfit_wear_log owl
+            JOIN Outfits o ON o.id = owl.outfit_id
+            LEFT JOIN OutfitItems oi ON oi.outfit_id = o.id
+            LEFT JOIN ClothingItems ci ON ci.id = oi.item_id
+
+            WHERE o.user_id = $1::uuid
+              AND (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date = $2
+
+            GROUP BY owl.id, owl.worn_at, o.id
+        ) day_log;
+    """,
+    "outfits.favorites": """
+        SELECT json_build_object(
+            'outfits',
+            COALESCE(
+                json_agg(
+                    json_build_object(
+                        'outfit_id', fav.outfit_id,
+                        'outfit_name', fav.outfit_name,
+                        'master_occasion_id', fav.master_occasion_id,
+                        'occasion_name', fav.occasion_name,
+                        'items', fav.items
+                    )
+                    ORDER BY fav.created_at DESC
+                ),
+                '[]'::json
+            )
+        )::text
+        FROM (
+            SELECT
+              o.id::text AS outfit_id,
+              o.name AS outfit_name,
+              o.master_occasion_id::text AS master_occasion_id,
+              om.name AS occasion_name,
+              COALESCE(
+                json_agg(
+                  json_build_object(
+                    'item_id', ci.id::text,
+                    'image_url', ci.image_url,
+                    'position', oi.position
+                  )
+                  ORDER BY oi.position
+                ) FILTER (WHERE ci.id IS NOT NULL),
+                '[]'::json
+              ) AS items,
+              o.created_at
+            FROM Outfits o
+            LEFT JOIN occasions_master om ON om.id = o.master_occasion_id
+            LEFT JOIN OutfitItems oi ON oi.outfit_id = o.id
+            LEFT JOIN ClothingItems ci ON ci.id = oi.item_id
+            WHERE o.user_id = $1
+              AND o.is_favorite = TRUE
+            GROUP BY o.id, o.name, o.master_occasion_id, om.name
+        ) fav;
+    """,
+    "wear_log.owned_by_user": """
+        SELECT
+            owl.id,
+            owl.outfit_id,
+            owl.worn_at,
+            EXISTS (
+                SELECT 1 FROM item_wear_pending p WHERE p.wear_log_id = owl.id
+            ) AS pending
+        FROM outfit_wear_log owl
+        JOIN Outfits o ON o.id = owl.outfit_id
+        WHERE owl.id = $1::uuid
+          AND o.user_id = $2::uuid;
+    """,
+    "wear_log.delete": """
+        DELETE FROM outfit_wear_log
+        WHERE id = $1::uuid;
+    """,
+
+    # WEAR STATS (item_wear_stats / item_wear_pending, see migrations/002)
+    # one more wear for every item of outfit $1, worn at $2
+    "wear_stats.add_log": """
+        INSERT INTO item_wear_stats AS ws (item_id, user_id, wear_count, first_worn_at, last_worn_at)
+        SELECT DISTINCT oi.item_id, ci.user_id, 1, $2::timestamptz, $2::timestamptz
+        FROM OutfitItems oi
+        JOIN ClothingItems ci ON ci.id = oi.item_id
+        WHERE oi.outfit_id = $1
+        ON CONFLICT (item_id) DO UPDATE
+        SET wear_count = ws.wear_count + 1,
+            first_worn_at = LEAST(ws.first_worn_at, EXCLUDED.first_worn_at),
+            last_worn_at = GREATEST(ws.last_worn_at, EXCLUDED.last_worn_at);
+    """,
+    # future dated log $1 of outfit $2: counted once $3 has passed
+    "wear_stats.add_pending": """
+        INSERT INTO item_wear_pending (wear_log_id, item_id, user_id, worn_at)
+        SELECT DISTINCT $1::uuid, oi.item_id, ci.user_id, $3::timestamptz
+        FROM OutfitItems oi
+        JOIN ClothingItems ci ON ci.id = oi.item_id
+        WHERE oi.outfit_id = $2
+        ON CONFLICT DO NOTHING;
+    """,
+    # fold the user's pending logs that are now due into the stats
+    "wear_stats.apply_due": """
+        WITH due AS (
+            DELETE FROM item_wear_pending
+            WHERE user_id = $1::uuid
+              AND worn_at <= NOW()
+            RETURNING item_id, user_id, worn_at
+        )
+        INSERT INTO item_wear_stats AS ws (item_id, user_id, wear_count, first_worn_at, last_worn_at)
+        SELECT item_id, user_id, COUNT(*), MIN(worn_at), MAX(worn_at)
+        FROM due
+        GROUP BY item_id, user_id
+        ON CONFLICT (item_id) DO UPDATE
+        SET wear_count = ws.wear_count + EXCLUDED.wear_count,
+            first_worn_at = LEAST(ws.first_worn_at, EXCLUDED.first_worn_at),
+            last_worn_at = GREATEST(ws.last_worn_at, EXCLUDED.last_worn_at);
+    """,
+    # an applied log of outfit $1 worn at $2 was deleted: one wear less, and
+    # first/last are looked up again only for items where that log was the edge
+    "wear_stats.remove_log": """
+        UPDATE item_wear_stats ws
+        SET wear_count = GREATEST(ws.wear_count - 1, 0),
+            last_worn_at = CASE
+                WHEN ws.last_worn_at = $2::timestamptz THEN (
+                    SELECT MAX(owl.worn_at)
+                    FROM outfit_wear_log owl
+                    JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
+                    WHERE oi.item_id = ws.item_id
+                      AND owl.worn_at <= NOW()
+                )
+                ELSE ws.last_worn_at
+            END,
+            first_worn_at = CASE
+                WHEN ws.first_worn_at = $2::timestamptz THEN (
+                    SELECT MIN(owl.worn_at)
+                    FROM outfit_wear_log owl
+                    JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
+                    WHERE oi.item_id = ws.item_id
+                      AND owl.worn_at <= NOW()
+                )
+                ELSE ws.first_worn_at
+            END
+        WHERE ws.item_id IN (
+            SELECT item_id
+            FROM OutfitItems
+            WHERE outfit_id = $1
+        );
+    """,
+
+    # USER DATA VERSION (ETags, see migrations/003)
+    "user_version.bump": """
+        INSERT INTO user_data_versions (user_id, version)
+        VALUES ($1::uuid, 1)
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = user_data_versions.version + 1,
+            updated_at = NOW()
+        RETURNING version;
+    """,
+    # due future-dated wear logs change last_worn_at without any write, so they are part of the tag
+    "user_version.get": """
+        SELECT
+            COALESCE((SELECT version FROM user_data_versions WHERE user_id = $1::uuid), 0) AS version,
+            (
+                SELECT COUNT(*)
+                FROM item_wear_pending
+                WHERE user_id = $1::uuid
+                  AND worn_at <= NOW()
+            ) AS due_wear_logs;
+    """,
+}
+
+
+class RegistryConnection(asyncpg.Connection):
+    """asyncpg connection that remembers the registry statements it has prepared."""
+
+    __slots__ = ("named_statements",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.named_statements = {}
+
+
+def pool_options() -> dict:
+    """Extra asyncpg.create_pool() kwargs for the configured mode."""
+    options = {"connection_class": RegistryConnection}
+    if DB_POOL_MODE == "transaction":
+        # the pooler may hand each transaction a different backend,
+        # so named prepared statements must never be created
+        options["statement_cache_size"] = 0
+    return options
+
+
+async def _prepared(conn, name: str):
+    statements = conn.named_statements
+    stmt = statements.get(name)
+    if stmt is None:
+        stmt = await conn.prepare(QUERIES[name])
+        statements[name] = stmt
+    return stmt
+
+
+async def _run_prepared(conn, name: str, method: str, args: tuple):
+    try:
+        stmt = await _prepared(conn, name)
+        return stmt, await getattr(stmt, method)(*args)
+    except asyncpg.exceptions.InvalidCachedStatementError:
+        # table changed under a "SELECT *" statement (migration), prepare it again.
+        # inside a transaction the error already aborted it, so just surface it
+        conn.named_statements.pop(name, None)
+        if conn.is_in_transaction():
+            raise
+        stmt = await _prepared(conn, name)
+        return stmt, await getattr(stmt, method)(*args)
+
+
+async def fetch_named(conn, name: str, *args) -> list:
+    if DB_POOL_MODE == "transaction":
+        return await conn.fetch(QUERIES[name], *args)
+    _, rows = await _run_prepared(conn, name, "fetch", args)
+    return rows
+
+
+async def fetchrow_named(conn, name: str, *args):
+    if DB_POOL_MODE == "transaction":
+        return await conn.fetchrow(QUERIES[name], *args)
+    _, row = await _run_prepared(conn, name, "fetchrow", args)
+    return row
+
+
+async def fetchval_named(conn, name: str, *args):
+    if DB_POOL_MODE == "transaction":
+        return await conn.fetchval(QUERIES[name], *args)
+    _, value = await _run_prepared(conn, name, "fetchval", args)
+    return value
+
+
+async def execute_named(conn, name: str, *args) -> str:
+    if DB_POOL_MODE == "transaction":
+        return await conn.execute(QUERIES[name], *args)
+    stmt, _ = await _run_prepared(conn, name, "fetch", args)
+    return stmt.get_statusmsg()
@@ -0,0 +1,139 @@
+"""
+In-process cache of the near-static lookup tables: the master vocabularies
+(colors_master, materials_master, occasions_master), Seasons and categories.
+
+Loaded on startup, reloaded after VOCAB_CACHE_TTL_SECONDS or on demand
+(POST /internal/vocabulary/refresh). Each worker has its own copy, so a
+refresh only reaches the worker that served it; the TTL bounds how long the
+others stay behind.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+from app.utils.normalize import display_label
+
+logger = logging.getLogger(__name__)
+
+VOCAB_CACHE_TTL_SECONDS = float(os.getenv("VOCAB_CACHE_TTL_SECONDS", "600"))
+
+MASTER_TABLES = {
+    "colors": "colors_master",
+    "materials": "materials_master",
+    "occasions": "occasions_master",
+}
+
+
+class Vocabulary:
+    """One immutable snapshot. Readers keep the snapshot they got, even across a refresh."""
+
+    def __init__(self, masters: dict, seasons: list, categories: list, version: int):
+        self.version = version
+        self.loaded_at = time.time()
+        self.categories = categories
+
+        # family -> [{"id", "name"}] in display order, for the options endpoints
+        self._options = {
+            family: [{"id": str(r["id"]), "name": display_label(r["name"])} for r in rows]
+            for family, rows in masters.items()
+        }
+        # family -> lowercase name -> master id
+        self._master_ids = {
+            family: {r["name"].strip().lower(): r["id"] for r in reversed(rows)}
+            for family, rows in masters.items()
+        }
+        # lowercase season name -> season id
+        self._season_ids = {r["name"].strip().lower(): r["id"] for r in seasons}
+
+    def options(self, family: str) -> list[dict]:
+        return self._options[family]
+
+    def master_id(self, family: str, raw_name: str):
+        """Master id for a tag name; falls back to 'other' (None if neither exists)."""
+        ids = self._master_ids[family]
+        key = (raw_name or "").strip().lower()
+        return ids.get(key, ids.get("other"))
+
+    def season_id(self, raw_name: str):
+        return self._season_ids.get((raw_name or "").strip().lower())
+
+
+def _fingerprint(masters: dict, seasons: list, categories: list) -> str:
+    raw = repr((
+        sorted((family, [tuple(r) for r in rows]) for family, rows in masters.items()),
+        [tuple(r) for r in seasons],
+        [tuple(r) for r in categories],
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _in_transaction(db) -> bool:
+    # asyncpg connections have is_in_transaction(), pools do not
+    is_in_transaction = getattr(db, "is_in_transaction", None)
+    return is_in_transaction is not None and is_in_transaction()
+
+
+class VocabularyCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._current: Vocabulary | None = None
+        self._fingerprint: str | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def current(self) -> Vocabulary | None:
+        return self._current
+
+    def _fresh(self) -> bool:
+        return self._current is not None and time.time() - self._current.loaded_at < self.ttl_seconds
+
+    async def get(self, db) -> Vocabulary:
+        """
+        Current snapshot, reloading it when the TTL has passed.
+        `db` is a pool or a connection (anything with .fetch()). A failed reload
+        falls back to the stale snapshot, except on a connection inside a
+        transaction: that transaction is aborted, so the error goes to the caller.
+        """
+        if self._fresh():
+            return self._current
+
+        async with self._lock:
+            # another request may have reloaded while we waited
+            if self._fresh():
+                return self._current
+            try:
+                return await self._load(db)
+            except Exception:
+                # the tables barely change: a stale copy beats failing the request
+                if self._current is None or _in_transaction(db):
+                    raise
+                logger.warning("Vocabulary reload failed, serving version %s", self._current.version, exc_info=True)
+                return self._current
+
+    async def refresh(self, db) -> Vocabulary:
+        async with self._lock:
+            return await self._load(db)
+
+    async def _load(self, db) -> Vocabulary:
+        masters = {}
+        for family, table in MASTER_TABLES.items():
+            masters[family] = await db.fetch(
+                f"SELECT id, name FROM {table} ORDER BY COALESCE(sort_order, 9999), name ASC;"
+            )
+        seasons = await db.fetch("SELECT id, name FROM Seasons ORDER BY id;")
+        categories = await db.fetch("SELECT id, name FROM categories ORDER BY id;")
+
+        # the version only moves when the data did, so it can be used for cache validation
+        fingerprint = _fingerprint(masters, seasons, categories)
+        version = self._current.version if self._current else 0
+        if fingerprint != self._fingerprint:
+            version += 1
+            self._fingerprint = fingerprint
+
+        self._current = Vocabulary(masters, seasons, [dict(r) for r in categories], version)
+        return self._current
+
+
+vocabulary = VocabularyCache(VOCAB_CACHE_TTL_SECONDS)
@@ -1,10 +1,88 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.config.supabase_client import supabase
 
 security = HTTPBearer(auto_error=False)
 
+# Local verification settings.
+# HS256 projects sign with the JWT secret, asymmetric projects publish a JWKS.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "2048"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+_jwks_client = jwt.PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True) if SUPABASE_JWKS_URL else None
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """Minimal user built from verified token claims (same fields the routes use)."""
+    id: str
+    email: str | None = None
+
+
+class TokenCache:
+    """
+    Small LRU cache of verified tokens.
+    Keys are sha256 hashes so raw tokens are never kept in memory.
+    Entries expire at min(ttl, token exp).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[object, float]] = OrderedDict()
+
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str):
+        key = self.key_for(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        user, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return user
+
+    def set(self, token: str, user, exp: float | None = None) -> None:
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        key = self.key_for(token)
+        self._entries[key] = (user, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(AUTH_CACHE_MAX_SIZE, AUTH_CACHE_TTL_SECONDS)
+
 
 def _extract_bearer_token(credentials: HTTPAuthorizationCredentials | None) -> str:
     if not credentials:
@@ -22,24 +100,87 @@ def _extract_bearer_token(credentials: HTTPAuthorizationCredentials | None) -> s
     return credentials.credentials.strip()
 
 
+def local_verification_enabled() -> bool:
+    return bool(SUPABASE_JWT_SECRET or _jwks_client)
+
+
+async def _resolve_signing_key(token: str):
+    if SUPABASE_JWT_SECRET:
+        return SUPABASE_JWT_SECRET, ["HS256"]
+
+    # PyJWKClient caches keys, it only goes to the network on a cache miss
+    signing_key = await run_in_threadpool(_jwks_client.get_signing_key_from_jwt, token)
+    return signing_key.key, ["RS256", "ES256"]
+
+
+async def verify_token_locally(token: str) -> tuple[AuthUser, float | None]:
+    """
+    Verify a Supabase access token without calling the auth server.
+    Raises jwt.InvalidTokenError for bad tokens and jwt.PyJWKClientError
+    when the signing key cannot be resolved.
+    """
+    key, algorithms = await _resolve_signing_key(token)
+
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=SUPABASE_JWT_AUDIENCE,
+        options={"require": ["exp", "sub"]},
+    )
+
+    return AuthUser(id=claims["sub"], email=claims.get("email")), claims.get("exp")
+
+
+def _unverified_exp(token: str) -> float | None:
+    try:
+        return jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        return None
+
+
+async def _get_user_remote(token: str):
+    # supabase-py is synchronous, keep it off the event loop
+    response = await run_in_threadpool(supabase.auth.get_user, token)
+    return getattr(response, "user", None)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
 ):
     token = _extract_bearer_token(credentials)
 
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    if local_verification_enabled():
+        try:
+            user, exp = await verify_token_locally(token)
+            token_cache.set(token, user, exp)
+            return user
+        except jwt.PyJWKClientError:
+            # JWKS unreachable or key not published yet -> ask the auth server
+            pass
+        except jwt.InvalidTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+            )
+
     try:
-        response = supabase.auth.get_user(token)
+        user = await _get_user_remote(token)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
-    user = getattr(response, "user", None)
     if not user or not getattr(user, "id", None):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found for token",
         )
 
-    return user
\ No newline at end of file
+    token_cache.set(token, user, _unverified_exp(token))
+    return user
@@ -0,0 +1,23 @@
+from fastapi import Depends, Request
+
+
+async def get_conn(request: Request):
+    """One pooled connection for the whole request."""
+    async with request.app.state.db.acquire() as conn:
+        yield conn
+
+
+async def get_tx_conn(request: Request):
+    """
+    One pooled connection with a transaction around the whole request.
+    Commits when the route returns, rolls back if it raises.
+    """
+    async with request.app.state.db.acquire() as conn:
+        async with conn.transaction():
+            yield conn
+
+
+# scope="function" releases the connection (and commits) when the route returns,
+# before the response is sent, so a slow client never holds a pooled connection
+DBConnection = Depends(get_conn, scope="function")
+DBTransaction = Depends(get_tx_conn, scope="function")
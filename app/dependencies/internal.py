@@ -0,0 +1,20 @@
+import hmac
+import os
+
+from fastapi import Header, HTTPException, status
+
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
+
+
+async def require_internal_token(x_internal_token: str | None = Header(default=None)):
+    """
+    Guards /internal routes: the caller must send INTERNAL_API_TOKEN in X-Internal-Token.
+    Without a configured token every call is refused.
+    """
+    if not INTERNAL_API_TOKEN or not hmac.compare_digest(
+        (x_internal_token or "").encode(), INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed",
+        )
@@ -0,0 +1,53 @@
+"""
+Bit-packed form of the multi-hot item vectors.
+
+attr_vector only holds 0/1, so an item fits in ceil(dim / 8) bytes
+(ClothingItems.attr_bits, 7 bytes for the 54 dims of schema 1) plus its
+number of set bits (attr_bits_count). attr_vector stays the canonical column;
+suggestions score from the packed copy: style . item cosine =
+sum(style[set bits]) / sqrt(count), the value item_similarity() gets after
+normalizing the full vector, for the whole wardrobe in one unpack + matmul.
+"""
+from typing import Sequence
+
+import numpy as np
+
+# dicts built from "ci.*" rows: the packed columns are for scoring only, never sent to clients
+PACKED_COLUMNS = ("attr_bits", "attr_bits_count")
+
+
+def pack_bits(vec: Sequence[int]) -> tuple[bytes, int]:
+    """0/1 vector -> (packed bytes, number of set bits)."""
+    bits = np.asarray(vec, dtype=np.uint8) != 0
+    return np.packbits(bits).tobytes(), int(bits.sum())
+
+
+def pack_bits_batch(matrix: np.ndarray) -> list[tuple[bytes, int]]:
+    """(n, dim) 0/1 matrix -> one (packed bytes, count) pair per row."""
+    bits = np.asarray(matrix) != 0
+    packed = np.packbits(bits, axis=1)
+    counts = bits.sum(axis=1)
+    return [(row.tobytes(), int(count)) for row, count in zip(packed, counts)]
+
+
+def pop_packed(item: dict) -> tuple[bytes, int] | None:
+    """Removes the packed columns from an item dict, returns them when they are set."""
+    bits, count = (item.pop(column, None) for column in PACKED_COLUMNS)
+    if bits is None or count is None:
+        return None
+    return bytes(bits), int(count)
+
+
+def style_scores(style_vec: Sequence[float], packed: Sequence[bytes], counts: Sequence[int]) -> np.ndarray:
+    """
+    Dot product of `style_vec` with every L2-normalized packed item vector:
+    one unpack and one matrix-vector product for the whole wardrobe.
+    """
+    if not packed:
+        return np.zeros(0)
+    style = np.asarray(style_vec, dtype=np.float64)
+    matrix = np.frombuffer(b"".join(packed), dtype=np.uint8).reshape(len(packed), -1)
+    bits = np.unpackbits(matrix, axis=1, count=len(style))
+    sums = bits @ style
+    denom = np.sqrt(np.asarray(counts, dtype=np.float64))
+    return np.divide(sums, denom, out=np.zeros(len(packed)), where=denom > 0)
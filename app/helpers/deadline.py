@@ -0,0 +1,57 @@
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+from app.db.connection import request_deadline
+
+T = TypeVar("T")
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # the body is already read by FastAPI, so the next message is the disconnect
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def run_with_deadline(request: Request, work: Awaitable[T], timeout_seconds: float) -> T:
+    """
+    Runs a route's work with a deadline.
+    - DB connections acquired by the work get statement_timeout = the time left
+    - if the deadline passes the work is cancelled -> 504
+    - if the client disconnects the work is cancelled -> 499
+    Cancelling the task also cancels in-flight asyncpg queries and httpx calls.
+    """
+    token = request_deadline.set(time.monotonic() + timeout_seconds)
+    try:
+        # the task copies the current context, so it sees the deadline
+        task = asyncio.ensure_future(work)
+    finally:
+        request_deadline.reset(token)
+
+    disconnect = asyncio.create_task(_wait_for_disconnect(request))
+
+    try:
+        done, _ = await asyncio.wait(
+            {task, disconnect},
+            timeout=timeout_seconds,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        if task in done:
+            return task.result()
+
+        task.cancel()
+        await asyncio.wait({task})
+
+        if disconnect in done:
+            raise HTTPException(status_code=499, detail="Client closed request")
+        raise HTTPException(status_code=504, detail="Request timed out")
+
+    finally:
+        disconnect.cancel()
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,37 @@
+from fastapi import Request, Response
+
+from app.services.user_version_service import get_user_version
+
+
+async def get_user_etag(pool, user_id: str, read_only: bool = False) -> str:
+    """
+    Weak ETag from the user's data version.
+    Read it from the same pool (primary/replica) as the data it guards and
+    before that data, so a tag is never newer than the body it is sent with.
+    """
+    async with pool.acquire(read_only=read_only) as conn:
+        version = await get_user_version(conn, user_id)
+    return f'W/"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # compare ignoring the weak prefix
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # the client may keep it but must revalidate every time
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+from itertools import zip_longest
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.models.item_modal import ItemImportRow
+
+IMPORT_MAX_ITEMS = int(os.getenv("IMPORT_MAX_ITEMS", "5000"))
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# CSV cells holding several tags, e.g. "black;white"
+CSV_LIST_SEPARATOR = ";"
+LIST_FIELDS = ("colors", "materials", "occasions", "seasons")
+
+
+async def iter_raw_lines(chunks):
+    """Decoded lines, line ends included, from a byte stream (request.stream()), with a size cap."""
+    buffer = b""
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Import larger than {IMPORT_MAX_BYTES} bytes")
+
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield (line + b"\n").decode("utf-8")
+
+    if buffer:
+        yield buffer.decode("utf-8")
+
+
+async def iter_lines(chunks):
+    """Non empty lines of the stream, without their line ends."""
+    async for line in iter_raw_lines(chunks):
+        if line.strip():
+            yield line.rstrip("\r\n")
+
+
+async def iter_csv_records(chunks):
+    """
+    CSV records of the stream. Lines are collected until their quotes are
+    balanced, so a quoted cell may span several lines; csv does the unquoting.
+    """
+    pending = ""
+    async for line in iter_raw_lines(chunks):
+        pending += line
+        if pending.count('"') % 2:
+            continue
+        if pending.strip():
+            yield next(csv.reader([pending]))
+        pending = ""
+
+    if pending.strip():
+        raise HTTPException(status_code=422, detail="Unterminated quoted CSV cell")
+
+
+def _csv_row_to_dict(row: dict) -> dict:
+    data = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip()
+        value = (value or "").strip()
+        if key in LIST_FIELDS:
+            data[key] = [v for v in value.split(CSV_LIST_SEPARATOR) if v.strip()]
+        elif value != "":
+            data[key] = value
+    return data
+
+
+def _validate(raw: dict, line_no: int) -> ItemImportRow:
+    try:
+        return ItemImportRow(**raw)
+    except (ValidationError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Row {line_no}: {e}")
+
+
+async def read_import_rows(chunks, content_type: str) -> list[ItemImportRow]:
+    """
+    Parses an NDJSON (one item object per line) or CSV (header row, tag
+    columns separated by ';') upload into validated rows.
+    """
+    rows: list[ItemImportRow] = []
+
+    if "csv" in (content_type or ""):
+        header = None
+        line_no = 0
+        async for record in iter_csv_records(chunks):
+            line_no += 1
+            if header is None:
+                header = record
+                continue
+            # same shape as csv.DictReader: extra cells under None, missing cells as None
+            row = dict(zip_longest(header, record))
+            rows.append(_validate(_csv_row_to_dict(row), line_no))
+            if len(rows) > IMPORT_MAX_ITEMS:
+                break
+    else:
+        line_no = 0
+        async for line in iter_lines(chunks):
+            line_no += 1
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=422, detail=f"Row {line_no}: invalid JSON")
+            rows.append(_validate(raw, line_no))
+            if len(rows) > IMPORT_MAX_ITEMS:
+                break
+
+    if len(rows) > IMPORT_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {IMPORT_MAX_ITEMS} items per import")
+    if not rows:
+        raise HTTPException(status_code=400, detail="No items to import")
+
+    return rows
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+import asyncpg
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+
+
+def _default(obj):
+    # types orjson does not know natively (datetime, UUID, numpy, ... it does)
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class RawJSONResponse(Response):
+    """
+    Sends a JSON document that is already rendered (e.g. by Postgres) without
+    decoding or re-encoding it.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return content.encode("utf-8") if isinstance(content, str) else content
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Default response class (see main.py).
+    Routes on hot paths return it directly, which also skips FastAPI's
+    jsonable_encoder pass over the payload.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, item_id) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of the last row of a page."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), item_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
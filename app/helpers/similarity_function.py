@@ -1,28 +1,48 @@
 import math
 import random
-from app.helpers.vector_math import l2_normalize
+from typing import Sequence
+
+import numpy as np
+
+from app.helpers.bit_vectors import style_scores
+from app.helpers.vector_helpers import feature_encoder
+from app.helpers.vector_math import as_vector, normalize
 
 
 #After normalization, dot product behaves like cosine similarity.
-def dot(a: list[float], b: list[float]) -> float:
-    return sum(x*y for x, y in zip(a, b))
+def dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return float(np.dot(as_vector(a), as_vector(b)))
 
 #It compares the user style vector with item feature vector using dot product.
-def item_similarity(style_vec: list[float], item: dict) -> float:
+def item_similarity(style_vec: Sequence[float], item: dict) -> float:
     v = item.get("attr_vector")
     if v is None: # no item vector
         return -1e9 #gives very bad score
-    v = l2_normalize([float(x) for x in v])
-    return dot(style_vec, v)
+    return dot(style_vec, normalize(as_vector(v)))
 
-def pick_top_k(items: list[dict], style_vec: list[float] | None, k: int) -> dict | None:
+#Same scores as item_similarity for every packed item, in one vectorized pass.
+def packed_style_scores(style_vec: Sequence[float], packed: dict) -> dict:
+    """packed: item id -> (attr_bits, attr_bits_count). Returns item id -> score."""
+    if not packed or len(style_vec) != feature_encoder.dim:
+        return {}
+    ids = list(packed)
+    scores = style_scores(style_vec, [packed[i][0] for i in ids], [packed[i][1] for i in ids])
+    return dict(zip(ids, scores.tolist()))
+
+def pick_top_k(items: list[dict], style_vec: Sequence[float] | None, k: int, scores: dict | None = None) -> dict | None:
     if not items:
         return None
-    if not style_vec:
+    if style_vec is None or len(style_vec) == 0:
         # no style yet -> fallback random
         return random.choice(items)
 
     #for each item it in the list, calculate a score using item_similarity
-    scored = sorted(items, key=lambda it: item_similarity(style_vec, it), reverse=True) #Score items based on similarity and sort from best to worst
+    #precomputed (packed) scores first, items without one are scored from attr_vector
+    def score(it: dict) -> float:
+        if scores and it.get("id") in scores:
+            return scores[it["id"]]
+        return item_similarity(style_vec, it)
+
+    scored = sorted(items, key=score, reverse=True) #Score items based on similarity and sort from best to worst
     k = min(k, len(scored)) # take top k item
     return random.choice(scored[:k]) #randomly choose one from that group
\ No newline at end of file
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Request, HTTPException, UploadFile, File
 
 import io
 from PIL import Image, ImageOps
-from app.config.supabase_client import supabase
+from app.storage.storage_backend import StorageBackend
 
 router = APIRouter()
 
@@ -42,7 +42,7 @@ def convert_image_to_webp(file_bytes: bytes) -> bytes:
         raise ValueError(f"Could not process image: {str(e)}")
 
 
-def create_tryon_signed_url(path: str, expires_in: int = 3600) -> str | None:
+async def create_tryon_signed_url(storage: StorageBackend, path: str, expires_in: int = 3600) -> str | None:
     """
     Create a temporary signed URL for a private bucket image.
     This lets the frontend view the image safely.
@@ -50,8 +50,7 @@ def create_tryon_signed_url(path: str, expires_in: int = 3600) -> str | None:
     if not path:
         return None
 
-    result = supabase.storage.from_(TRYON_BUCKET).create_signed_url(path, expires_in)
-    return result.get("signedURL") or result.get("signedUrl")
+    return await storage.create_signed_url(TRYON_BUCKET, path, expires_in)
 
 
 
@@ -1,9 +1,12 @@
 # app/services/feature_vector.py
 
 from __future__ import annotations
-from typing import List
+from functools import lru_cache
+from typing import List, Sequence
 
-from app.models.vector_ import CATEGORIES, COLORS, MATERIALS, OCCASIONS, SEASONS
+import numpy as np
+
+from app.models.vector_ import ATTR_SCHEMA_HISTORY, ATTR_SCHEMA_VERSION, FEATURE_SLOTS
 
 
 def normalize_label(value: str) -> str:
@@ -11,26 +14,90 @@ def normalize_label(value: str) -> str:
     return (value or "").strip().lower()
 
 
-def multi_hot_encode(selected_values: List[str], vocabulary: List[str]) -> List[int]:
+class FeatureEncoder:
+    """
+    Multi-hot encoder for item attributes, built once from models/vector_.
+    Index maps and slot offsets are computed up front, so encoding an item is
+    only dict lookups into a preallocated NumPy row.
+    """
+
+    def __init__(self, slots: list[tuple[str, list[str]]], schema_version: int):
+        self.schema_version = schema_version
+        self.slot_names = [name for name, _ in slots]
+        # slot name -> (lowercase value -> absolute column, column of 'other' or None)
+        self._index = {}
+        offset = 0
+        for name, vocab in slots:
+            columns = {value: offset + i for i, value in enumerate(vocab)}
+            self._index[name] = (columns, columns.get("other"))
+            offset += len(vocab)
+        self.dim = offset
+
+    def _fill(self, row: np.ndarray, slot: str, values: Sequence[str] | None) -> None:
+        columns, other = self._index[slot]
+        for raw in (values or []):
+            key = normalize_label(raw)
+            if not key:
+                continue
+            column = columns.get(key, other)
+            if column is not None:
+                row[column] = 1
+
+    def encode(self, **slots: Sequence[str] | None) -> np.ndarray:
+        """One item: encode(categories=[...], colors=[...], ...) -> int8 vector of length dim."""
+        return self.encode_batch([slots])[0]
+
+    def encode_batch(self, items: Sequence[dict]) -> np.ndarray:
+        """Many items (dicts keyed by slot name) -> int8 matrix of shape (len(items), dim)."""
+        matrix = np.zeros((len(items), self.dim), dtype=np.int8)
+        for row, item in zip(matrix, items):
+            for slot in self.slot_names:
+                self._fill(row, slot, item.get(slot))
+        return matrix
+
+
+feature_encoder = FeatureEncoder(FEATURE_SLOTS, ATTR_SCHEMA_VERSION)
+
+
+@lru_cache(maxsize=None)
+def _remap_columns(from_version: int, to_version: int) -> np.ndarray:
+    """
+    For every column of the old layout, its column in the new one: same slot
+    and value, else that slot's 'other', else -1 (dropped).
+    """
+    target = FeatureEncoder(ATTR_SCHEMA_HISTORY[to_version], to_version)
+    columns = []
+    for slot, vocab in ATTR_SCHEMA_HISTORY[from_version]:
+        index, other = target._index.get(slot, ({}, None))
+        for value in vocab:
+            column = index.get(value, other)
+            columns.append(-1 if column is None else column)
+    return np.array(columns, dtype=np.intp)
+
+
+def remap_vector(vec: Sequence[float], from_version: int | None, to_version: int = ATTR_SCHEMA_VERSION) -> Sequence[float] | None:
     """
-    Multi-hot encoding:
-    - Each known selected value sets its index to 1
-    - Unknown values map to 'other' if vocabulary includes it
+    Moves a vector (style or outfit) from one schema layout to another, weight
+    by weight; returned as is when the versions match. None when the source
+    version is unknown or the length does not match its layout.
     """
-    vector = [0] * len(vocabulary)
-    index_by_value = {value: index for index, value in enumerate(vocabulary)}
+    if from_version == to_version:
+        return vec
+    if from_version not in ATTR_SCHEMA_HISTORY or to_version not in ATTR_SCHEMA_HISTORY:
+        return None
 
-    for raw in (selected_values or []):
-        key = normalize_label(raw)
-        if not key:
-            continue
+    columns = _remap_columns(from_version, to_version)
+    values = np.asarray(vec, dtype=np.float64)
+    if values.shape != columns.shape:
+        return None
 
-        if key in index_by_value:
-            vector[index_by_value[key]] = 1
-        elif "other" in index_by_value:
-            vector[index_by_value["other"]] = 1
+    dim = sum(len(vocab) for _, vocab in ATTR_SCHEMA_HISTORY[to_version])
+    out = np.zeros(dim, dtype=np.float64)
+    kept = columns >= 0
+    # several old values may collapse into one 'other'
+    np.add.at(out, columns[kept], values[kept])
+    return out.tolist()
 
-    return vector
 
 def build_item_feature_vector(
     category_name: List[str],
@@ -44,9 +111,10 @@ def build_item_feature_vector(
     Vector layout (concatenated in this exact order):
       [categories | colors | materials | occasions | seasons]
     """
-    category_vec = multi_hot_encode(category_name, CATEGORIES)
-    color_vec = multi_hot_encode(color_names, COLORS)
-    material_vec = multi_hot_encode(material_names, MATERIALS)
-    occasion_vec = multi_hot_encode(occasion_names, OCCASIONS)
-    season_vec = multi_hot_encode(season_names, SEASONS)
-    return category_vec + color_vec + material_vec + occasion_vec + season_vec
+    return feature_encoder.encode(
+        categories=category_name,
+        colors=color_names,
+        materials=material_names,
+        occasions=occasion_names,
+        seasons=season_names,
+    ).tolist()
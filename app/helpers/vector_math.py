@@ -1,5 +1,7 @@
 import math
-from typing import List
+from typing import List, Sequence
+
+import numpy as np
 
 #Normalization makes vectors have length 1
 
@@ -10,18 +12,29 @@ def l2_normalize(vec: List[float]) -> List[float]:
     return [x / norm for x in vec]
 
 
-def ema_update(user_vec: List[float], signal_vec: List[float], learning_rate: float, feedback_direction: int = +1) -> List[float]:
+def as_vector(values: Sequence[float]) -> np.ndarray:
+    """Contiguous float32 array; no copy when it already is one (pgvector codec)."""
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+def normalize(vec: np.ndarray) -> np.ndarray:
+    """l2_normalize for NumPy arrays."""
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return vec
+    return vec / norm
+
+
+def ema_update(user_vec: Sequence[float], signal_vec: Sequence[float], learning_rate: float, feedback_direction: int = +1) -> np.ndarray:
     """
     feedback_direction=+1  -> pull user taste toward signal
     feedback_direction=-1  -> push user taste away from signal
     """
-    current_user_style_vector = l2_normalize(user_vec)
-    outfit_feature_vector = l2_normalize(signal_vec)
-
-    updated_vector = [
-        (1 - learning_rate) * current_preference
-        + learning_rate * (feedback_direction * outfit_feature_strength)
-        for current_preference, outfit_feature_strength
-        in zip(current_user_style_vector, outfit_feature_vector)
-    ]
-    return l2_normalize(updated_vector)
\ No newline at end of file
+    current_user_style_vector = normalize(as_vector(user_vec))
+    outfit_feature_vector = normalize(as_vector(signal_vec))
+
+    updated_vector = (
+        (1 - learning_rate) * current_user_style_vector
+        + learning_rate * (feedback_direction * outfit_feature_vector)
+    )
+    return normalize(updated_vector)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Re-encodes the vectors that were stored under an older attr_schema_version
+(see ATTR_SCHEMA_HISTORY in app/models/vector_.py):
+
+  1. ClothingItems.attr_vector (and its packed attr_bits), rebuilt from the
+     item's category and tags; items without attr_bits yet are backfilled too
+  2. Outfits.outfit_vec, rebuilt from its (now current) item vectors
+  3. Users.style_vec, remapped weight by weight, the learned taste is kept
+
+Stale rows are streamed with a server-side cursor, encoded in batches on a
+process pool and written back with executemany, one transaction per batch.
+Every batch is final once committed and stale rows are found by version, so
+an interrupted run is resumed by starting it again.
+
+    python -m app.jobs.revectorize
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
+from app.db.connection import close_db, connect_to_db
+from app.helpers.bit_vectors import pack_bits_batch
+from app.helpers.vector_helpers import feature_encoder, remap_vector
+from app.models.category_mapping import CATEGORY_ID_TO_NAME
+
+logger = logging.getLogger(__name__)
+
+REVECTORIZE_BATCH_SIZE = int(os.getenv("REVECTORIZE_BATCH_SIZE", "500"))
+# encoder processes (0 = encode in the job's own process)
+REVECTORIZE_WORKERS = int(os.getenv("REVECTORIZE_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _tag_names(pivot_table: str, pivot_field: str, table: str) -> str:
+    return f"""
+        COALESCE((
+            SELECT array_agg(t.name)
+            FROM {pivot_table} p
+            JOIN {table} t ON t.id = p.{pivot_field}
+            WHERE p.item_id = ci.id
+        ), '{{}}')
+    """
+
+
+STALE_ITEMS_SQL = f"""
+    SELECT ci.id,
+           ci.category_id,
+           {_tag_names("ItemColors", "color_id", "Colors")} AS colors,
+           {_tag_names("ItemMaterials", "material_id", "Materials")} AS materials,
+           {_tag_names("ItemOccasions", "occasion_id", "Occasions")} AS occasions,
+           {_tag_names("ItemSeasons", "season_id", "Seasons")} AS seasons
+    FROM ClothingItems ci
+    WHERE ci.attr_schema_version IS DISTINCT FROM $1
+       OR ci.attr_bits IS NULL
+"""
+
+# the guard skips rows a user re-saved since they were read
+UPDATE_ITEM_SQL = """
+    UPDATE ClothingItems
+    SET attr_vector = $2, attr_bits = $3, attr_bits_count = $4, attr_schema_version = $5
+    WHERE id = $1 AND (attr_schema_version IS DISTINCT FROM $5 OR attr_bits IS NULL)
+"""
+
+# only item vectors that are already current count (as real[], so it also works
+# on pgvector columns)
+STALE_OUTFITS_SQL = """
+    SELECT o.id,
+           COALESCE((
+               SELECT array_agg(ci.attr_vector::real[] ORDER BY oi.position)
+               FROM OutfitItems oi
+               JOIN ClothingItems ci ON ci.id = oi.item_id
+               WHERE oi.outfit_id = o.id
+                 AND ci.attr_vector IS NOT NULL
+                 AND ci.attr_schema_version = $1
+           ), '{}') AS item_vectors
+    FROM Outfits o
+    WHERE o.outfit_vec IS NOT NULL
+      AND o.attr_schema_version IS DISTINCT FROM $1
+"""
+
+UPDATE_OUTFIT_SQL = """
+    UPDATE Outfits
+    SET outfit_vec = $2, attr_schema_version = $3
+    WHERE id = $1 AND attr_schema_version IS DISTINCT FROM $3
+"""
+
+STALE_USERS_SQL = """
+    SELECT id, style_vec, style_schema_version
+    FROM Users
+    WHERE style_vec IS NOT NULL
+      AND style_schema_version IS DISTINCT FROM $1
+"""
+
+UPDATE_USER_SQL = """
+    UPDATE Users
+    SET style_vec = $2, style_schema_version = $3
+    WHERE id = $1 AND style_schema_version IS DISTINCT FROM $3
+"""
+
+
+def encode_items(rows: list[tuple]) -> list[tuple[list[int], bytes, int]]:
+    """
+    (category_id, colors, materials, occasions, seasons) rows ->
+    (attr_vector, attr_bits, attr_bits_count). Runs in a pool process.
+    """
+    matrix = feature_encoder.encode_batch([
+        {
+            "categories": [CATEGORY_ID_TO_NAME[category_id]] if category_id in CATEGORY_ID_TO_NAME else [],
+            "colors": colors,
+            "materials": materials,
+            "occasions": occasions,
+            "seasons": seasons,
+        }
+        for category_id, colors, materials, occasions, seasons in rows
+    ])
+    return [(vector, bits, count) for vector, (bits, count) in zip(matrix.tolist(), pack_bits_batch(matrix))]
+
+
+def outfit_vectors(item_vectors: list[list]) -> list[list[float] | None]:
+    """
+    Per outfit, the mean of its L2-normalized item vectors, normalized again
+    (same as compute_and_store_outfit_vec). None when fewer than 2 items have one.
+    """
+    result = []
+    for vectors in item_vectors:
+        if len(vectors) < 2:
+            result.append(None)
+            continue
+        matrix = np.asarray(vectors, dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        mean = (matrix / np.where(norms == 0, 1, norms)).mean(axis=0)
+        norm = np.linalg.norm(mean)
+        result.append((mean / norm if norm else mean).tolist())
+    return result
+
+
+async def _stream(pool, sql: str, batch_size: int, handle) -> int:
+    """
+    Reads `sql` through a server-side cursor on one connection and hands each
+    batch to `handle(write_conn, rows)`, which writes on a second connection.
+    """
+    done = 0
+    async with pool.acquire() as read_conn, pool.acquire() as write_conn:
+        async with read_conn.transaction(readonly=True):
+            cursor = await read_conn.cursor(sql, feature_encoder.schema_version)
+            while rows := await cursor.fetch(batch_size):
+                async with write_conn.transaction():
+                    await handle(write_conn, rows)
+                done += len(rows)
+                logger.info("revectorize: %d rows", done)
+    return done
+
+
+async def _run_encoder(executor: Executor | None, fn, arg):
+    if executor is None:
+        return fn(arg)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, arg)
+
+
+async def revectorize_items(pool, executor: Executor | None, batch_size: int = REVECTORIZE_BATCH_SIZE) -> int:
+    version = feature_encoder.schema_version
+
+    async def handle(conn, rows):
+        # Records do not pickle, the pool processes get plain tuples
+        vectors = await _run_encoder(
+            executor,
+            encode_items,
+            [(r["category_id"], r["colors"], r["materials"], r["occasions"], r["seasons"]) for r in rows],
+        )
+        await conn.executemany(UPDATE_ITEM_SQL, [(r["id"], *encoded, version) for r, encoded in zip(rows, vectors)])
+
+    return await _stream(pool, STALE_ITEMS_SQL, batch_size, handle)
+
+
+async def revectorize_outfits(pool, executor: Executor | None, batch_size: int = REVECTORIZE_BATCH_SIZE) -> int:
+    version = feature_encoder.schema_version
+
+    async def handle(conn, rows):
+        vectors = await _run_encoder(executor, outfit_vectors, [list(r["item_vectors"]) for r in rows])
+        # None: recomputed on demand once the outfit has enough current items
+        await conn.executemany(UPDATE_OUTFIT_SQL, [(r["id"], v, version) for r, v in zip(rows, vectors)])
+
+    return await _stream(pool, STALE_OUTFITS_SQL, batch_size, handle)
+
+
+async def revectorize_users(pool, batch_size: int = REVECTORIZE_BATCH_SIZE) -> int:
+    version = feature_encoder.schema_version
+
+    async def handle(conn, rows):
+        updates = []
+        for r in rows:
+            style_vec = remap_vector(r["style_vec"], r["style_schema_version"], version)
+            if style_vec is None:
+                # unknown version or corrupt length, left for the online reset
+                logger.warning("revectorize: cannot remap style_vec of user %s (version %s)", r["id"], r["style_schema_version"])
+                continue
+            updates.append((r["id"], style_vec, version))
+        if updates:
+            await conn.executemany(UPDATE_USER_SQL, updates)
+
+    # remapping is a few array ops per user, no need for the process pool
+    return await _stream(pool, STALE_USERS_SQL, batch_size, handle)
+
+
+async def revectorize(pool, workers: int = REVECTORIZE_WORKERS, batch_size: int = REVECTORIZE_BATCH_SIZE) -> dict:
+    """Items first: outfit vectors are rebuilt from the current item vectors."""
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        return {
+            "schema_version": feature_encoder.schema_version,
+            "items": await revectorize_items(pool, executor, batch_size),
+            "outfits": await revectorize_outfits(pool, executor, batch_size),
+            "users": await revectorize_users(pool, batch_size),
+        }
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+async def main() -> None:
+    pool = await connect_to_db()
+    try:
+        logger.info("revectorize finished: %s", await revectorize(pool))
+    finally:
+        await close_db(pool)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
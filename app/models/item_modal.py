@@ -1,6 +1,11 @@
-from pydantic import BaseModel
+from uuid import UUID
+
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
+# max ids per POST /items/batch call
+ITEM_BATCH_MAX_SIZE = 100
+
 
 class ClothingItemCreate(BaseModel):
     user_id: str
@@ -31,3 +36,22 @@ class ItemUpdate(BaseModel):
     materials: Optional[List[str]] = None
     occasion: Optional[List[str]] = None
     season: Optional[List[str]] = None
+
+
+class ItemBatchRequest(BaseModel):
+    item_ids: List[UUID] = Field(..., min_length=1, max_length=ITEM_BATCH_MAX_SIZE)
+
+
+class ItemImportRow(BaseModel):
+    """One garment of a bulk import (POST /items/import); the owner is the caller."""
+    img_description: Optional[str] = ""
+    image_url: Optional[str] = None
+    processed_img_url: Optional[str] = None
+    category_id: int
+    subcategory_id: Optional[int] = None
+    in_laundry: bool = False
+
+    colors: List[str] = []
+    materials: List[str] = []
+    occasions: List[str] = []
+    seasons: List[str] = []
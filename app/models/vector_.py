@@ -19,3 +19,51 @@ SEASONS = ["spring","summer","autumn","winter"]  # 4 fixed
 
 CATEGORIES = ["top","bottom","outerwear","shoes","accessory","jumpsuit"] #6
 
+
+# Slot order of attr_vector: [categories | colors | materials | occasions | seasons]
+FEATURE_SLOTS = [
+    ("categories", CATEGORIES),
+    ("colors", COLORS),
+    ("materials", MATERIALS),
+    ("occasions", OCCASIONS),
+    ("seasons", SEASONS),
+]
+
+# Stored with every vector (ClothingItems / Outfits.attr_schema_version,
+# Users.style_schema_version). Bump it whenever a vocabulary or the slot
+# order above changes.
+ATTR_SCHEMA_VERSION = 1
+
+def _freeze(slots) -> tuple:
+    return tuple((name, tuple(vocab)) for name, vocab in slots)
+
+
+# Layout of every version ever stored, so old vectors can be remapped
+# (app/jobs/revectorize.py). Each version is written out as its own tuples,
+# so editing a list above can never change a stored layout. To change a
+# vocabulary: edit the list, bump ATTR_SCHEMA_VERSION and add the new layout here.
+ATTR_SCHEMA_HISTORY = {
+    1: (
+        ("categories", ("top", "bottom", "outerwear", "shoes", "accessory", "jumpsuit")),
+        ("colors", (
+            "black", "white", "grey", "blue", "red", "green", "beige", "brown", "pink", "purple",
+            "yellow", "orange", "navy", "turquoise", "burgundy", "mustard", "other",
+        )),
+        ("materials", (
+            "cotton", "denim", "wool", "leather", "polyester", "linen", "silk", "elastane",
+            "nylon", "cashmere", "viscose", "knit", "suede", "alpaca", "other",
+        )),
+        ("occasions", (
+            "casual", "work", "formal", "sport", "party", "travel", "outdoors", "home", "date",
+            "school", "dinner", "other",
+        )),
+        ("seasons", ("spring", "summer", "autumn", "winter")),
+    ),
+}
+
+# the lists above were edited without a new version (or the new layout was not recorded)
+if ATTR_SCHEMA_HISTORY.get(ATTR_SCHEMA_VERSION) != _freeze(FEATURE_SLOTS):
+    raise RuntimeError(
+        f"FEATURE_SLOTS do not match ATTR_SCHEMA_HISTORY[{ATTR_SCHEMA_VERSION}]: "
+        "bump ATTR_SCHEMA_VERSION and record the new layout"
+    )
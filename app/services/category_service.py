@@ -1,14 +1,14 @@
 # app/services/category_service.py
 from fastapi import HTTPException
 
+from app.db.vocabulary import vocabulary
+
+
 async def get_categories_service(pool):
-    """Fetch all categories ordered by ID."""
+    """All categories ordered by ID (served from the vocabulary cache)."""
     try:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT id, name FROM categories ORDER BY id;"
-            )
-        return [dict(r) for r in rows]
+        vocab = await vocabulary.get(pool)
+        return vocab.categories
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
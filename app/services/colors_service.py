@@ -1,31 +1,15 @@
-
-from typing import Any, Dict, List
 from fastapi import HTTPException
-from app.utils.normalize import  display_label
+
+from app.db.vocabulary import vocabulary
 
 
 async def get_color_options_service(pool):
     """
-    Returns color options directly from colors_master.
+    Returns color options from colors_master (served from the vocabulary cache).
     """
     try:
-        async with pool.acquire() as conn:
-            sql = """
-                SELECT id::text AS id, name
-                FROM colors_master
-            """
-
-            sql += " ORDER BY COALESCE(sort_order, 9999), name ASC"
-
-            rows = await conn.fetch(sql)
-
-            return [
-                {
-                    "id": r["id"],
-                    "name": display_label(r["name"]),
-                }
-                for r in rows
-            ]
+        vocab = await vocabulary.get(pool)
+        return vocab.options("colors")
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,16 @@
+import numpy as np
 from fastapi import HTTPException
+
+from app.db.pgvector import to_db_vector
+from app.helpers.vector_helpers import feature_encoder, remap_vector
 from app.helpers.vector_math import ema_update
 
 FAV_ALPHA = 0.08  
 
-async def apply_favorite_to_user_style(conn, user_id: str, outfit_vec: list[float]) -> None:
+async def apply_favorite_to_user_style(conn, user_id: str, outfit_vec: np.ndarray) -> None:
     row = await conn.fetchrow(
         """
-        SELECT style_vec, style_signal_count
+        SELECT style_vec, style_schema_version, style_signal_count
         FROM Users
         WHERE id = $1::uuid
         """,
@@ -16,13 +20,14 @@ async def apply_favorite_to_user_style(conn, user_id: str, outfit_vec: list[floa
         raise HTTPException(404, "User not found")
 
     if row["style_vec"] is None:
-        style_vec = [0.0] * len(outfit_vec)
+        style_vec = np.zeros(len(outfit_vec), dtype=np.float32)
         count = 0
     else:
-        style_vec = list(row["style_vec"])
+        # taste saved under an older vocabulary is remapped, not thrown away
+        style_vec = remap_vector(row["style_vec"], row["style_schema_version"])
         count = int(row["style_signal_count"] or 0)
-        if len(style_vec) != len(outfit_vec):
-            style_vec = [0.0] * len(outfit_vec)
+        if style_vec is None or len(style_vec) != len(outfit_vec):
+            style_vec = np.zeros(len(outfit_vec), dtype=np.float32)
             count = 0
 
     new_style = ema_update(style_vec, outfit_vec, learning_rate=FAV_ALPHA, feedback_direction=+1)
@@ -31,10 +36,11 @@ async def apply_favorite_to_user_style(conn, user_id: str, outfit_vec: list[floa
     await conn.execute(
         """
         UPDATE Users
-        SET style_vec = $2, style_signal_count = $3
+        SET style_vec = $2, style_signal_count = $3, style_schema_version = $4
         WHERE id = $1::uuid
         """,
         user_id,
-        new_style,
+        to_db_vector(new_style),
         new_count,
+        feature_encoder.schema_version,
     )
\ No newline at end of file
@@ -0,0 +1,159 @@
+import uuid
+
+from fastapi import HTTPException
+
+from app.db.vocabulary import vocabulary
+from app.helpers.bit_vectors import pack_bits_batch
+from app.helpers.vector_helpers import feature_encoder
+from app.models.category_mapping import CATEGORY_ID_TO_NAME
+from app.models.item_modal import ItemImportRow
+from app.services.user_version_service import bump_user_version
+from app.utils.upsert_tags import TAG_FAMILIES, clean_tags
+
+ITEM_COLUMNS = [
+    "id", "img_description", "image_url", "processed_img_url",
+    "category_id", "subcategory_id", "in_laundry", "attr_vector",
+    "attr_bits", "attr_bits_count",
+]
+
+
+def _link_family_sql(family: dict, name: str) -> str:
+    # upsert every distinct staged name once, then link all staged (item, name) pairs
+    return f"""
+        WITH tags AS (
+            INSERT INTO {family["table"]} (user_id, name, {family["mapped_field"]})
+            SELECT DISTINCT ON (name) $1::uuid, name, master_id
+            FROM import_tags
+            WHERE family = '{name}'
+            ORDER BY name
+            ON CONFLICT (user_id, name)
+            DO UPDATE SET name = EXCLUDED.name,
+                {family["mapped_field"]} = EXCLUDED.{family["mapped_field"]}
+            RETURNING id, name
+        )
+        INSERT INTO {family["pivot_table"]} (item_id, {family["pivot_field"]})
+        SELECT DISTINCT it.item_id, tags.id
+        FROM import_tags it
+        JOIN tags ON tags.name = it.name
+        WHERE it.family = '{name}'
+        ON CONFLICT DO NOTHING;
+    """
+
+
+_LINK_FAMILY_SQL = {name: _link_family_sql(family, name) for name, family in TAG_FAMILIES.items()}
+
+
+def build_import_records(rows: list[ItemImportRow], vocab):
+    """
+    Item, tag and (item_id, season_id) records for COPY. Ids are generated
+    here so tags can be staged against them without a RETURNING round trip.
+    """
+    item_records = []
+    tag_records = []
+    season_records = []
+
+    matrix = feature_encoder.encode_batch([
+        {
+            "categories": [CATEGORY_ID_TO_NAME[row.category_id]] if row.category_id in CATEGORY_ID_TO_NAME else [],
+            "colors": row.colors,
+            "materials": row.materials,
+            "occasions": row.occasions,
+            "seasons": row.seasons,
+        }
+        for row in rows
+    ])
+
+    for row, vector, (bits, bit_count) in zip(rows, matrix.tolist(), pack_bits_batch(matrix)):
+        item_id = uuid.uuid4()
+        item_records.append((
+            item_id, row.img_description, row.image_url, row.processed_img_url,
+            row.category_id, row.subcategory_id, row.in_laundry, vector,
+            bits, bit_count,
+        ))
+
+        for family in TAG_FAMILIES:
+            for name in clean_tags(getattr(row, family)):
+                tag_records.append((item_id, family, name, vocab.master_id(family, name)))
+
+        for name in row.seasons:
+            season_id = vocab.season_id(name)
+            if season_id is not None:
+                season_records.append((item_id, season_id))
+
+    return item_records, tag_records, season_records
+
+
+async def import_items_service(pool, user_id: str, rows: list[ItemImportRow]):
+    """
+    Imports many items at once, in one transaction and a fixed number of round
+    trips: rows and tags are COPYed into temp tables, then moved into the real
+    tables with one statement per table.
+    """
+    try:
+        async with pool.acquire() as conn:
+            vocab = await vocabulary.get(conn)
+            item_records, tag_records, season_records = build_import_records(rows, vocab)
+
+            async with conn.transaction():
+                # staging tables, same column types as the real ones
+                await conn.execute(
+                    f"""
+                    CREATE TEMP TABLE import_items ON COMMIT DROP AS
+                    SELECT {", ".join(ITEM_COLUMNS)} FROM ClothingItems WITH NO DATA;
+
+                    CREATE TEMP TABLE import_tags (
+                        item_id uuid NOT NULL,
+                        family text NOT NULL,
+                        name text NOT NULL,
+                        master_id uuid
+                    ) ON COMMIT DROP;
+
+                    CREATE TEMP TABLE import_seasons ON COMMIT DROP AS
+                    SELECT item_id, season_id FROM ItemSeasons WITH NO DATA;
+                    """
+                )
+
+                await conn.copy_records_to_table("import_items", records=item_records, columns=ITEM_COLUMNS)
+                if tag_records:
+                    await conn.copy_records_to_table(
+                        "import_tags", records=tag_records, columns=["item_id", "family", "name", "master_id"]
+                    )
+                if season_records:
+                    await conn.copy_records_to_table(
+                        "import_seasons", records=season_records, columns=["item_id", "season_id"]
+                    )
+
+                await conn.execute(
+                    f"""
+                    INSERT INTO ClothingItems (user_id, {", ".join(ITEM_COLUMNS)}, attr_schema_version)
+                    SELECT $1::uuid, {", ".join(ITEM_COLUMNS)}, $2
+                    FROM import_items;
+                    """,
+                    user_id,
+                    feature_encoder.schema_version,
+                )
+
+                if tag_records:
+                    for family in TAG_FAMILIES:
+                        await conn.execute(_LINK_FAMILY_SQL[family], user_id)
+
+                if season_records:
+                    # season ids come from the vocabulary cache, the join drops any deleted since
+                    await conn.execute(
+                        """
+                        INSERT INTO ItemSeasons (item_id, season_id)
+                        SELECT DISTINCT it.item_id, s.id
+                        FROM import_seasons it
+                        JOIN Seasons s ON s.id = it.season_id
+                        ON CONFLICT DO NOTHING;
+                        """
+                    )
+
+                await bump_user_version(conn, user_id)
+
+        return {"imported": len(item_records), "ids": [str(record[0]) for record in item_records]}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
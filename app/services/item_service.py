@@ -1,228 +1,188 @@
 from fastapi import HTTPException
 
-from app.models.category_mapping import CATEGORY_ID_TO_NAME, SEASON_MAP
-from app.helpers.vector_helpers import build_item_feature_vector
-from app.utils.upsert_tags import upsert_tags
+from app.models.category_mapping import CATEGORY_ID_TO_NAME
+from app.helpers.bit_vectors import pack_bits, pop_packed
+from app.helpers.vector_helpers import build_item_feature_vector, feature_encoder
+from app.db.vocabulary import vocabulary
+from app.utils.upsert_tags import clean_tags, link_seasons, unlink_seasons, unlink_tags, upsert_tags
+from app.db.queries import fetch_named, fetchrow_named
+from app.helpers.pagination import decode_cursor, encode_cursor
 from app.models.item_modal import ClothingItemCreate
+from app.services.user_version_service import bump_user_version
 from datetime import datetime, timedelta, timezone
 
+# page size when a cursor comes without a limit
+ITEMS_PAGE_SIZE = 50
 
 # GET ITEM BY ID
 
-async def get_item_by_id_service(pool, item_id: str):
+async def get_item_by_id_service(conn, item_id: str):
     try:
-        async with pool.acquire() as connection:
-            # Base item- last_worn_at calculated on the fly, ignoring future logs
-            row = await connection.fetchrow(
-                """
-                SELECT ci.*,
-                       (
-                           SELECT MAX(owl.worn_at)
-                           FROM outfit_wear_log owl
-                           JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
-                           WHERE oi.item_id = ci.id
-                             AND owl.worn_at <= NOW()
-                       ) AS last_worn_at
-                FROM ClothingItems ci
-                WHERE ci.id = $1;
-                """,
-                item_id
-            )
-
-            if not row:
-                raise HTTPException(status_code=404, detail="Item not found")
-
-            item = dict(row)
-
-            # Fetch tags
-            colors = await connection.fetch("""
-                SELECT c.name FROM Colors c
-                JOIN ItemColors ic ON ic.color_id = c.id
-                WHERE ic.item_id = $1;
-            """, item_id)
-
-            materials = await connection.fetch("""
-                SELECT m.name FROM Materials m
-                JOIN ItemMaterials im ON im.material_id = m.id
-                WHERE im.item_id = $1;
-            """, item_id)
-
-            seasons = await connection.fetch("""
-                SELECT s.name FROM Seasons s
-                JOIN ItemSeasons is2 ON is2.season_id = s.id
-                WHERE is2.item_id = $1;
-            """, item_id)
+        # Item + tags in one round trip - last_worn_at calculated on the fly, ignoring future logs
+        row = await fetchrow_named(conn, "item.by_id", item_id)
 
-            occasions = await connection.fetch("""
-                SELECT o.name FROM Occasions o
-                JOIN ItemOccasions io ON io.occasion_id = o.id
-                WHERE io.item_id = $1;
-            """, item_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="Item not found")
 
+        item = dict(row)
+        pop_packed(item)
+        return item
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            # Attach arrays
-            item["colors"] = [r["name"] for r in colors]
-            item["materials"] = [r["name"] for r in materials]
-            item["seasons"] = [r["name"] for r in seasons]
-            item["occasions"] = [r["name"] for r in occasions]
 
-            return item
+# GET MANY ITEMS BY ID
+async def get_items_by_ids_service(conn, user_id: str, item_ids: list):
+    """
+    Items (with tags) for the given ids in one query, in request order.
+    Ids that do not exist or belong to another user are left out.
+    """
+    try:
+        # drop duplicates, keep the order
+        item_ids = list(dict.fromkeys(item_ids))
+        rows = await fetch_named(conn, "items.by_ids", item_ids, user_id)
+        items = [dict(row) for row in rows]
+        for item in items:
+            pop_packed(item)
+        return items
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 
 # GET ITEMS BY USER ID
-async def get_items_by_user_service(pool, user_id: str):
-    try:
-        async with pool.acquire() as connection:
-            # last_worn_at calculated on the fly, ignoring future logs
-            rows = await connection.fetch(
-                """
-                SELECT ci.*,
-                       (
-                           SELECT MAX(owl.worn_at)
-                           FROM outfit_wear_log owl
-                           JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
-                           WHERE oi.item_id = ci.id
-                             AND owl.worn_at <= NOW()
-                       ) AS last_worn_at
-                FROM ClothingItems ci
-                WHERE ci.user_id = $1
-                ORDER BY ci.created_at DESC;
-                """,
-                user_id
-            )
-            return [dict(row) for row in rows]
+async def get_items_by_user_service(
+    pool,
+    user_id: str,
+    limit: int | None = None,
+    cursor: str | None = None,
+    category_id: int | None = None,
+    in_laundry: bool | None = None,
+):
+    """
+    One page of the user's wardrobe, newest first.
+    Returns {"items", "next_cursor"}; next_cursor is None on the last page.
+    Without limit and cursor it returns every item as {"items"}, the unpaged response.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    paged = limit is not None or after is not None
+    if paged and limit is None:
+        limit = ITEMS_PAGE_SIZE
 
+    try:
+        async with pool.acquire(read_only=True) as connection:
+            # one extra row tells us whether there is another page (LIMIT NULL: no limit)
+            if after is None:
+                rows = await fetch_named(
+                    connection, "items.by_user", user_id, category_id, in_laundry, limit + 1 if paged else None
+                )
+            else:
+                rows = await fetch_named(
+                    connection, "items.by_user_after", user_id, category_id, in_laundry, limit + 1, *after
+                )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not paged:
+        return {"items": [dict(row) for row in rows]}
+
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+
+    return {"items": items, "next_cursor": next_cursor}
+
 
 
 # CREATE ITEM
 async def create_item_service(pool, item: ClothingItemCreate):
     """
-    Creates a new wardrobe item and attaches all tags.
+    Creates a new wardrobe item and attaches all tags, atomically.
+    The feature vector is built up front so the row is inserted complete.
     """
-    try:
-        async with pool.acquire() as con:
-
-            # Insert the base item row
-            item_row = await con.fetchrow(
-                """
-                INSERT INTO clothingItems (
-                    user_id, img_description, image_url, processed_img_url,
-                    category_id, subcategory_id, in_laundry
-                )
-                VALUES ($1,$2,$3,$4,$5,$6,$7)
-                RETURNING id;
-                """,
-                item.user_id,
-                item.img_description,
-                item.image_url,
-                item.processed_img_url,
-                item.category_id,
-                item.subcategory_id,
-                item.in_laundry,
-            )
-
-            item_id = item_row["id"]
+    cat_name = CATEGORY_ID_TO_NAME.get(item.category_id)
 
-            # TAGS
+    feature_vector = build_item_feature_vector(
+        category_name=[cat_name] if cat_name else [],
+        color_names=item.colors or [],
+        material_names=item.materials or [],
+        occasion_names=item.occasions or [],
+        season_names=item.seasons or [],
+    )
+    attr_bits, attr_bits_count = pack_bits(feature_vector)
 
-            #user generated colors
-            await upsert_tags(
-                con, "Colors", "ItemColors", "color_id", "mapped_color_id",  "colors_master",
-                item_id, item.user_id, item.colors
-            )
-            # user generated materials
-            await upsert_tags(
-                con, "Materials", "ItemMaterials", "material_id", "mapped_material_id","materials_master",
-                item_id, item.user_id, item.materials
-            )
-            # user generated  occasions
-            await upsert_tags(
-                con, "Occasions", "ItemOccasions", "occasion_id",   "mapped_occasion_id","occasions_master",
-                item_id, item.user_id, item.occasions
-            )
-            for season in item.seasons:
-                season = season.strip().lower()
-
-                season_row = await con.fetchrow(
-                    "SELECT id FROM Seasons WHERE LOWER(name) = $1;",
-                    season
-                )
-                if not season_row:
-                    continue
-
-                season_id = season_row["id"]
+    try:
+        async with pool.acquire() as con:
+            async with con.transaction():
 
-                # Directly link
-                await con.execute(
+                # Insert the base item row
+                item_id = await con.fetchval(
                     """
-                    INSERT INTO ItemSeasons (item_id, season_id)
-                    VALUES ($1, $2)
-                    ON CONFLICT DO NOTHING;
+                    INSERT INTO clothingItems (
+                        user_id, img_description, image_url, processed_img_url,
+                        category_id, subcategory_id, in_laundry,
+                        attr_vector, attr_bits, attr_bits_count, attr_schema_version
+                    )
+                    VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11)
+                    RETURNING id;
                     """,
-                    item_id,
-                    season_id
+                    item.user_id,
+                    item.img_description,
+                    item.image_url,
+                    item.processed_img_url,
+                    item.category_id,
+                    item.subcategory_id,
+                    item.in_laundry,
+                    feature_vector,
+                    attr_bits,
+                    attr_bits_count,
+                    feature_encoder.schema_version,
                 )
 
-            cat_name = CATEGORY_ID_TO_NAME.get(item.category_id)
+                # TAGS - one statement per family
+                await upsert_tags(con, "colors", item_id, item.user_id, item.colors)
+                await upsert_tags(con, "materials", item_id, item.user_id, item.materials)
+                await upsert_tags(con, "occasions", item_id, item.user_id, item.occasions)
+                await link_seasons(con, item_id, item.seasons)
+                await bump_user_version(con, item.user_id)
 
-            # after you have item_id and the tag lists:
-            feature_vector = build_item_feature_vector(
-                category_name=[cat_name] if cat_name else [],
-                color_names=item.colors or [],
-                material_names=item.materials or [],
-                occasion_names=item.occasions or [],
-                season_names=item.seasons or [],
-            )
-
-            await con.execute(
-                """
-                UPDATE clothingItems 
-                SET attr_vector = $1, 
-                    attr_schema_version = 1
-                WHERE id = $2
-                """,
-                feature_vector,
-                item_id
-            )
             return {"status": "created","id":str(item_id)}
 
-
-
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # DELETE ITEM
-async def delete_item_service(pool, item_id: str):
+async def delete_item_service(conn, item_id: str, user_id: str):
+    """
+    Expects a connection inside a transaction (see dependencies/db.py).
+    """
     try:
-        async with pool.acquire() as con:
-            async with con.transaction():
-                await con.execute(
-                    """
-                    UPDATE Outfits
-                    SET is_favorite = FALSE
-                    WHERE is_favorite = TRUE
-                      AND id IN (
-                          SELECT outfit_id
-                          FROM OutfitItems
-                          WHERE item_id = $1
-                      );
-                    """,
-                    item_id
-                )
+        await conn.execute(
+            """
+            UPDATE Outfits
+            SET is_favorite = FALSE
+            WHERE is_favorite = TRUE
+              AND id IN (
+                  SELECT outfit_id
+                  FROM OutfitItems
+                  WHERE item_id = $1
+              );
+            """,
+            item_id
+        )
 
-                await con.execute(
-                    "DELETE FROM ClothingItems WHERE id = $1;",
-                    item_id
-                )
+        await conn.execute(
+            "DELETE FROM ClothingItems WHERE id = $1;",
+            item_id
+        )
+        await bump_user_version(conn, user_id)
 
-            return {"message": "Item deleted"}
+        return {"message": "Item deleted"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -233,121 +193,99 @@ async def delete_item_service(pool, item_id: str):
 
 # UPDATE ITEM
 
-async def update_item_service(pool, item_id: str, data: dict):
+# scalar columns a PATCH may change
+UPDATABLE_FIELDS = ("img_description", "category_id", "subcategory_id", "in_laundry")
+TAG_FIELDS = ("colors", "materials", "occasions")
+
+
+async def update_item_service(conn, item_id: str, data: dict, existing: dict):
     """
-    Updates item fields AND all tag relations.
+    Updates only what changed, compared with `existing` (the row from get_item_by_id_service):
+    one UPDATE for the changed fields, and only the tag links that were added or removed.
+    attr_vector is rebuilt only when the category or a tag family changed.
+    Expects a connection inside a transaction (see dependencies/db.py).
     """
     user_id = data.get("user_id")
     if not user_id:
         raise HTTPException(400, "Missing user_id in request")
 
     try:
-        async with pool.acquire() as conn:
-
-
-            # 1. UPDATE MAIN FIELDS (description, category,subcategory)
-
-            if "img_description" in data:
-                await conn.execute(
-                    "UPDATE ClothingItems SET img_description = $1 WHERE id = $2",
-                    data["img_description"],
-                    item_id
-                )
-
-            if "category_id" in data:
-                await conn.execute(
-                    "UPDATE ClothingItems SET category_id = $1 WHERE id = $2",
-                    data["category_id"],
-                    item_id
+        # 1. CHANGED MAIN FIELDS
+        changes = {
+            field: data[field]
+            for field in UPDATABLE_FIELDS
+            if field in data and data[field] != existing.get(field)
+        }
+
+        # 2. TAG SET DIFFERENCES (final lists feed the vector)
+        final_tags = {}
+        tag_diffs = {}
+        for field in TAG_FIELDS:
+            current = existing.get(field) or []
+            if data.get(field) is None:
+                final_tags[field] = current
+                continue
+
+            wanted = list(dict.fromkeys(clean_tags(data[field])))
+            final_tags[field] = wanted
+            added = [name for name in wanted if name not in current]
+            removed = [name for name in current if name not in wanted]
+            if added or removed:
+                tag_diffs[field] = (added, removed)
+
+        vocab = await vocabulary.get(conn)
+        current_seasons = existing.get("seasons") or []
+        final_seasons = current_seasons
+        season_diff = None
+        if data.get("seasons") is not None:
+            final_seasons = [name for name in data["seasons"] if vocab.season_id(name) is not None]
+            current_ids = {vocab.season_id(name) for name in current_seasons}
+            wanted_ids = {vocab.season_id(name) for name in final_seasons}
+            if current_ids != wanted_ids:
+                season_diff = (
+                    [name for name in final_seasons if vocab.season_id(name) not in current_ids],
+                    current_ids - wanted_ids,
                 )
 
-            if "subcategory_id" in data:
-                await conn.execute(
-                    "UPDATE ClothingItems SET subcategory_id = $1 WHERE id = $2",
-                    data["subcategory_id"],
-                    item_id
-                )
-
-            if "in_laundry" in data:
-                await conn.execute(
-                    "UPDATE ClothingItems SET in_laundry = $1 WHERE id = $2",
-                    data["in_laundry"],
-                    item_id
-                )
-
-            # 2. HANDLE ALL TAG TYPES
-
-            # Colors
-            if "colors" in data and data["colors"] is not None:
-                # delete all existing relations first
-                await conn.execute("DELETE FROM ItemColors WHERE item_id = $1", item_id)
-
-                # then insert new ones (if list not empty)
-                await upsert_tags(
-                    conn, "Colors", "ItemColors", "color_id", "mapped_color_id", "colors_master",
-                    item_id, user_id, data["colors"]
-                )
-
-            # Materials
-            if "materials" in data and data["materials"] is not None:
-                await conn.execute("DELETE FROM ItemMaterials WHERE item_id = $1", item_id)
-                await upsert_tags(conn, "Materials", "ItemMaterials", "material_id", "mapped_material_id", "materials_master",
-                                  item_id, user_id, data["materials"])
-
-            if "occasions" in data and data["occasions"] is not None:
-                await conn.execute("DELETE FROM ItemOccasions WHERE item_id = $1", item_id)
-                await upsert_tags(conn, "Occasions", "ItemOccasions", "occasion_id", "mapped_occasion_id","occasions_master",
-                                  item_id, user_id, data["occasions"])
-
-            # Seasons
-            if "seasons" in data and data["seasons"] is not None:
-                await conn.execute("DELETE FROM ItemSeasons WHERE item_id = $1", item_id)
-
-                for season in data["seasons"]:
-                    key = (season or "").strip().lower()
-                    canonical = SEASON_MAP.get(key)
-                    if not canonical:
-                        continue
-
-                    season_row = await conn.fetchrow(
-                        "SELECT id FROM Seasons WHERE name = $1;",
-                        canonical
-                    )
-                    if not season_row:
-                        continue
-
-                    await conn.execute(
-                        """
-                        INSERT INTO ItemSeasons (item_id, season_id)
-                        VALUES ($1, $2)
-                        ON CONFLICT DO NOTHING;
-                        """,
-                        item_id,
-                        season_row["id"]
-                    )
-
-            cat_name = CATEGORY_ID_TO_NAME.get(data["category_id"])
-
-            feature_vector = build_item_feature_vector(
+        # 3. VECTOR, only if something it encodes changed
+        if "category_id" in changes or tag_diffs or season_diff:
+            cat_name = CATEGORY_ID_TO_NAME.get(changes.get("category_id", existing.get("category_id")))
+            changes["attr_vector"] = build_item_feature_vector(
                 category_name=[cat_name] if cat_name else [],
-                color_names=data["colors"] or [],
-                material_names=data["materials"] or [],
-                occasion_names=data["occasions"] or [],
-                season_names=data["seasons"] or [],
+                color_names=final_tags["colors"],
+                material_names=final_tags["materials"],
+                occasion_names=final_tags["occasions"],
+                season_names=final_seasons,
             )
+            changes["attr_bits"], changes["attr_bits_count"] = pack_bits(changes["attr_vector"])
+            changes["attr_schema_version"] = feature_encoder.schema_version
 
+        # 4. ONE UPDATE for everything that changed on the row
+        if changes:
+            assignments = ", ".join(f"{column} = ${i}" for i, column in enumerate(changes, start=2))
             await conn.execute(
-                """
-                UPDATE clothingItems 
-                SET attr_vector = $1, 
-                    attr_schema_version = 1
-                WHERE id = $2
-                """,
-                feature_vector,
-                item_id
+                f"UPDATE ClothingItems SET {assignments} WHERE id = $1",
+                item_id,
+                *changes.values(),
             )
-            return {"status": "created", "id": str(item_id)}
 
+        # 5. ONLY THE CHANGED TAG LINKS
+        for field, (added, removed) in tag_diffs.items():
+            await unlink_tags(conn, field, item_id, removed)
+            await upsert_tags(conn, field, item_id, user_id, added)
+
+        if season_diff:
+            added_seasons, removed_ids = season_diff
+            await unlink_seasons(conn, item_id, removed_ids)
+            await link_seasons(conn, item_id, added_seasons)
+
+        if changes or tag_diffs or season_diff:
+            await bump_user_version(conn, existing["user_id"])
+
+        return {"status": "created", "id": str(item_id)}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -359,62 +297,16 @@ async def get_unworn_items_service(pool, user_id: str, days: int = 14):
     cutoff_date = get_unworn_cutoff(days)
 
     async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT
-                ci.id,
-                ci.image_url,
-                ci.processed_img_url,
-                ci.img_description,
-                MAX(owl.worn_at) AS last_worn_at
-            FROM clothingItems ci
-            LEFT JOIN outfitItems oi
-                ON oi.item_id = ci.id
-            LEFT JOIN outfit_wear_log owl
-                ON owl.outfit_id = oi.outfit_id
-               AND owl.worn_at <= NOW()
-            WHERE ci.user_id = $1
-            GROUP BY ci.id, ci.image_url, ci.processed_img_url, ci.img_description
-            HAVING MAX(owl.worn_at) IS NULL
-                OR MAX(owl.worn_at) < $2
-            ORDER BY last_worn_at NULLS FIRST
-            """,
-            user_id,
-            cutoff_date,
-        )
+        rows = await fetch_named(conn, "items.unworn", user_id, cutoff_date)
 
     return [dict(r) for r in rows]
 
 async def get_most_worn_items_service(pool, user_id: str, limit: int = 10):
     try:
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT
-                    ci.id,
-                    ci.image_url,
-                    ci.img_description,
-                    COUNT(owl.id) AS wear_count,
-                    MAX(owl.worn_at) AS last_worn_at
-                FROM ClothingItems ci
-                JOIN OutfitItems oi
-                    ON oi.item_id = ci.id
-                JOIN outfit_wear_log owl
-                    ON owl.outfit_id = oi.outfit_id
-                   AND owl.worn_at <= NOW()
-                WHERE ci.user_id = $1
-                GROUP BY
-                    ci.id,
-                    ci.image_url,
-                    ci.img_description
-                ORDER BY wear_count DESC, last_worn_at DESC
-                LIMIT $2;
-                """,
-                user_id,
-                limit,
-            )
+            rows = await fetch_named(conn, "items.most_worn", user_id, limit)
 
             return {"items": [dict(row) for row in rows]}
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone, date, time
 from typing import Dict, Optional, List
 from zoneinfo import ZoneInfo
@@ -8,6 +7,8 @@ from zoneinfo import ZoneInfo
 from fastapi import HTTPException
 import calendar
 from app.services.outfit_service import create_outfit_service
+from app.db.queries import fetch_named, fetchrow_named, fetchval_named, execute_named
+from app.services.user_version_service import bump_user_version
 
 
 from datetime import datetime, date
@@ -48,42 +49,22 @@ async def log_outfit_service(
             else:
                 used_worn_at = datetime.now(DUBLIN_TZ)
 
-            row = await conn.fetchrow(
-                """
-                INSERT INTO outfit_wear_log (worn_at, outfit_id)
-                VALUES ($1, $2)
-                RETURNING id::text AS wear_log_id, outfit_id::text;
-                """,
-                used_worn_at,
-                used_outfit_id,
-            )
+            row = await fetchrow_named(conn, "wear_log.insert", used_worn_at, used_outfit_id)
+
+            # keep item_wear_stats current: count it now, or park it until its date
+            await execute_named(conn, "wear_stats.apply_due", user_id)
 
             now_local = datetime.now(DUBLIN_TZ)
 
             if used_worn_at <= now_local:
-                await conn.execute(
-                    """
-                    UPDATE ClothingItems ci
-                    SET last_worn_at = sub.max_worn_at
-                    FROM (
-                        SELECT
-                            oi.item_id,
-                            MAX(owl.worn_at) AS max_worn_at
-                        FROM OutfitItems oi
-                        JOIN outfit_wear_log owl
-                            ON owl.outfit_id = oi.outfit_id
-                        WHERE oi.item_id IN (
-                            SELECT item_id
-                            FROM OutfitItems
-                            WHERE outfit_id = $1
-                        )
-                        GROUP BY oi.item_id
-                    ) sub
-                    WHERE ci.id = sub.item_id;
-                    """,
-                    used_outfit_id,
+                await execute_named(conn, "wear_stats.add_log", used_outfit_id, used_worn_at)
+            else:
+                await execute_named(
+                    conn, "wear_stats.add_pending", row["wear_log_id"], used_outfit_id, used_worn_at
                 )
 
+            await bump_user_version(conn, user_id)
+
         return dict(row)
 
 
@@ -99,30 +80,16 @@ async def get_logged_outfits_month_service(pool, user_id: str, month: str):
     except Exception:
         raise HTTPException(400, "month must be YYYY-MM")
 
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date AS date,
-                   COUNT(*)::int AS count
-            FROM outfit_wear_log owl
-            JOIN Outfits o ON o.id = owl.outfit_id
-            WHERE o.user_id = $1::uuid
-              AND (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date BETWEEN $2 AND $3
-            GROUP BY 1
-            ORDER BY 1;
-            """,
-            user_id,
-            start,
-            end,
-        )
+    async with pool.acquire(read_only=True) as conn:
+        rows = await fetch_named(conn, "wear_log.month", user_id, start, end)
 
     return [{"date": str(r["date"]), "count": r["count"]} for r in rows]
 
 
 async def get_logged_outfits_day_service(pool, user_id: str, date_str: str):
     """
-    Returns all logs for a given day as:
-    {wear_log_id, worn_at, note, outfit_id, outfit_name}
+    Returns all logs for a given day as a JSON array (text, rendered by Postgres):
+    [{wear_log_id, worn_at, outfit_id, items: [{item_id, image_url, category, position}]}]
     """
     try:
         y, m, d = map(int, date_str.split("-"))
@@ -130,127 +97,30 @@ async def get_logged_outfits_day_service(pool, user_id: str, date_str: str):
     except Exception:
         raise HTTPException(400, "date_str must be YYYY-MM-DD")
 
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT
-              owl.id::text AS wear_log_id,
-              owl.worn_at,
-              o.id::text AS outfit_id,
-
-              COALESCE(
-                json_agg(
-                  json_build_object(
-                    'item_id', ci.id::text,
-                    'image_url', ci.image_url,
-                    'category', ci.category,
-                    'position', oi.position
-                  )
-                  ORDER BY oi.position
-                ) FILTER (WHERE ci.id IS NOT NULL),
-                '[]'::json
-              ) AS items
-
-            FROM outfit_wear_log owl
-            JOIN Outfits o ON o.id = owl.outfit_id
-            LEFT JOIN OutfitItems oi ON oi.outfit_id = o.id
-            LEFT JOIN ClothingItems ci ON ci.id = oi.item_id
-
-            WHERE o.user_id = $1::uuid
-              AND (owl.worn_at AT TIME ZONE 'Europe/Dublin')::date = $2
-
-            GROUP BY owl.id, owl.worn_at, o.id
-            ORDER BY owl.worn_at DESC;
-            """,
-            user_id,
-            day
-        )
-
-    return [
-        {
-            "wear_log_id": r["wear_log_id"],
-            "worn_at": r["worn_at"].isoformat() if r["worn_at"] else None,
-            "outfit_id": r["outfit_id"],
-            "items": json.loads(r["items"]) if isinstance(r["items"], str) else (r["items"] or [])
-        }
-        for r in rows
-    ]
+    async with pool.acquire(read_only=True) as conn:
+        return await fetchval_named(conn, "wear_log.day", user_id, day)
 
 
 async def delete_logged_outfit_service(pool, user_id: str, wear_log_id: str) -> Dict[str, str]:
     async with pool.acquire() as conn:
         async with conn.transaction():
 
-            # 1) Make sure the wear log exists and belongs to this user
-            log_row = await conn.fetchrow(
-                """
-                SELECT
-                    owl.id,
-                    owl.outfit_id
-                FROM outfit_wear_log owl
-                JOIN Outfits o ON o.id = owl.outfit_id
-                WHERE owl.id = $1::uuid
-                  AND o.user_id = $2::uuid;
-                """,
-                wear_log_id,
-                user_id,
-            )
+            # 1) Fold due future logs into the stats first, so "pending" below is accurate
+            await execute_named(conn, "wear_stats.apply_due", user_id)
+
+            # 2) Make sure the wear log exists and belongs to this user
+            log_row = await fetchrow_named(conn, "wear_log.owned_by_user", wear_log_id, user_id)
 
             if not log_row:
                 raise HTTPException(status_code=404, detail="Wear log not found")
 
-            outfit_id = log_row["outfit_id"]
-
-            # 2) Get all items that belong to the outfit of this wear log
-            item_rows = await conn.fetch(
-                """
-                SELECT item_id
-                FROM OutfitItems
-                WHERE outfit_id = $1;
-                """,
-                outfit_id,
-            )
-            item_ids = [row["item_id"] for row in item_rows]
-
-            # 3) Delete only the wear log row
-            await conn.execute(
-                """
-                DELETE FROM outfit_wear_log
-                WHERE id = $1::uuid;
-                """,
-                wear_log_id,
-            )
+            # 3) Delete only the wear log row (its pending stats rows go with it)
+            await execute_named(conn, "wear_log.delete", wear_log_id)
 
-            # 4) Recalculate last_worn_at for each affected item
-            #    using remaining wear logs up to "now" only
-            now_utc = datetime.now(DUBLIN_TZ)
+            # 4) A log that was already counted comes off the items' wear stats
+            if not log_row["pending"]:
+                await execute_named(conn, "wear_stats.remove_log", log_row["outfit_id"], log_row["worn_at"])
 
-            for item_id in item_ids:
-                latest_row = await conn.fetchrow(
-                    """
-                    SELECT MAX(owl.worn_at) AS latest_worn_at
-                    FROM outfit_wear_log owl
-                    JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
-                    JOIN Outfits o ON o.id = owl.outfit_id
-                    WHERE oi.item_id = $1
-                      AND o.user_id = $2::uuid
-                      AND owl.worn_at <= $3;
-                    """,
-                    item_id,
-                    user_id,
-                    now_utc,
-                )
-
-                latest_worn_at = latest_row["latest_worn_at"] if latest_row else None
-
-                await conn.execute(
-                    """
-                    UPDATE ClothingItems
-                    SET last_worn_at = $1
-                    WHERE id = $2;
-                    """,
-                    latest_worn_at,
-                    item_id,
-                )
+            await bump_user_version(conn, user_id)
 
-            return {"message": "OOTD log deleted successfully"}
\ No newline at end of file
+            return {"message": "OOTD log deleted successfully"}
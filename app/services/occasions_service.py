@@ -1,27 +1,15 @@
-
-from typing import Any, Dict, List
 from fastapi import HTTPException
-from app.utils.normalize import  display_label
+
+from app.db.vocabulary import vocabulary
 
 
 async def get_occasions_options_service(pool):
+    """
+    Returns occasion options from occasions_master (served from the vocabulary cache).
+    """
     try:
-        async with pool.acquire() as conn:
-            sql = """
-                SELECT id::text AS id, name
-                FROM occasions_master
-            """
-            sql += " ORDER BY COALESCE(sort_order, 9999), name ASC"
+        vocab = await vocabulary.get(pool)
+        return vocab.options("occasions")
 
-            rows = await conn.fetch(sql)
-
-            return [
-                {
-                    "id": r["id"],
-                   "name": display_label(r["name"]),
-                }
-                for r in rows
-            ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
@@ -2,7 +2,13 @@ from typing import Optional
 from fastapi import HTTPException
 
 from app.services.favorite_items_helper import apply_favorite_to_user_style
-from app.helpers.vector_math import l2_normalize
+from app.db.queries import fetchval_named
+import numpy as np
+
+from app.db.pgvector import to_db_vector
+from app.helpers.vector_helpers import feature_encoder
+from app.helpers.vector_math import as_vector, normalize
+from app.services.user_version_service import bump_user_version
 
 
 async def create_outfit_service(conn, user_id: str,item_ids: list[Optional[str]], master_occasion_id: Optional[str] = None, name: Optional[str] = None, is_favorite:bool = False) -> str:
@@ -37,13 +43,14 @@ async def create_outfit_service(conn, user_id: str,item_ids: list[Optional[str]]
         outfit_vec = await compute_and_store_outfit_vec(conn, outfit_id)
         await apply_favorite_to_user_style(conn, user_id, outfit_vec)
 
+    await bump_user_version(conn, user_id)
     return str(outfit_id)
 
 async def update_outfit_service(conn, user_id: str, outfit_id: str):
     # 1) Check current state to prevent double counting
     row = await conn.fetchrow(
         """
-        SELECT is_favorite, outfit_vec
+        SELECT is_favorite, outfit_vec, attr_schema_version
         FROM Outfits
         WHERE id = $1::uuid AND user_id = $2::uuid
         """,
@@ -66,106 +73,82 @@ async def update_outfit_service(conn, user_id: str, outfit_id: str):
         user_id,
     )
 
-    if row["outfit_vec"] is None:
+    if row["outfit_vec"] is None or row["attr_schema_version"] != feature_encoder.schema_version:
         outfit_vec = await compute_and_store_outfit_vec(conn, outfit_id)
     else:
-        outfit_vec = list(row["outfit_vec"])
+        outfit_vec = as_vector(row["outfit_vec"])
 
     await apply_favorite_to_user_style(conn, user_id, outfit_vec)
+    await bump_user_version(conn, user_id)
 
     return {"outfit_id": outfit_id, "favorited": True}
 
 
-async def compute_and_store_outfit_vec(conn, outfit_id: str) -> list[float]:
+async def compute_and_store_outfit_vec(conn, outfit_id: str) -> np.ndarray:
     rows = await conn.fetch(
         """
         SELECT ci.attr_vector
         FROM OutfitItems oi
         JOIN ClothingItems ci ON ci.id = oi.item_id
         WHERE oi.outfit_id = $1::uuid
+          AND ci.attr_schema_version = $2
         ORDER BY oi.position ASC;
         """,
         outfit_id,
+        feature_encoder.schema_version,
     )
 
-    vecs = [l2_normalize(list(r["attr_vector"])) for r in rows if r["attr_vector"] is not None]
+    # only current-schema item vectors: the result is stamped with the current version
+    # (items still waiting for app/jobs/revectorize.py do not count yet)
+    vecs = [as_vector(r["attr_vector"]) for r in rows if r["attr_vector"] is not None]
     if len(vecs) < 2:
         raise HTTPException(400, "Outfit needs at least 2 item vectors")
 
     L = len(vecs[0])
     if any(len(v) != L for v in vecs):
-        raise HTTPException(500, "Vector length mismatch")
-
-    n = len(vecs)
-    sums = [0.0] * L
-    for v in vecs:
-        for i, x in enumerate(v):
-            sums[i] += float(x)
+        raise HTTPException(409, "Item vectors of this outfit have different lengths")
 
-    outfit_vec = [s / n for s in sums]
-    outfit_vec = l2_normalize(outfit_vec)
+    # mean of the normalized item vectors, normalized again
+    matrix = np.stack(vecs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    outfit_vec = normalize((matrix / np.where(norms == 0, 1, norms)).mean(axis=0))
 
     await conn.execute(
         """
         UPDATE Outfits
-        SET outfit_vec = $2
+        SET outfit_vec = $2, attr_schema_version = $3
         WHERE id = $1::uuid;
         """,
         outfit_id,
-        outfit_vec,
+        to_db_vector(outfit_vec),
+        feature_encoder.schema_version,
     )
 
     return outfit_vec
 
 
-async def get_favorite_outfits_service(pool, user_id: str):
-    async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT
-              o.id::text AS outfit_id,
-              o.name AS outfit_name,
-              o.master_occasion_id::text AS master_occasion_id,
-              om.name AS occasion_name,
-              COALESCE(
-                json_agg(
-                  json_build_object(
-                    'item_id', ci.id::text,
-                    'image_url', ci.image_url,
-                    'position', oi.position
-                  )
-                  ORDER BY oi.position
-                ) FILTER (WHERE ci.id IS NOT NULL),
-                '[]'::json
-              ) AS items
-            FROM Outfits o
-            LEFT JOIN occasions_master om ON om.id = o.master_occasion_id
-            LEFT JOIN OutfitItems oi ON oi.outfit_id = o.id
-            LEFT JOIN ClothingItems ci ON ci.id = oi.item_id
-            WHERE o.user_id = $1
-              AND o.is_favorite = TRUE
-            GROUP BY o.id, o.name, o.master_occasion_id, om.name
-            ORDER BY o.created_at DESC;
-            """,
-            user_id,
-        )
-        return {"outfits": [dict(r) for r in rows]}
+async def get_favorite_outfits_service(pool, user_id: str) -> str:
+    """{"outfits": [...]} as JSON text, rendered by Postgres (sent as is by the route)."""
+    async with pool.acquire(read_only=True) as conn:
+        return await fetchval_named(conn, "outfits.favorites", user_id)
 
 
 async def delete_favorite_outfit_service(pool, outfit_id, user_id):
     try:
         async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                UPDATE Outfits
-                SET is_favorite = FALSE,
-                    favorited_at = NULL
-                WHERE id = $1::uuid
-                  AND user_id = $2::uuid
-                """,
-                outfit_id,
-                user_id,
-            )
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    UPDATE Outfits
+                    SET is_favorite = FALSE,
+                        favorited_at = NULL
+                    WHERE id = $1::uuid
+                      AND user_id = $2::uuid
+                    """,
+                    outfit_id,
+                    user_id,
+                )
+                await bump_user_version(conn, user_id)
 
             return {"outfit_id": outfit_id, "unfavorited": True}
     except Exception as e:
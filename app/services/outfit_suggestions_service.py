@@ -1,10 +1,16 @@
 import traceback
 import random as rnd
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
 from fastapi import HTTPException
-from app.helpers.similarity_function import pick_top_k, dot
+from app.db.pgvector import PGVECTOR_ENABLED, SUGGESTIONS_SHORTLIST_SIZE
+from app.db.queries import fetch_named
+from app.helpers.bit_vectors import pop_packed
+from app.helpers.similarity_function import pick_top_k, dot, packed_style_scores
+from app.helpers.vector_helpers import feature_encoder
 from app.services.user_service import get_user_style_vec
-from app.helpers.vector_math import l2_normalize
+from app.helpers.vector_math import as_vector, normalize
 from app.helpers.rules import seasons_from_temp, needs_jacket, build_slots
 from app.services.weather_service import get_weather_service
 
@@ -14,51 +20,45 @@ async def get_items_for_suggestions_service(
     user_id: str,
     allowed_seasons: list[str],
     occasion_id: Optional[str],
+    style_vec: np.ndarray | None = None,
+    scores: dict | None = None,
 ) -> list[dict]:
-    async with pool.acquire() as conn:
+    """
+    With `style_vec`, `scores` (a dict) is filled with item id -> style score.
+    In pgvector mode Postgres ranks the items and only the best
+    SUGGESTIONS_SHORTLIST_SIZE per category come back, with their score;
+    otherwise all items come back and are scored from their packed vectors.
+    """
+    shortlist = PGVECTOR_ENABLED and style_vec is not None and len(style_vec) == feature_encoder.dim
+
+    async with pool.acquire(read_only=True) as conn:
         #Get items not in laundry and check if the occasion selected
-        rows = await conn.fetch(
-            """
-            SELECT DISTINCT ci.*
-            FROM ClothingItems ci
-            WHERE ci.user_id = $1
-              AND (ci.in_laundry IS NULL OR ci.in_laundry = FALSE)
-
-              -- Season filter:
-              AND (
-                    -- no season tags => allow
-                    NOT EXISTS (
-                        SELECT 1
-                        FROM ItemSeasons is2
-                        WHERE is2.item_id = ci.id
-                    )
-                    OR EXISTS (
-                        SELECT 1
-                        FROM ItemSeasons is2
-                        JOIN Seasons s ON s.id = is2.season_id
-                        WHERE is2.item_id = ci.id
-                          AND s.name = ANY($2::text[])
-                    )
-                  )
-
-              -- Occasion filter: only if occasion_id is provided
-              AND (
-                    $3::uuid IS NULL
-                    OR EXISTS (
-                        SELECT 1
-                        FROM ItemOccasions io
-                        JOIN Occasions o ON o.id = io.occasion_id
-                        WHERE io.item_id = ci.id
-                          AND o.mapped_occasion_id = $3::uuid
-                    )
-                  );
-            """,
-            user_id,
-            allowed_seasons,
-            occasion_id,
-        )
+        if shortlist:
+            rows = await fetch_named(
+                conn, "items.shortlist_by_style",
+                user_id, allowed_seasons, occasion_id, style_vec, SUGGESTIONS_SHORTLIST_SIZE,
+            )
+        else:
+            rows = await fetch_named(conn, "items.for_suggestions", user_id, allowed_seasons, occasion_id)
+
+    items = [dict(r) for r in rows]
+    packed = {}
+    for item in items:
+        # scoring columns are not sent back
+        bits = pop_packed(item)
+        score = item.pop("style_score", None)
+        item.pop("slot_rank", None)
+        if scores is None or style_vec is None:
+            continue
+        if score is not None:
+            scores[item["id"]] = score
+        elif bits and item.get("attr_schema_version") == feature_encoder.schema_version:
+            packed[item["id"]] = bits
 
-        return [dict(r) for r in rows]
+    if scores is not None and style_vec is not None:
+        # every remaining item scored once, instead of on each pick
+        scores.update(packed_style_scores(style_vec, packed))
+    return items
 
 #helper function for suggestions response shape
 def build_suggestions_response(weather, seasons, include_jacket, occasion_id, suggestions, message=None):
@@ -80,19 +80,25 @@ def build_suggestions_response(weather, seasons, include_jacket, occasion_id, su
 #Main recommendation engine
 async def get_outfit_suggestions_service(
     pool,
+    http,
     lat: float,
     lon: float,
     user_id: str,
     occasion_id: Optional[str]
 ):
     try:
-        weather = await get_weather_service(lat, lon) #get weather data will be used later for filtering
+        weather = await get_weather_service(http, lat, lon) #get weather data will be used later for filtering
 
         seasons = seasons_from_temp(weather["main"]["temp"])#convert weather into allowed seasons
         include_jacket = needs_jacket(weather)
 
+        # Load user style vector (pgvector mode ranks the items with it)
+        style_vec = await get_user_style_vec(pool, user_id)
+        print("style_vec exists?", style_vec is not None)
+        scores = {}
+
         # FIRST: Get clothes list (not in laundry+ season + optional occasion)
-        clothes = await get_items_for_suggestions_service(pool, user_id, seasons, occasion_id)
+        clothes = await get_items_for_suggestions_service(pool, user_id, seasons, occasion_id, style_vec, scores)
 
         if not clothes:
             return build_suggestions_response(
@@ -113,7 +119,7 @@ async def get_outfit_suggestions_service(
 
         #Fallback : If occasion filtering caused missing essentials, it retries without occasion filter
         if occasion_id and (need_shoes or need_bottoms or need_tops):
-            fallback_clothes = await get_items_for_suggestions_service(pool, user_id, seasons, None)
+            fallback_clothes = await get_items_for_suggestions_service(pool, user_id, seasons, None, style_vec, scores)
             fallback_slots =  build_slots(fallback_clothes)
 
             if need_shoes:
@@ -123,11 +129,7 @@ async def get_outfit_suggestions_service(
             if need_tops:
                 slots["top"] = fallback_slots.get("top", [])
 
-        # FOURTH: Load user style vector
-        style_vec = await get_user_style_vec(pool, user_id)
-        print("style_vec exists?", style_vec is not None)
-
-        # FIFTH: Generate outfits (unique signatures)
+        # FOURTH: Generate outfits (unique signatures)
         candidates = [] #all generated outfit possibilities
         attempts = 0 #how many times generation was tried
         seen = set() #used to prevent duplicates
@@ -136,7 +138,7 @@ async def get_outfit_suggestions_service(
         max_attempts = candidate_target * 10 #safety limit so it doesn’t loop forever
 
         while len(candidates) < candidate_target and attempts < max_attempts:
-            outfit = await make_one_outfit(slots, include_jacket, style_vec) #Builds one outfit
+            outfit = await make_one_outfit(slots, include_jacket, style_vec, scores) #Builds one outfit
             if outfit is None:
                 attempts += 1
                 continue
@@ -150,12 +152,12 @@ async def get_outfit_suggestions_service(
             #score whole outfit
             seen.add(sig)
             score = 0.0
-            if style_vec:
+            if style_vec is not None:
 
                 outfit_vector = outfit_vec_from_outfit(outfit, len(style_vec))
 
-                if outfit_vector:
-                    normalized_user_vec = l2_normalize(style_vec)
+                if outfit_vector is not None:
+                    normalized_user_vec = normalize(as_vector(style_vec))
                     score = dot(normalized_user_vec, outfit_vector)
 
 
@@ -213,7 +215,7 @@ async def get_outfit_suggestions_service(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def make_one_outfit(slots: dict, include_jacket: bool, style_vec: list[float] | None) -> dict | None:
+async def make_one_outfit(slots: dict, include_jacket: bool, style_vec: np.ndarray | None, scores: dict | None = None) -> dict | None:
     tops = slots.get("top", [])
     bottoms = slots.get("bottom", [])
     jumpsuits = slots.get("jumpsuit", [])
@@ -239,21 +241,21 @@ async def make_one_outfit(slots: dict, include_jacket: bool, style_vec: list[flo
             "type": "onepiece",
             "top": None,
             "bottom": None,
-            "jumpsuit": pick_top_k(jumpsuits, style_vec, k=6),
-            "shoes": pick_top_k(shoes_list, style_vec, k=6),
+            "jumpsuit": pick_top_k(jumpsuits, style_vec, k=6, scores=scores),
+            "shoes": pick_top_k(shoes_list, style_vec, k=6, scores=scores),
             "outerwear": None,
         }
     else:
         outfit = {
             "type": "twopiece",
-            "top": pick_top_k(tops, style_vec, k=6),
-            "bottom": pick_top_k(bottoms, style_vec, k=6),
+            "top": pick_top_k(tops, style_vec, k=6, scores=scores),
+            "bottom": pick_top_k(bottoms, style_vec, k=6, scores=scores),
             "jumpsuit": None,
-            "shoes": pick_top_k(shoes_list, style_vec, k=6),
+            "shoes": pick_top_k(shoes_list, style_vec, k=6, scores=scores),
             "outerwear": None,
         }
     if include_jacket:
-        outfit["outerwear"] = pick_top_k(outerwear_list, style_vec, k=6)
+        outfit["outerwear"] = pick_top_k(outerwear_list, style_vec, k=6, scores=scores)
     return outfit
 
 def outfit_signature(outfit: dict) -> tuple:
@@ -271,37 +273,27 @@ def item_key(x: dict | None) -> str:
     return str(x.get("id") if x else "none")
 
 #It gathers item vectors from outfit pieces.
-def outfit_vec_from_outfit(outfit: dict, style_len: int) -> list[float] | None:
-    vecs: list[list[float]] = []
-
+def outfit_vec_from_outfit(outfit: dict, style_len: int) -> np.ndarray | None:
     #skips: missing items,items without vectors,vectors with wrong length
+    vecs = []
     for key in ("top", "bottom", "shoes", "outerwear", "jumpsuit"):
         it = outfit.get(key)
-        if not it:
+        if not it or it.get("attr_vector") is None:
             continue
-        v = it.get("attr_vector")
-        if v is None:
-            continue
-        v = [float(x) for x in v]
-        if len(v) != style_len:
-            continue
-        vecs.append(l2_normalize(v))
+        v = as_vector(it["attr_vector"])
+        if len(v) == style_len:
+            vecs.append(v)
 
     if len(vecs) < 2:
         return None
 
     #It averages the normalized item vectors to create one combined outfit representation.
-    L = len(vecs[0])
-    sums = [0.0] * L
-    for v in vecs:
-        for i, x in enumerate(v):
-            sums[i] += x
-
-    avg = [s / len(vecs) for s in sums]
-    return l2_normalize(avg)
+    matrix = np.stack(vecs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return normalize((matrix / np.where(norms == 0, 1, norms)).mean(axis=0))
 
 
-def outfit_score(style_vec: list[float] | None, outfit_vec: list[float] | None) -> float:
-    if not style_vec or not outfit_vec:
+def outfit_score(style_vec: Sequence[float] | None, outfit_vec: Sequence[float] | None) -> float:
+    if style_vec is None or outfit_vec is None:
         return 0.0
     return dot(style_vec, outfit_vec)
\ No newline at end of file
@@ -1,43 +1,51 @@
+import numpy as np
 from fastapi import HTTPException
-from app.helpers.vector_math import ema_update
+
+from app.db.pgvector import to_db_vector
+from app.helpers.vector_helpers import feature_encoder, remap_vector
+from app.helpers.vector_math import as_vector, ema_update
 from app.services.outfit_service import compute_and_store_outfit_vec
 
 LIKE_ALPHA = 0.06
 DISLIKE_ALPHA = 0.04
 
-async def ensure_outfit_vec(conn, outfit_id: str) -> list[float]:
+async def ensure_outfit_vec(conn, outfit_id: str) -> np.ndarray:
     row = await conn.fetchrow(
-        "SELECT outfit_vec FROM Outfits WHERE id = $1::uuid",
+        "SELECT outfit_vec, attr_schema_version FROM Outfits WHERE id = $1::uuid",
         outfit_id
     )
     if not row:
         raise HTTPException(404, "Outfit not found")
 
-    if row["outfit_vec"] is None:
+    if row["outfit_vec"] is None or row["attr_schema_version"] != feature_encoder.schema_version:
         return await compute_and_store_outfit_vec(conn, outfit_id)
 
-    return list(row["outfit_vec"])
+    return as_vector(row["outfit_vec"])
 
-async def update_user_style_ema(conn, user_id: str, outfit_vec: list[float], alpha: float, sign: int):
+async def update_user_style_ema(conn, user_id: str, outfit_vec: np.ndarray, alpha: float, sign: int):
     row = await conn.fetchrow(
-        "SELECT style_vec, style_signal_count FROM Users WHERE id = $1::uuid",
+        "SELECT style_vec, style_schema_version, style_signal_count FROM Users WHERE id = $1::uuid",
         user_id
     )
     if not row:
         raise HTTPException(404, "User not found")
 
-    style_vec = list(row["style_vec"]) if row["style_vec"] is not None else [0.0] * len(outfit_vec)
+    style_vec = None
+    if row["style_vec"] is not None:
+        # taste saved under an older vocabulary is remapped, not thrown away
+        style_vec = remap_vector(row["style_vec"], row["style_schema_version"])
 
-    # reseting if mismatch
-    if len(style_vec) != len(outfit_vec):
-        style_vec = [0.0] * len(outfit_vec)
+    # reseting if missing or still mismatched
+    if style_vec is None or len(style_vec) != len(outfit_vec):
+        style_vec = np.zeros(len(outfit_vec), dtype=np.float32)
 
     new_style = ema_update(style_vec, outfit_vec, learning_rate=alpha, feedback_direction=sign)
 
     await conn.execute(
-        "UPDATE Users SET style_vec = $2 WHERE id = $1::uuid",
+        "UPDATE Users SET style_vec = $2, style_schema_version = $3 WHERE id = $1::uuid",
         user_id,
-        new_style,
+        to_db_vector(new_style),
+        feature_encoder.schema_version,
     )
 
 async def set_outfit_preference_service(conn, user_id: str, outfit_id: str, preference: str):
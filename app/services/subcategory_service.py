@@ -1,5 +1,7 @@
 from fastapi import HTTPException
 
+from app.services.user_version_service import bump_user_version
+
 
 async def get_subcategories_service(pool, user_id: str, category_id: int):
     try:
@@ -31,18 +33,20 @@ async def create_subcategory_service(pool, user_id: str, category_id: int, name:
 
     try:
         async with pool.acquire() as con:
-            row = await con.fetchrow(
-                """
-                INSERT INTO Subcategories (user_id, category_id, name)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (user_id, category_id, name)
-                DO UPDATE SET name = EXCLUDED.name
-                RETURNING id, name, category_id;
-                """,
-                user_id,
-                category_id,
-                clean_name,
-            )
+            async with con.transaction():
+                row = await con.fetchrow(
+                    """
+                    INSERT INTO Subcategories (user_id, category_id, name)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (user_id, category_id, name)
+                    DO UPDATE SET name = EXCLUDED.name
+                    RETURNING id, name, category_id;
+                    """,
+                    user_id,
+                    category_id,
+                    clean_name,
+                )
+                await bump_user_version(con, user_id)
 
             return {"subcategory": dict(row)}
 
@@ -64,10 +68,12 @@ async def delete_subcategory_service(pool, user_id, subcategory_id):
                 detail=f"This subcategory is still used by {count} item(s). Move them first."
             )
 
-        await conn.execute("""
-            DELETE FROM subcategories
-            WHERE id = $1 AND user_id = $2
-        """, subcategory_id, user_id)
+        async with conn.transaction():
+            await conn.execute("""
+                DELETE FROM subcategories
+                WHERE id = $1 AND user_id = $2
+            """, subcategory_id, user_id)
+            await bump_user_version(conn, user_id)
 
         return {"success": True}
 
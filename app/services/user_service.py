@@ -2,7 +2,9 @@
 from fastapi import HTTPException
 
 from app.config.supabase_client import supabase
-from app.helpers.vector_math import l2_normalize
+import numpy as np
+
+from app.helpers.vector_math import as_vector, normalize
 
 
 async def create_user_service(conn, user):
@@ -37,7 +39,7 @@ async def get_user_by_id_service(conn, user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def get_user_style_vec(pool, user_id: str) -> list[float] | None:
+async def get_user_style_vec(pool, user_id: str) -> np.ndarray | None:
     async with pool.acquire() as conn:
         row = await conn.fetchrow(
             "SELECT style_vec FROM Users WHERE id = $1::uuid",
@@ -45,7 +47,7 @@ async def get_user_style_vec(pool, user_id: str) -> list[float] | None:
         )
         if not row or row["style_vec"] is None:
             return None
-        return l2_normalize([float(x) for x in row["style_vec"]])
+        return normalize(as_vector(row["style_vec"]))
 
 async def update_tryon_image_path_service(conn, user_id: str, tryon_image_path: str | None):
     try:
@@ -0,0 +1,14 @@
+from app.db.queries import fetchrow_named, fetchval_named
+
+
+async def bump_user_version(conn, user_id) -> int:
+    """
+    Marks the user's wardrobe data as changed. Call it inside the mutation's
+    transaction so the new version commits (or rolls back) with the data.
+    """
+    return await fetchval_named(conn, "user_version.bump", str(user_id))
+
+
+async def get_user_version(conn, user_id) -> str:
+    row = await fetchrow_named(conn, "user_version.get", str(user_id))
+    return f"{row['version']}.{row['due_wear_logs']}"
@@ -1,12 +1,13 @@
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.config.supabase_client import supabase
 from app.helpers.user_image_helper import (
     TRYON_BUCKET,
     build_tryon_path,
     convert_image_to_webp,
     create_tryon_signed_url,
 )
+from app.storage.storage_backend import StorageBackend
 from app.services.user_service import (
     get_user_by_id_service,
     get_tryon_image_path_service,
@@ -14,32 +15,28 @@ from app.services.user_service import (
 )
 
 
-async def upload_tryon_image_service(conn, user_id: str, file_content_type: str | None, file_bytes: bytes):
+async def upload_tryon_image_service(pool, storage: StorageBackend, user_id: str, file_content_type: str | None, file_bytes: bytes):
     if not file_content_type or not file_content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed.")
 
     if not file_bytes:
         raise HTTPException(status_code=400, detail="Empty file.")
 
-    user_row = await get_user_by_id_service(conn, user_id)
+    # connections are only held for the queries, never across conversion or upload
+    async with pool.acquire() as conn:
+        user_row = await get_user_by_id_service(conn, user_id)
     if not user_row:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    webp_bytes = convert_image_to_webp(file_bytes)
+    webp_bytes = await run_in_threadpool(convert_image_to_webp, file_bytes)
     path = build_tryon_path(user_id)
 
-    supabase.storage.from_(TRYON_BUCKET).upload(
-        path=path,
-        file=webp_bytes,
-        file_options={
-            "content-type": "image/webp",
-            "upsert": "true",
-        },
-    )
+    await storage.upload(TRYON_BUCKET, path, webp_bytes, "image/webp", upsert=True)
 
-    await update_tryon_image_path_service(conn, user_id, path)
+    async with pool.acquire() as conn:
+        await update_tryon_image_path_service(conn, user_id, path)
 
-    signed_url = create_tryon_signed_url(path)
+    signed_url = await create_tryon_signed_url(storage, path)
 
     return {
         "message": "Try-on image uploaded successfully.",
@@ -48,14 +45,15 @@ async def upload_tryon_image_service(conn, user_id: str, file_content_type: str
     }
 
 
-async def get_tryon_image_service(conn, user_id: str):
-    row = await get_tryon_image_path_service(conn, user_id)
+async def get_tryon_image_service(pool, storage: StorageBackend, user_id: str):
+    async with pool.acquire() as conn:
+        row = await get_tryon_image_path_service(conn, user_id)
 
     if not row:
         raise HTTPException(status_code=404, detail="User not found.")
 
     path = row.get("tryon_image_path")
-    signed_url = create_tryon_signed_url(path) if path else None
+    signed_url = await create_tryon_signed_url(storage, path) if path else None
 
     return {
         "tryon_image_path": path,
@@ -64,18 +62,19 @@ async def get_tryon_image_service(conn, user_id: str):
     }
 
 
-async def delete_tryon_image_service(conn, user_id: str):
-    row = await get_tryon_image_path_service(conn, user_id)
+async def delete_tryon_image_service(pool, storage: StorageBackend, user_id: str):
+    async with pool.acquire() as conn:
+        row = await get_tryon_image_path_service(conn, user_id)
 
-    if not row:
-        raise HTTPException(status_code=404, detail="User not found.")
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found.")
 
-    path = row.get("tryon_image_path")
+        path = row.get("tryon_image_path")
 
-    await update_tryon_image_path_service(conn, user_id, None)
+        await update_tryon_image_path_service(conn, user_id, None)
 
     if path:
-        supabase.storage.from_(TRYON_BUCKET).remove([path])
+        await storage.remove(TRYON_BUCKET, [path])
 
     return {
         "message": "Try-on image removed.",
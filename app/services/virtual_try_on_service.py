@@ -1,15 +1,19 @@
+import asyncio
 import os
 from io import BytesIO
 from typing import Optional
 
-import requests
+import httpx
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from google import genai
 from google.genai import types
 from PIL import Image
 
-from app.helpers.user_image_helper import create_tryon_signed_url
+from app.db.connection import warn_if_connection_held
+from app.helpers.user_image_helper import TRYON_BUCKET
 from app.services.user_service import get_tryon_image_path_service
+from app.storage.storage_backend import StorageBackend
 
 
 client = genai.Client(
@@ -19,14 +23,26 @@ client = genai.Client(
 )
 
 
-def load_image_from_url(url: str) -> Image.Image:
-    response = requests.get(url, timeout=30)
+def decode_image(content: bytes) -> Image.Image:
+    return Image.open(BytesIO(content)).convert("RGB")
+
+
+async def load_image_from_url(http: httpx.AsyncClient, url: str) -> Image.Image:
+    response = await http.get(url)
     response.raise_for_status()
-    return Image.open(BytesIO(response.content)).convert("RGB")
+    # decoding large photos is CPU work, keep it off the event loop
+    return await run_in_threadpool(decode_image, response.content)
+
 
+async def load_image_from_storage(storage: StorageBackend, path: str) -> Image.Image:
+    content = await storage.download(TRYON_BUCKET, path)
+    return await run_in_threadpool(decode_image, content)
 
-async def quick_try_on_service(conn, payload) -> dict:
-    row = await get_tryon_image_path_service(conn, payload.user_id)
+
+async def quick_try_on_service(pool, http: httpx.AsyncClient, storage: StorageBackend, payload) -> dict:
+    # only hold a pooled connection for the lookup, not for downloads or the model call
+    async with pool.acquire() as conn:
+        row = await get_tryon_image_path_service(conn, payload.user_id)
 
     if not row:
         raise HTTPException(status_code=404, detail="User not found")
@@ -39,11 +55,11 @@ async def quick_try_on_service(conn, payload) -> dict:
         if not mannequin_url:
             raise HTTPException(status_code=500, detail="DEFAULT_URL not configured")
 
-        person_img = load_image_from_url(mannequin_url)
+        person_image_task = load_image_from_url(http, mannequin_url)
         is_default_avatar = True
     else:
-        signed_url = create_tryon_signed_url(path)
-        person_img = load_image_from_url(signed_url)
+        # read the private image straight from storage, no signed URL round trip
+        person_image_task = load_image_from_storage(storage, path)
 
     if is_default_avatar:
         prompt = """
@@ -92,20 +108,28 @@ async def quick_try_on_service(conn, payload) -> dict:
            - No border.
            """
 
-    contents = [prompt, person_img]
+    # person image first, then garments in a fixed order
+    garment_urls = [
+        url for url in (
+            payload.outerwear_url,
+            payload.top_url,
+            payload.jumpsuit_url,
+            payload.bottom_url,
+            payload.shoes_url,
+        )
+        if url
+    ]
+
+    # download all images concurrently through the shared client
+    images = await asyncio.gather(
+        person_image_task,
+        *(load_image_from_url(http, url) for url in garment_urls),
+    )
 
-    if payload.outerwear_url:
-        contents.append(load_image_from_url(payload.outerwear_url))
-    if payload.top_url:
-        contents.append(load_image_from_url(payload.top_url))
-    if payload.jumpsuit_url:
-        contents.append(load_image_from_url(payload.jumpsuit_url))
-    if payload.bottom_url:
-        contents.append(load_image_from_url(payload.bottom_url))
-    if payload.shoes_url:
-        contents.append(load_image_from_url(payload.shoes_url))
+    contents = [prompt, *images]
 
-    response = client.models.generate_content(
+    warn_if_connection_held("gemini generate_content")
+    response = await client.aio.models.generate_content(
         model="gemini-2.5-flash-image",
         contents=contents,
         config=types.GenerateContentConfig(
@@ -136,7 +160,7 @@ async def quick_try_on_service(conn, payload) -> dict:
 
     filename = f"{payload.user_id}_tryon.png"#model needs to be kept in the dir with that name to save it in disk
     output_path = os.path.join(output_dir, filename)
-    generated_image.save(output_path)
+    await run_in_threadpool(generated_image.save, output_path)
 
     return {
         "success": True,
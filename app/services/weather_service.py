@@ -1,26 +1,29 @@
 import os
-import requests
+import httpx
 from fastapi import HTTPException
 
 OPENWEATHER_KEY = os.getenv("OPENWEATHER_API_KEY")
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
 
-async def get_weather_service(lat: float, lon: float):
+async def get_weather_service(http: httpx.AsyncClient, lat: float, lon: float):
     """Fetch current weather data from the OpenWeather API."""
 
     if not OPENWEATHER_KEY:
         raise HTTPException(status_code=500, detail="Weather API key missing")
 
-    url = (
-        f"https://api.openweathermap.org/data/2.5/weather?"
-        f"lat={lat}&lon={lon}&appid={OPENWEATHER_KEY}&units=metric"
-    )
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "appid": OPENWEATHER_KEY,
+        "units": "metric",
+    }
 
     try:
-        response = requests.get(url)
-    except Exception:
+        response = await http.get(OPENWEATHER_URL, params=params)
+    except httpx.HTTPError:
         raise HTTPException(status_code=500, detail="Failed to contact weather API")
 
     if response.status_code != 200:
         raise HTTPException(status_code=400, detail="Weather API error")
 
-    return response.json()
\ No newline at end of file
+    return response.json()
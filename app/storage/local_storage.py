@@ -0,0 +1,55 @@
+import os
+import time
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.storage_backend import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores objects under a local directory (<root>/<bucket>/<path>).
+    Used for development and load tests so no live Supabase is needed.
+    "Signed" URLs are plain URLs under base_url, served by the static mount in main.py.
+    """
+
+    def __init__(self, root_dir: str, base_url: str = "/local_storage"):
+        self.root = Path(root_dir).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _resolve(self, bucket: str, path: str) -> Path:
+        target = (self.root / bucket / path).resolve()
+        # never allow paths like ../../etc/passwd to escape the storage root
+        if self.root not in target.parents:
+            raise ValueError(f"Invalid storage path: {bucket}/{path}")
+        return target
+
+    def _write(self, target: Path, data: bytes, upsert: bool) -> None:
+        if target.exists() and not upsert:
+            raise FileExistsError(str(target))
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temp file first so readers never see a half written image
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    async def upload(self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool = True) -> None:
+        await run_in_threadpool(self._write, self._resolve(bucket, path), data, upsert)
+
+    async def download(self, bucket: str, path: str) -> bytes:
+        return await run_in_threadpool(self._resolve(bucket, path).read_bytes)
+
+    async def remove(self, bucket: str, paths: list[str]) -> None:
+        for path in paths:
+            await run_in_threadpool(self._resolve(bucket, path).unlink, True)
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int = 3600) -> str | None:
+        if not path:
+            return None
+
+        self._resolve(bucket, path)
+        expires_at = int(time.time()) + expires_in
+        return f"{self.base_url}/{bucket}/{path}?expires={expires_at}"
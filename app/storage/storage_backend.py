@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """
+    Async interface for object storage (try-on images, ...).
+    Every method is awaitable so callers never block the event loop.
+    """
+
+    @abstractmethod
+    async def upload(self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    async def download(self, bucket: str, path: str) -> bytes:
+        ...
+
+    @abstractmethod
+    async def remove(self, bucket: str, paths: list[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int = 3600) -> str | None:
+        ...
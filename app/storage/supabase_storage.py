@@ -0,0 +1,43 @@
+from fastapi.concurrency import run_in_threadpool
+
+from app.db.connection import warn_if_connection_held
+from app.storage.storage_backend import StorageBackend
+
+
+class SupabaseStorage(StorageBackend):
+    """
+    Supabase Storage backend.
+    supabase-py is synchronous, so each call runs in the threadpool.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def _call(self, fn, *args, **kwargs):
+        warn_if_connection_held(f"storage {fn.__name__}")
+        return await run_in_threadpool(fn, *args, **kwargs)
+
+    async def upload(self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool = True) -> None:
+        await self._call(
+            self.client.storage.from_(bucket).upload,
+            path=path,
+            file=data,
+            file_options={
+                "content-type": content_type,
+                "upsert": "true" if upsert else "false",
+            },
+        )
+
+    async def download(self, bucket: str, path: str) -> bytes:
+        return await self._call(self.client.storage.from_(bucket).download, path)
+
+    async def remove(self, bucket: str, paths: list[str]) -> None:
+        if paths:
+            await self._call(self.client.storage.from_(bucket).remove, paths)
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int = 3600) -> str | None:
+        if not path:
+            return None
+
+        result = await self._call(self.client.storage.from_(bucket).create_signed_url, path, expires_in)
+        return result.get("signedURL") or result.get("signedUrl")
@@ -0,0 +1,108 @@
+"""
+Shared fakes for service tests that talk to asyncpg.
+
+FakeConnection answers each method from `results`: a value, or a callable that
+gets (sql, *args). Every call is recorded in `calls`; `Call.name` is the
+registry name for QUERIES statements, the whitespace-collapsed SQL otherwise.
+
+    conn = FakeConnection(fetchval="item-1", fetch=lambda sql, *args: rows)
+    asyncio.run(service(FakePool(conn), ...))
+"""
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+import pytest
+
+from app.db import queries
+
+SQL_TO_NAME = {sql: name for name, sql in queries.QUERIES.items()}
+
+
+class Call(NamedTuple):
+    method: str
+    sql: str
+    args: tuple
+    in_transaction: bool
+
+    @property
+    def name(self) -> str:
+        return SQL_TO_NAME.get(self.sql) or " ".join(self.sql.split())
+
+
+class FakeConnection:
+    def __init__(self, **results):
+        self.results = results
+        self.calls: list[Call] = []
+        self.codecs = {}
+        self.named_statements = {}
+        self.in_transaction = False
+
+    def _answer(self, method, sql, args):
+        self.calls.append(Call(method, sql, args, self.in_transaction))
+        result = self.results.get(method)
+        return result(sql, *args) if callable(result) else result
+
+    def called(self, method):
+        return [call for call in self.calls if call.method == method]
+
+    async def fetch(self, sql, *args):
+        return self._answer("fetch", sql, args)
+
+    async def fetchrow(self, sql, *args):
+        return self._answer("fetchrow", sql, args)
+
+    async def fetchval(self, sql, *args):
+        return self._answer("fetchval", sql, args)
+
+    async def execute(self, sql, *args):
+        return self._answer("execute", sql, args)
+
+    async def executemany(self, sql, args):
+        return self._answer("executemany", sql, (args,))
+
+    async def cursor(self, sql, *args):
+        return self._answer("cursor", sql, args)
+
+    async def prepare(self, sql):
+        return self._answer("prepare", sql, ())
+
+    async def set_type_codec(self, type_name, *, schema, encoder, decoder, format):
+        self.codecs[type_name] = {"schema": schema, "encoder": encoder, "decoder": decoder, "format": format}
+
+    def is_in_transaction(self):
+        return self.in_transaction
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+
+class FakePool:
+    """Hands out the one connection; `read_only` records how each acquire asked."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.read_only = []
+
+    @asynccontextmanager
+    async def acquire(self, read_only=False):
+        self.read_only.append(read_only)
+        yield self.conn
+
+
+@pytest.fixture
+def pool_mode(monkeypatch):
+    """pool_mode("session") / pool_mode("transaction") switches how named queries run."""
+    def set_mode(mode):
+        monkeypatch.setattr(queries, "DB_POOL_MODE", mode)
+    return set_mode
+
+
+@pytest.fixture
+def transaction_mode(pool_mode):
+    # named queries become plain conn.fetch()/fetchval()/... calls, nothing is prepared
+    pool_mode("transaction")
@@ -0,0 +1,79 @@
+
+import asyncio
+import os
+import time
+
+# Fake env vars so importing the auth dependency does not crash during testing
+os.environ["SUPABASE_URL"] = "https://fake.supabase.co"
+os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "fake-service-role-key"
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.dependencies import auth
+
+SECRET = "test-secret-with-enough-length-for-hs256"
+
+
+def make_token(sub="user-1", exp_in=3600, secret=SECRET):
+    claims = {
+        "sub": sub,
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + exp_in,
+    }
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def local_secret(monkeypatch):
+    monkeypatch.setattr(auth, "SUPABASE_JWT_SECRET", SECRET)
+    auth.token_cache.clear()
+    yield
+    auth.token_cache.clear()
+
+
+def test_valid_token_is_verified_locally_and_cached(monkeypatch):
+    def fail_remote(token):
+        raise AssertionError("remote auth should not be called")
+
+    monkeypatch.setattr(auth, "_get_user_remote", fail_remote)
+    token = make_token()
+
+    user = asyncio.run(auth.get_current_user(bearer(token)))
+    assert user.id == "user-1"
+    assert user.email == "user@example.com"
+
+    # second call is served from the cache
+    assert auth.token_cache.get(token) is user
+    assert asyncio.run(auth.get_current_user(bearer(token))) is user
+
+
+def test_bad_signature_is_rejected():
+    token = make_token(secret="some-other-secret-with-enough-length")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.get_current_user(bearer(token)))
+    assert exc.value.status_code == 401
+
+
+def test_cache_entry_respects_token_exp():
+    cache = auth.TokenCache(max_size=10, ttl_seconds=3600)
+    cache.set("token", "user", exp=time.time() - 1)
+    assert cache.get("token") is None
+
+
+def test_cache_is_bounded():
+    cache = auth.TokenCache(max_size=2, ttl_seconds=3600)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
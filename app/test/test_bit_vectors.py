@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from app.helpers.bit_vectors import pack_bits, pack_bits_batch, pop_packed, style_scores
+from app.helpers.similarity_function import item_similarity, packed_style_scores, pick_top_k
+from app.helpers.vector_helpers import build_item_feature_vector, feature_encoder
+from app.helpers.vector_math import l2_normalize
+
+
+def vec(category, colors=(), materials=(), occasions=(), seasons=()):
+    return build_item_feature_vector([category], list(colors), list(materials), list(occasions), list(seasons))
+
+
+def test_item_packs_into_seven_bytes():
+    v = vec("top", ["black", "white"], ["cotton"], ["work"], ["summer"])
+
+    bits, count = pack_bits(v)
+
+    assert feature_encoder.dim == 54
+    assert len(bits) == 7
+    assert count == 6
+    assert np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=feature_encoder.dim).tolist() == v
+    assert pack_bits_batch(np.array([v, v])) == [(bits, count)] * 2
+
+
+def test_style_scores_match_item_similarity():
+    rng = np.random.default_rng(0)
+    style = l2_normalize(rng.normal(size=feature_encoder.dim).tolist())
+    vectors = [vec("top", ["black"]), vec("shoes", ["red"], ["leather"], ["party"]), [0] * feature_encoder.dim]
+
+    packed = [pack_bits(v) for v in vectors]
+    scores = style_scores(style, [p[0] for p in packed], [p[1] for p in packed])
+
+    expected = [item_similarity(style, {"attr_vector": v}) for v in vectors]
+    assert scores.tolist() == pytest.approx(expected)
+
+
+def test_pick_uses_packed_scores():
+    style = l2_normalize(vec("top", ["black"]))
+    items = [{"id": "red", "attr_vector": vec("top", ["red"])}, {"id": "black", "attr_vector": vec("top", ["black"])}]
+    packed = {item["id"]: pack_bits(item["attr_vector"]) for item in items}
+
+    scores = packed_style_scores(style, packed)
+
+    assert scores["black"] > scores["red"]
+    assert pick_top_k(items, style, k=1, scores=scores)["id"] == "black"
+    # a style vector of another schema length is not scored from the packed form
+    assert packed_style_scores(style[:-1], packed) == {}
+
+
+def test_pop_packed_strips_columns():
+    item = {"id": "a", "attr_bits": b"\x80", "attr_bits_count": 1}
+
+    assert pop_packed(item) == (b"\x80", 1)
+    assert item == {"id": "a"}
+    assert pop_packed({"id": "b", "attr_bits": None, "attr_bits_count": None}) is None
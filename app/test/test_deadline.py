@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.connection import statement_timeout_left_ms
+from app.helpers.deadline import run_with_deadline
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after=None):
+        self.disconnect_after = disconnect_after
+
+    async def receive(self):
+        if self.disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.disconnect_after)
+        return {"type": "http.disconnect"}
+
+
+def test_returns_result_and_sets_statement_timeout():
+    async def work():
+        return statement_timeout_left_ms()
+
+    result = asyncio.run(run_with_deadline(FakeRequest(), work(), 2.5))
+    assert 2400 < result <= 2500
+    assert statement_timeout_left_ms() is None
+
+
+def test_statement_timeout_shrinks_with_the_time_spent():
+    async def work():
+        await asyncio.sleep(0.2)
+        return statement_timeout_left_ms()
+
+    assert asyncio.run(run_with_deadline(FakeRequest(), work(), 1)) <= 800
+
+
+def test_deadline_cancels_work():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run_with_deadline(FakeRequest(), slow(), 0.05))
+
+    assert exc.value.status_code == 504
+    assert cancelled == [True]
+
+
+def test_client_disconnect_cancels_work():
+    async def slow():
+        await asyncio.sleep(10)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run_with_deadline(FakeRequest(disconnect_after=0.01), slow(), 5))
+
+    assert exc.value.status_code == 499
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.helpers.etag import etag_matches, get_user_etag, not_modified, set_etag
+from conftest import FakeConnection, FakePool
+
+
+def make_app(pool, calls):
+    app = FastAPI()
+
+    @app.get("/things")
+    async def things(request: Request, response: Response):
+        etag = await get_user_etag(pool, "user-1", read_only=True)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        calls.append(1)
+        return {"things": []}
+
+    return app
+
+
+def version_row(version, due=0):
+    return {"version": version, "due_wear_logs": due}
+
+
+@pytest.mark.usefixtures("transaction_mode")
+def test_conditional_get():
+    pool = FakePool(FakeConnection(fetchrow=version_row(3)))
+    calls = []
+    client = TestClient(make_app(pool, calls))
+
+    first = client.get("/things")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag == 'W/"3.0"'
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = client.get("/things", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(calls) == 1
+
+    # a mutation bumped the version
+    pool.conn.results["fetchrow"] = version_row(4)
+    third = client.get("/things", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert len(calls) == 2
+
+    # a future dated log became due: last_worn_at changed without a write
+    pool.conn.results["fetchrow"] = version_row(4, due=1)
+    fourth = client.get("/things", headers={"If-None-Match": third.headers["etag"]})
+    assert fourth.status_code == 200
+
+    assert pool.read_only == [True] * 4
+    assert {call.name for call in pool.conn.calls} == {"user_version.get"}
+
+
+def test_if_none_match_forms():
+    class Req:
+        def __init__(self, header):
+            self.headers = {"if-none-match": header} if header else {}
+
+    assert etag_matches(Req('"1.0"'), 'W/"1.0"')
+    assert etag_matches(Req('W/"0.0", W/"1.0"'), 'W/"1.0"')
+    assert etag_matches(Req("*"), 'W/"1.0"')
+    assert not etag_matches(Req('W/"2.0"'), 'W/"1.0"')
+    assert not etag_matches(Req(None), 'W/"1.0"')
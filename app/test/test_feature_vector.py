@@ -1,5 +1,7 @@
+import numpy as np
 
-from app.helpers.vector_helpers import  build_item_feature_vector
+
+from app.helpers.vector_helpers import  build_item_feature_vector, feature_encoder
 from app.models.vector_ import CATEGORIES, COLORS, MATERIALS, OCCASIONS, SEASONS
 
 
@@ -20,4 +22,22 @@ def test_build_item_feature_vector():
         [1 if x in ["summer", "spring"] else 0 for x in SEASONS]
     )
 
-    assert vec == expected
\ No newline at end of file
+    assert vec == expected
+
+def test_encoder_batch_matches_single_items():
+    items = [
+        {"categories": ["top"], "colors": ["Black", "teal"], "seasons": ["summer"]},
+        {"categories": ["shoes"], "materials": ["leather"], "occasions": ["", "Work "]},
+        {},
+    ]
+
+    matrix = feature_encoder.encode_batch(items)
+
+    assert matrix.shape == (3, feature_encoder.dim)
+    assert matrix.dtype == np.int8
+    for row, item in zip(matrix, items):
+        assert row.tolist() == feature_encoder.encode(**item).tolist()
+
+    # unknown colors land on 'other'
+    assert matrix[0, len(CATEGORIES) + COLORS.index("other")] == 1
+    assert not matrix[2].any()
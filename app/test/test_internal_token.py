@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies import internal
+
+
+def check(token):
+    asyncio.run(internal.require_internal_token(token))
+
+
+def test_internal_routes_are_closed_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(internal, "INTERNAL_API_TOKEN", None)
+
+    with pytest.raises(HTTPException) as exc:
+        check(None)
+    assert exc.value.status_code == 403
+
+
+def test_internal_token_must_match(monkeypatch):
+    monkeypatch.setattr(internal, "INTERNAL_API_TOKEN", "secret")
+
+    check("secret")
+    for token in (None, "", "Secret"):
+        with pytest.raises(HTTPException):
+            check(token)
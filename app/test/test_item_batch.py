@@ -0,0 +1,35 @@
+import asyncio
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.item_modal import ITEM_BATCH_MAX_SIZE, ItemBatchRequest
+from app.services.item_service import get_items_by_ids_service
+from conftest import FakeConnection
+
+
+@pytest.mark.usefixtures("transaction_mode")
+def test_batch_is_one_query_with_deduplicated_ids():
+    conn = FakeConnection(fetch=lambda sql, item_ids, user_id: [{"id": item_id} for item_id in item_ids])
+    a, b = uuid.uuid4(), uuid.uuid4()
+
+    items = asyncio.run(get_items_by_ids_service(conn, "user-1", [a, b, a]))
+
+    [call] = conn.calls
+    assert call.name == "items.by_ids"
+    assert call.args == ([a, b], "user-1")
+    assert [item["id"] for item in items] == [a, b]
+
+
+def test_batch_request_size_is_capped():
+    ids = [str(uuid.uuid4()) for _ in range(ITEM_BATCH_MAX_SIZE + 1)]
+
+    with pytest.raises(ValidationError):
+        ItemBatchRequest(item_ids=ids)
+    with pytest.raises(ValidationError):
+        ItemBatchRequest(item_ids=[])
+    with pytest.raises(ValidationError):
+        ItemBatchRequest(item_ids=["not-a-uuid"])
+
+    assert len(ItemBatchRequest(item_ids=ids[:ITEM_BATCH_MAX_SIZE]).item_ids) == ITEM_BATCH_MAX_SIZE
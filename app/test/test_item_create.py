@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.db.vocabulary import vocabulary
+from app.helpers.bit_vectors import pack_bits
+from app.models.item_modal import ClothingItemCreate
+from app.models.vector_ import ATTR_SCHEMA_VERSION
+from app.services.item_service import create_item_service
+from app.utils.upsert_tags import clean_tags
+from conftest import FakeConnection, FakePool
+
+pytestmark = pytest.mark.usefixtures("transaction_mode")
+
+
+def vocabulary_rows(sql):
+    if "colors_master" in sql:
+        return [{"id": "c-red", "name": "red"}, {"id": "c-navy", "name": "navy"}, {"id": "c-other", "name": "other"}]
+    if "Seasons" in sql:
+        return [{"id": 1, "name": "Spring"}, {"id": 2, "name": "Summer"}]
+    return []
+
+
+def connection():
+    conn = FakeConnection(fetch=vocabulary_rows, fetchval="item-1", execute="INSERT 0 1")
+    asyncio.run(vocabulary.refresh(conn))
+    # only the writes of the service itself
+    conn.calls.clear()
+    return conn
+
+
+def test_create_is_one_insert_plus_one_statement_per_tag_family():
+    conn = connection()
+    item = ClothingItemCreate(
+        user_id="user-1",
+        category_id=1,
+        colors=["Red", " Red ", "Navy", "teal"],
+        materials=["cotton", "linen"],
+        occasions=["work"],
+        seasons=["Summer", "spring"],
+    )
+
+    result = asyncio.run(create_item_service(FakePool(conn), item))
+
+    assert result == {"status": "created", "id": "item-1"}
+    assert len(conn.calls) == 6
+    assert all(call.in_transaction for call in conn.calls)
+    # the user's data version moves in the same transaction
+    assert conn.calls[5].args == ("user-1",)
+
+    # the vector goes in with the row, no trailing UPDATE
+    insert_args = conn.calls[0].args
+    vector, attr_bits, attr_bits_count, version = insert_args[-4:]
+    assert 1 in vector
+    assert (attr_bits, attr_bits_count) == pack_bits(vector)
+    assert version == ATTR_SCHEMA_VERSION
+
+    # names and their master ids (from the vocabulary cache) go in as two arrays
+    color_args = conn.calls[1].args
+    assert color_args == (
+        "item-1", "user-1", ["Red", "Red", "Navy", "teal"], ["c-red", "c-red", "c-navy", "c-other"]
+    )
+    assert conn.calls[4].args == ("item-1", [2, 1])
+
+
+def test_empty_families_are_skipped():
+    conn = connection()
+    item = ClothingItemCreate(user_id="user-1", category_id=2, colors=["  ", ""])
+
+    asyncio.run(create_item_service(FakePool(conn), item))
+
+    assert [call.method for call in conn.calls] == ["fetchval", "fetchval"]
+
+
+def test_clean_tags():
+    assert clean_tags([" Red", "", None, "  ", "navy "]) == ["Red", "navy"]
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.helpers import item_import
+from app.helpers.bit_vectors import pack_bits
+from app.helpers.item_import import read_import_rows
+from app.services.item_import_service import build_import_records
+
+
+def stream(*chunks):
+    async def gen():
+        for chunk in chunks:
+            yield chunk
+    return gen()
+
+
+def test_ndjson_split_across_chunks():
+    rows = asyncio.run(read_import_rows(
+        stream(b'{"category_id": 1, "colors": ["Red"]}\n{"category_', b'id": 2, "seasons": ["summer"]}\n\n'),
+        "application/x-ndjson",
+    ))
+
+    assert [row.category_id for row in rows] == [1, 2]
+    assert rows[0].colors == ["Red"]
+    assert rows[1].seasons == ["summer"]
+
+
+def test_csv_with_tag_lists():
+    body = (
+        b"img_description,category_id,subcategory_id,in_laundry,colors,seasons\n"
+        b'"Wool coat, long",3,,true,black;grey,winter\n'
+        b"Tee,1,4,false,white,\n"
+    )
+
+    rows = asyncio.run(read_import_rows(stream(body), "text/csv"))
+
+    assert rows[0].img_description == "Wool coat, long"
+    assert rows[0].colors == ["black", "grey"]
+    assert rows[0].in_laundry is True
+    assert rows[0].subcategory_id is None
+    assert rows[1].subcategory_id == 4
+    assert rows[1].seasons == []
+
+
+def test_csv_quoted_cell_spans_lines_and_chunks():
+    rows = asyncio.run(read_import_rows(
+        stream(b'category_id,img_description\r\n1,"two\r\nli', b'nes"\r\n2,"say ""hi"""\r\n'),
+        "text/csv",
+    ))
+
+    assert rows[0].img_description == "two\r\nlines"
+    assert rows[1].img_description == 'say "hi"'
+
+
+def test_csv_unterminated_quote_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_import_rows(stream(b'category_id,img_description\n1,"open\n'), "text/csv"))
+
+    assert exc.value.status_code == 422
+
+
+def test_bad_row_reports_its_line():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_import_rows(stream(b'{"category_id": 1}\n{"colors": []}\n'), "application/x-ndjson"))
+
+    assert exc.value.status_code == 422
+    assert exc.value.detail.startswith("Row 2")
+
+
+def test_item_count_is_capped(monkeypatch):
+    monkeypatch.setattr(item_import, "IMPORT_MAX_ITEMS", 2)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_import_rows(stream(b'{"category_id": 1}\n' * 3), "application/x-ndjson"))
+
+    assert exc.value.status_code == 413
+
+
+class FakeVocabulary:
+    def master_id(self, family, name):
+        return f"{family}:{name.lower()}"
+
+    def season_id(self, name):
+        return {"summer": 2}.get(name.lower())
+
+
+def test_records_for_copy():
+    rows = asyncio.run(read_import_rows(
+        stream(b'{"category_id": 1, "colors": ["Red", " "], "seasons": ["Summer", "monsoon"]}'),
+        "application/x-ndjson",
+    ))
+
+    items, tags, seasons = build_import_records(rows, FakeVocabulary())
+
+    assert len(items) == 1
+    item_id = items[0][0]
+    assert items[0][4] == 1
+    vector, attr_bits, attr_bits_count = items[0][-3:]
+    assert 1 in vector
+    assert (attr_bits, attr_bits_count) == pack_bits(vector)
+    assert tags == [(item_id, "colors", "Red", "colors:red")]
+    assert seasons == [(item_id, 2)]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.db.vocabulary import vocabulary
+from app.helpers.bit_vectors import pack_bits
+from app.services.item_service import update_item_service
+from conftest import FakeConnection
+
+pytestmark = pytest.mark.usefixtures("transaction_mode")
+
+
+EXISTING = {
+    "id": "item-1",
+    "user_id": "user-1",
+    "img_description": "Blue shirt",
+    "category_id": 1,
+    "subcategory_id": None,
+    "in_laundry": False,
+    "colors": ["Blue", "White"],
+    "materials": ["cotton"],
+    "occasions": [],
+    "seasons": ["Summer"],
+}
+
+
+def vocabulary_rows(sql):
+    if "colors_master" in sql:
+        return [{"id": "c-blue", "name": "blue"}, {"id": "c-other", "name": "other"}]
+    if "Seasons" in sql:
+        return [{"id": 1, "name": "Spring"}, {"id": 2, "name": "Summer"}]
+    return []
+
+
+def update(data):
+    conn = FakeConnection(fetch=vocabulary_rows, execute="OK", fetchval=1)
+
+    async def run():
+        await vocabulary.refresh(conn)
+        return await update_item_service(conn, "item-1", {"user_id": "user-1", **data}, EXISTING)
+
+    asyncio.run(run())
+    # (query name or SQL, args) of every write
+    return [(call.name, call.args) for call in conn.calls if call.method != "fetch"]
+
+
+def test_unchanged_payload_writes_nothing():
+    assert update({"img_description": "Blue shirt", "colors": ["White", "Blue "], "seasons": ["summer"]}) == []
+
+
+def test_scalar_change_is_one_update_without_vector():
+    executed = update({"img_description": "Navy shirt", "in_laundry": True, "category_id": 1})
+
+    assert len(executed) == 2
+    assert executed[1] == ("user_version.bump", ("user-1",))
+    sql, args = executed[0]
+    assert sql == "UPDATE ClothingItems SET img_description = $2, in_laundry = $3 WHERE id = $1"
+    assert args == ("item-1", "Navy shirt", True)
+
+
+def test_tag_change_touches_only_the_difference_and_rebuilds_vector():
+    executed = update({"colors": ["Blue", "Red"], "seasons": ["Summer", "spring"]})
+
+    update_sql, update_args = executed[0]
+    assert update_sql == (
+        "UPDATE ClothingItems SET attr_vector = $2, attr_bits = $3, attr_bits_count = $4, "
+        "attr_schema_version = $5 WHERE id = $1"
+    )
+    assert (update_args[2], update_args[3]) == pack_bits(update_args[1])
+    assert update_args[4] == 1
+
+    unlink_colors = executed[1]
+    assert unlink_colors[0].startswith("DELETE FROM ItemColors")
+    assert unlink_colors[1] == ("item-1", ["White"])
+
+    upsert_colors = executed[2]
+    assert upsert_colors[1] == ("item-1", "user-1", ["Red"], ["c-other"])
+
+    link_season = executed[3]
+    assert link_season[0].startswith("INSERT INTO ItemSeasons")
+    assert link_season[1] == ("item-1", [1])
+    assert executed[4][0] == "user_version.bump"
+    assert len(executed) == 5
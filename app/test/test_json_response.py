@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from app.db.connection import _init_connection
+from app.helpers.json_response import FastJSONResponse, RawJSONResponse
+from conftest import FakeConnection
+
+
+def test_renders_db_types():
+    item_id = uuid.uuid4()
+    worn_at = datetime(2025, 1, 5, 10, 30, tzinfo=timezone.utc)
+
+    body = FastJSONResponse({"id": item_id, "worn_at": worn_at, "score": Decimal("0.5"), "tags": ["a"]}).body
+
+    assert orjson.loads(body) == {
+        "id": str(item_id),
+        "worn_at": "2025-01-05T10:30:00+00:00",
+        "score": 0.5,
+        "tags": ["a"],
+    }
+
+
+def test_large_bodies_are_gzipped():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    async def big():
+        return {"items": [{"id": i, "image_url": f"https://cdn/{i}.webp"} for i in range(200)]}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    client = TestClient(app)
+
+    assert client.get("/big", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_raw_json_is_sent_unchanged():
+    rendered = '{"outfits":[{"outfit_id":"o1","items":[]}]}'
+
+    response = RawJSONResponse(rendered)
+
+    assert response.body == rendered.encode()
+    assert response.media_type == "application/json"
+    assert RawJSONResponse(b"[]").body == b"[]"
+
+
+def test_pool_registers_json_codecs():
+    conn = FakeConnection()
+
+    asyncio.run(_init_connection(conn))
+
+    assert set(conn.codecs) == {"json", "jsonb"}
+    codec = conn.codecs["json"]
+    assert (codec["schema"], codec["format"]) == ("pg_catalog", "text")
+    assert codec["decoder"]('[{"item_id": "a", "position": 0}]') == [{"item_id": "a", "position": 0}]
+    assert codec["encoder"]({"a": 1}) == '{"a":1}'
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.storage.local_storage import LocalStorage
+from app.storage.storage_backend import StorageBackend
+
+
+def test_upload_download_remove(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    async def run():
+        await storage.upload("bucket", "user-1/tryon.webp", b"image-bytes", "image/webp")
+        data = await storage.download("bucket", "user-1/tryon.webp")
+        url = await storage.create_signed_url("bucket", "user-1/tryon.webp")
+        await storage.remove("bucket", ["user-1/tryon.webp"])
+        return data, url
+
+    data, url = asyncio.run(run())
+
+    assert data == b"image-bytes"
+    assert url.startswith("/local_storage/bucket/user-1/tryon.webp")
+    assert not (tmp_path / "bucket" / "user-1" / "tryon.webp").exists()
+
+
+def test_upload_without_upsert_keeps_existing_file(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+
+    async def run():
+        await storage.upload("bucket", "a.webp", b"first", "image/webp")
+        await storage.upload("bucket", "a.webp", b"second", "image/webp", upsert=False)
+
+    with pytest.raises(FileExistsError):
+        asyncio.run(run())
+    assert (tmp_path / "bucket" / "a.webp").read_bytes() == b"first"
+
+
+def test_paths_cannot_escape_storage_root(tmp_path):
+    storage = LocalStorage(str(tmp_path / "root"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(storage.upload("bucket", "../../escape.txt", b"x", "text/plain"))
+
+
+def test_backend_interface_is_abstract():
+    class Partial(StorageBackend):
+        async def upload(self, bucket, path, data, content_type, upsert=True):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
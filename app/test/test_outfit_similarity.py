@@ -6,6 +6,8 @@ os.environ["SUPABASE_KEY"] = "fake-key"
 os.environ["SUPABASE_ANON_KEY"] = "fake-anon-key"
 os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "fake-service-role-key"
 
+import numpy as np
+import pytest
 
 from app.services.outfit_suggestions_service import outfit_vec_from_outfit, outfit_score
 from app.helpers.vector_math import l2_normalize
@@ -96,4 +98,16 @@ def test_outfit_similarity_ranking():
     print("\nGood outfit score:", good_score)
     print("\nBad outfit score:", bad_score)
 
-    assert good_score > bad_score
\ No newline at end of file
+    assert good_score > bad_score
+
+def test_outfit_vec_averages_normalized_items_of_the_right_length():
+    top = build_item_feature_vector(["top"], ["black"], [], [], [])
+    shoes = build_item_feature_vector(["shoes"], ["black"], ["leather"], [], [])
+    outfit = {"top": {"attr_vector": top}, "shoes": {"attr_vector": shoes}, "bottom": {"attr_vector": [1.0, 0.0]}}
+
+    outfit_vec = outfit_vec_from_outfit(outfit, len(top))
+
+    expected = l2_normalize([(a + b) / 2 for a, b in zip(l2_normalize(top), l2_normalize(shoes))])
+    assert outfit_vec.dtype == np.float32
+    assert outfit_vec.tolist() == pytest.approx(expected, abs=1e-6)
+    assert outfit_vec_from_outfit({"top": {"attr_vector": top}}, len(top)) is None
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.helpers.pagination import decode_cursor, encode_cursor
+from app.services.item_service import get_items_by_user_service
+from conftest import FakeConnection, FakePool
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 11, 3, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, "5f0c")
+
+    assert decode_cursor(cursor) == (created_at, "5f0c")
+
+
+def test_invalid_cursor_is_a_400():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not a cursor")
+    assert exc.value.status_code == 400
+
+
+def listing(rows):
+    """fetch() answering the item listing queries, honouring their LIMIT ($4)."""
+    return lambda sql, *args: rows if args[3] is None else rows[: args[3]]
+
+
+@pytest.mark.usefixtures("transaction_mode")
+def test_pages_follow_the_cursor():
+    rows = [
+        {"id": f"item-{i}", "created_at": datetime(2025, 1, 10 - i, tzinfo=timezone.utc)}
+        for i in range(3)
+    ]
+    conn = FakeConnection(fetch=listing(rows))
+    pool = FakePool(conn)
+
+    first = asyncio.run(get_items_by_user_service(pool, "user-1", limit=2))
+
+    assert [item["id"] for item in first["items"]] == ["item-0", "item-1"]
+    assert first["next_cursor"] is not None
+    assert conn.calls[0].name == "items.by_user"
+    assert pool.read_only == [True]
+
+    conn.results["fetch"] = listing(rows[2:])
+    second = asyncio.run(get_items_by_user_service(pool, "user-1", limit=2, cursor=first["next_cursor"], in_laundry=False))
+
+    call = conn.calls[1]
+    assert call.name == "items.by_user_after"
+    assert call.args == ("user-1", None, False, 3, rows[1]["created_at"], "item-1")
+    assert [item["id"] for item in second["items"]] == ["item-2"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.usefixtures("transaction_mode")
+def test_without_limit_and_cursor_everything_comes_unpaged():
+    rows = [{"id": f"item-{i}"} for i in range(3)]
+    conn = FakeConnection(fetch=listing(rows))
+
+    result = asyncio.run(get_items_by_user_service(FakePool(conn), "user-1"))
+
+    assert result == {"items": rows}
+    assert conn.calls[0].args == ("user-1", None, None, None)
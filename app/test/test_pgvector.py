@@ -0,0 +1,112 @@
+import asyncio
+import struct
+
+import numpy as np
+import pytest
+
+from app.db import pgvector
+from app.helpers.bit_vectors import pack_bits
+from app.helpers.vector_helpers import build_item_feature_vector, feature_encoder
+from app.helpers.vector_math import ema_update, l2_normalize
+from app.services import outfit_suggestions_service
+from app.services.outfit_service import compute_and_store_outfit_vec
+from app.services.outfit_suggestions_service import get_items_for_suggestions_service
+from conftest import FakeConnection, FakePool
+
+pytestmark = pytest.mark.usefixtures("transaction_mode")
+
+
+def test_vector_codec_round_trip():
+    # pgvector binary format: dim, unused, big-endian float32s
+    encoded = pgvector.encode_vector([1, 0, 0.5])
+    assert encoded == struct.pack("!HH3f", 3, 0, 1.0, 0.0, 0.5)
+
+    decoded = pgvector.decode_vector(encoded)
+    assert decoded.dtype == np.float32 and decoded.flags.c_contiguous and decoded.flags.writeable
+    assert decoded.tolist() == [1.0, 0.0, 0.5]
+    assert pgvector.encode_vector(decoded) == encoded
+
+
+def test_codec_is_registered_in_the_extension_schema():
+    conn = FakeConnection(fetchval="extensions")
+    asyncio.run(pgvector.register_vector_codec(conn))
+    codec = conn.codecs["vector"]
+    assert set(conn.codecs) == {"vector"}
+    assert (codec["schema"], codec["format"]) == ("extensions", "binary")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pgvector.register_vector_codec(FakeConnection(fetchval=None)))
+
+
+def item_row(item_id, vector, **extra):
+    bits, count = pack_bits(vector)
+    return {
+        "id": item_id,
+        "category_id": 1,
+        "attr_vector": vector,
+        "attr_bits": bits,
+        "attr_bits_count": count,
+        "attr_schema_version": feature_encoder.schema_version,
+        **extra,
+    }
+
+
+def test_pgvector_mode_uses_the_ranked_shortlist(monkeypatch):
+    monkeypatch.setattr(outfit_suggestions_service, "PGVECTOR_ENABLED", True)
+    black = build_item_feature_vector(["top"], ["black"], [], [], [])
+    red = build_item_feature_vector(["top"], ["red"], [], [], [])
+    conn = FakeConnection(fetch=[
+        item_row("a", black, style_score=0.9, slot_rank=1),
+        # older schema / zero vector: ranked last by Postgres without a score
+        item_row("b", red, style_score=None, slot_rank=2),
+    ])
+    style = l2_normalize(black)
+    scores = {}
+
+    items = asyncio.run(get_items_for_suggestions_service(FakePool(conn), "user-1", ["Summer"], None, style, scores))
+
+    call = conn.calls[0]
+    assert call.name == "items.shortlist_by_style"
+    assert call.args == ("user-1", ["Summer"], None, style, pgvector.SUGGESTIONS_SHORTLIST_SIZE)
+    assert scores["a"] == 0.9
+    assert scores["b"] == pytest.approx(float(np.dot(style, l2_normalize(red))))
+    assert all(set(item) & {"style_score", "slot_rank", "attr_bits", "attr_bits_count"} == set() for item in items)
+
+
+def test_without_style_vector_all_items_are_loaded(monkeypatch):
+    monkeypatch.setattr(outfit_suggestions_service, "PGVECTOR_ENABLED", True)
+    conn = FakeConnection(fetch=[item_row("a", build_item_feature_vector(["top"], [], [], [], []))])
+
+    asyncio.run(get_items_for_suggestions_service(FakePool(conn), "user-1", ["Summer"], None))
+
+    assert conn.calls[0].name == "items.for_suggestions"
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_outfit_vector_is_computed_on_arrays(monkeypatch, enabled):
+    monkeypatch.setattr(pgvector, "PGVECTOR_ENABLED", enabled)
+    top = build_item_feature_vector(["top"], ["black"], [], [], [])
+    shoes = build_item_feature_vector(["shoes"], ["black"], ["leather"], [], [])
+    # what the binary codec hands back in pgvector mode, Postgres arrays otherwise
+    rows = [pgvector.decode_vector(pgvector.encode_vector(v)) for v in (top, shoes)] if enabled else [top, shoes]
+    conn = FakeConnection(fetch=[{"attr_vector": v} for v in rows])
+
+    outfit_vec = asyncio.run(compute_and_store_outfit_vec(conn, "outfit-1"))
+
+    expected = l2_normalize([(a + b) / 2 for a, b in zip(l2_normalize(top), l2_normalize(shoes))])
+    assert outfit_vec.dtype == np.float32
+    assert outfit_vec.tolist() == pytest.approx(expected, abs=1e-6)
+    # only item vectors of the current schema are averaged
+    assert conn.called("fetch")[0].args == ("outfit-1", feature_encoder.schema_version)
+    stored = conn.called("execute")[0].args[1]
+    assert isinstance(stored, np.ndarray) if enabled else isinstance(stored, list)
+
+
+def test_ema_update_stays_normalized():
+    style = np.zeros(feature_encoder.dim, dtype=np.float32)
+    signal = build_item_feature_vector(["top"], ["black"], [], [], [])
+
+    updated = ema_update(style, signal, learning_rate=0.08)
+
+    assert updated.dtype == np.float32
+    assert np.isclose(np.linalg.norm(updated), 1.0)
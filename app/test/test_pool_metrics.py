@@ -0,0 +1,110 @@
+import asyncio
+
+from app.db import connection
+from app.db.connection import MeteredPool, PoolMetrics, warn_if_connection_held
+
+
+class FakeAsyncpgPool:
+    """Stands in for asyncpg.Pool: hands out one connection at a time."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.size = 1
+
+    async def acquire(self, timeout=None):
+        await self.lock.acquire()
+        return object()
+
+    async def release(self, conn):
+        self.lock.release()
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return 0 if self.lock.locked() else 1
+
+    def get_min_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 1
+
+
+def test_histogram_is_cumulative():
+    metrics = PoolMetrics()
+    metrics.observe(0.5)
+    metrics.observe(30)
+    metrics.observe(99999)
+
+    hist = metrics.histogram()
+    assert hist["le_1ms"] == 1
+    assert hist["le_50ms"] == 2
+    assert hist["le_5000ms"] == 2
+    assert hist["le_inf"] == 3
+
+
+def test_metered_pool_reports_waiting_and_in_use():
+    pool = MeteredPool(FakeAsyncpgPool())
+
+    async def run():
+        async with pool.acquire():
+            waiter = asyncio.create_task(pool.acquire().__aenter__())
+            await asyncio.sleep(0)
+            during = pool.stats()
+
+        conn = await waiter
+        await pool.raw.release(conn)
+        return during
+
+    during = asyncio.run(run())
+
+    assert during["in_use"] == 1
+    assert during["idle"] == 0
+    assert during["waiting"] == 1
+    assert pool.stats()["waiting"] == 0
+    assert pool.stats()["acquired_total"] == 2
+
+
+def test_read_only_acquire_goes_to_replica():
+    replica = MeteredPool(FakeAsyncpgPool(), "replica")
+    pool = MeteredPool(FakeAsyncpgPool(), "primary", replica=replica)
+
+    async def run():
+        async with pool.acquire(read_only=True):
+            pass
+        async with pool.acquire():
+            pass
+
+    asyncio.run(run())
+
+    assert replica.metrics.acquired_total == 1
+    assert pool.metrics.acquired_total == 1
+    assert [s["name"] for s in pool.all_stats()] == ["primary", "replica"]
+
+
+def test_read_only_acquire_without_replica_uses_primary():
+    pool = MeteredPool(FakeAsyncpgPool())
+
+    async def run():
+        async with pool.acquire(read_only=True):
+            pass
+
+    asyncio.run(run())
+    assert pool.metrics.acquired_total == 1
+
+
+def test_warns_when_connection_held_across_external_io(monkeypatch, caplog):
+    monkeypatch.setattr(connection, "DB_DEBUG_HELD_CONNECTIONS", True)
+    pool = MeteredPool(FakeAsyncpgPool())
+
+    async def run():
+        async with pool.acquire():
+            warn_if_connection_held("HTTP GET example.com")
+        warn_if_connection_held("HTTP GET example.com")
+
+    with caplog.at_level("WARNING"):
+        asyncio.run(run())
+
+    warnings = [r for r in caplog.records if "held across external I/O" in r.getMessage()]
+    assert len(warnings) == 1
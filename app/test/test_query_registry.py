@@ -0,0 +1,39 @@
+import asyncio
+
+from app.db import queries
+from conftest import FakeConnection
+
+
+class FakeStatement:
+    def __init__(self, sql):
+        self.sql = sql
+
+    async def fetch(self, *args):
+        return [{"sql": self.sql, "args": args}]
+
+    def get_statusmsg(self):
+        return "UPDATE 1"
+
+
+def test_statement_is_prepared_once_per_connection(pool_mode):
+    pool_mode("session")
+    conn = FakeConnection(prepare=FakeStatement)
+
+    async def run():
+        await queries.fetch_named(conn, "items.by_user", "user-1")
+        await queries.fetch_named(conn, "items.by_user", "user-2")
+        return await queries.fetch_named(conn, "items.by_user", "user-3")
+
+    rows = asyncio.run(run())
+
+    assert len(conn.called("prepare")) == 1
+    assert rows[0]["args"] == ("user-3",)
+    assert rows[0]["sql"] == queries.QUERIES["items.by_user"]
+
+
+def test_transaction_mode_disables_statement_cache(pool_mode):
+    pool_mode("transaction")
+    assert queries.pool_options()["statement_cache_size"] == 0
+
+    pool_mode("session")
+    assert "statement_cache_size" not in queries.pool_options()
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.helpers import vector_helpers
+from app.helpers.bit_vectors import pack_bits
+from app.helpers.vector_helpers import build_item_feature_vector, feature_encoder, remap_vector
+from app.jobs import revectorize
+from app.models import vector_
+from app.models.vector_ import ATTR_SCHEMA_VERSION, CATEGORIES, COLORS
+from conftest import FakeConnection, FakePool
+
+
+def test_remap_to_same_version_is_identity():
+    vec = [0.1] * feature_encoder.dim
+    assert remap_vector(vec, ATTR_SCHEMA_VERSION) == vec
+    assert remap_vector(vec, 99) is None
+
+
+def test_remap_moves_weights_between_layouts(monkeypatch):
+    old = [("colors", ["black", "teal", "other"]), ("seasons", ["summer", "winter"])]
+    new = [("colors", ["black", "white", "other"]), ("seasons", ["summer", "winter"])]
+    monkeypatch.setattr(vector_helpers, "ATTR_SCHEMA_HISTORY", {1: old, 2: new})
+    vector_helpers._remap_columns.cache_clear()
+
+    # teal was dropped from the vocabulary: its weight joins 'other'
+    assert remap_vector([0.5, 0.2, 0.1, 0.3, 0.0], 1, 2) == pytest.approx([0.5, 0.0, 0.3, 0.3, 0.0])
+    assert remap_vector([0.5, 0.2], 1, 2) is None
+    vector_helpers._remap_columns.cache_clear()
+
+
+def test_encode_items_matches_single_item_encoding():
+    rows = [(1, ["Black"], ["cotton"], [], ["Summer"]), (99, [], [], ["work"], [])]
+
+    vectors = revectorize.encode_items(rows)
+
+    expected = build_item_feature_vector(["top"], ["Black"], ["cotton"], [], ["Summer"])
+    assert vectors[0] == (expected, *pack_bits(expected))
+    assert vectors[1][0] == build_item_feature_vector([], [], [], ["work"], [])
+
+
+def test_outfit_vectors_average_normalized_items():
+    a = build_item_feature_vector(["top"], ["black"], [], [], [])
+    b = build_item_feature_vector(["bottom"], ["black"], [], [], [])
+
+    [vec, missing] = revectorize.outfit_vectors([[a, b], [a]])
+
+    assert missing is None
+    assert np.isclose(np.linalg.norm(vec), 1.0)
+    assert vec[len(CATEGORIES) + COLORS.index("black")] > vec[CATEGORIES.index("top")]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, n):
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+def test_items_are_streamed_and_written_per_batch():
+    rows = [
+        {"id": f"item-{i}", "category_id": 1, "colors": ["black"], "materials": [], "occasions": [], "seasons": []}
+        for i in range(5)
+    ]
+    conn = FakeConnection(cursor=lambda sql, version: FakeCursor(list(rows)))
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        done = asyncio.run(revectorize.revectorize_items(FakePool(conn), executor, batch_size=2))
+
+    writes = [call.args[0] for call in conn.called("executemany")]
+    assert done == 5
+    assert [len(batch) for batch in writes] == [2, 2, 1]
+    assert all(call.in_transaction for call in conn.called("executemany"))
+    item_id, vector, attr_bits, attr_bits_count, version = writes[0][0]
+    assert item_id == "item-0" and version == vector_.ATTR_SCHEMA_VERSION
+    assert vector == build_item_feature_vector(["top"], ["black"], [], [], [])
+
+
+def test_schema_history_is_frozen():
+    layout = vector_.ATTR_SCHEMA_HISTORY[1]
+
+    assert isinstance(layout, tuple) and all(isinstance(vocab, tuple) for _, vocab in layout)
+    assert vector_.COLORS is not dict(layout)["colors"]
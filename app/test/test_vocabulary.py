@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.db.vocabulary import VocabularyCache
+from conftest import FakeConnection
+
+
+class FakeDB:
+    def __init__(self):
+        self.fetches = 0
+        self.colors = [{"id": "c-black", "name": "black"}, {"id": "c-other", "name": "Other"}]
+
+    async def fetch(self, sql):
+        self.fetches += 1
+        if "colors_master" in sql:
+            return self.colors
+        if "materials_master" in sql:
+            return [{"id": "m-cotton", "name": "cotton"}]
+        if "occasions_master" in sql:
+            return [{"id": "o-work", "name": "work"}]
+        if "Seasons" in sql:
+            return [{"id": 1, "name": "Summer"}, {"id": 2, "name": "Winter"}]
+        return [{"id": 1, "name": "top"}]
+
+
+def test_lookups_hit_memory_not_the_database():
+    db = FakeDB()
+    cache = VocabularyCache(ttl_seconds=60)
+
+    async def run():
+        await cache.refresh(db)
+        loaded = db.fetches
+        vocab = await cache.get(db)
+        await cache.get(db)
+        return vocab, loaded
+
+    vocab, loaded = asyncio.run(run())
+
+    assert db.fetches == loaded
+    assert vocab.master_id("colors", " Black ") == "c-black"
+    assert vocab.master_id("colors", "chartreuse") == "c-other"
+    assert vocab.master_id("materials", "silk") is None
+    assert vocab.season_id("summer") == 1
+    assert vocab.season_id("monsoon") is None
+    assert vocab.options("colors") == [{"id": "c-black", "name": "Black"}, {"id": "c-other", "name": "Other"}]
+    assert vocab.categories == [{"id": 1, "name": "top"}]
+
+
+def test_ttl_reload_and_version_only_moves_on_change():
+    db = FakeDB()
+    cache = VocabularyCache(ttl_seconds=0)
+
+    async def run():
+        first = await cache.get(db)
+        same = await cache.get(db)
+        db.colors = db.colors + [{"id": "c-red", "name": "red"}]
+        changed = await cache.get(db)
+        return first, same, changed
+
+    first, same, changed = asyncio.run(run())
+
+    assert first.version == same.version == 1
+    assert changed.version == 2
+    assert changed.master_id("colors", "red") == "c-red"
+    # an old snapshot is never mutated by a reload
+    assert first.master_id("colors", "red") == "c-other"
+
+
+def test_failed_reload_serves_the_stale_copy():
+    db = FakeDB()
+    cache = VocabularyCache(ttl_seconds=0)
+
+    class DownDB:
+        async def fetch(self, sql):
+            raise ConnectionError("db down")
+
+    async def run():
+        await cache.refresh(db)
+        return await cache.get(DownDB())
+
+    assert asyncio.run(run()).version == 1
+
+
+def test_failed_reload_inside_a_transaction_is_raised():
+    db = FakeDB()
+    cache = VocabularyCache(ttl_seconds=0)
+
+    def failing(sql):
+        raise ConnectionError("statement failed")
+
+    conn = FakeConnection(fetch=failing)
+
+    async def run():
+        await cache.refresh(db)
+        # outside a transaction the stale copy is still served
+        assert (await cache.get(FakeConnection(fetch=failing))).version == 1
+        async with conn.transaction():
+            await cache.get(conn)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
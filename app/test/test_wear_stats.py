@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.queries import QUERIES
+from app.services.log_outfit_service import delete_logged_outfit_service, log_outfit_service
+from conftest import FakeConnection, FakePool
+
+pytestmark = pytest.mark.usefixtures("transaction_mode")
+
+
+def wear_log_connection(owned_row=None):
+    def fetchrow(sql, *args):
+        if sql == QUERIES["wear_log.insert"]:
+            return {"wear_log_id": "log-1", "outfit_id": args[1]}
+        return owned_row
+
+    return FakeConnection(fetchrow=fetchrow, fetchval=1, execute="OK")
+
+
+def names(conn):
+    return [call.name for call in conn.calls]
+
+
+def test_past_log_is_counted_right_away():
+    conn = wear_log_connection()
+
+    asyncio.run(log_outfit_service(FakePool(conn), "user-1", [], "outfit-1", worn_at="2025-01-05T10:00:00"))
+
+    assert names(conn) == ["wear_log.insert", "wear_stats.apply_due", "wear_stats.add_log", "user_version.bump"]
+
+
+def test_future_log_waits_in_pending():
+    conn = wear_log_connection()
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+
+    asyncio.run(log_outfit_service(FakePool(conn), "user-1", [], "outfit-1", worn_at=tomorrow))
+
+    assert names(conn)[-2:] == ["wear_stats.add_pending", "user_version.bump"]
+    assert conn.calls[-2].args[:2] == ("log-1", "outfit-1")
+
+
+def test_deleting_a_counted_log_updates_stats():
+    worn_at = datetime(2025, 1, 5, tzinfo=timezone.utc)
+    conn = wear_log_connection({"id": "log-1", "outfit_id": "outfit-1", "worn_at": worn_at, "pending": False})
+
+    asyncio.run(delete_logged_outfit_service(FakePool(conn), "user-1", "log-1"))
+
+    assert names(conn) == [
+        "wear_stats.apply_due",
+        "wear_log.owned_by_user",
+        "wear_log.delete",
+        "wear_stats.remove_log",
+        "user_version.bump",
+    ]
+    assert conn.calls[-2].args == ("outfit-1", worn_at)
+
+
+def test_deleting_a_pending_log_leaves_stats_alone():
+    worn_at = datetime.now(timezone.utc) + timedelta(days=3)
+    conn = wear_log_connection({"id": "log-1", "outfit_id": "outfit-1", "worn_at": worn_at, "pending": True})
+
+    asyncio.run(delete_logged_outfit_service(FakePool(conn), "user-1", "log-1"))
+
+    assert "wear_stats.remove_log" not in names(conn)
@@ -1,77 +1,124 @@
 # Helper: UPSERT TAGS (colors, materials, seasons, occasions)
-from typing import Optional
+from app.db.vocabulary import vocabulary
 
-from app.helpers.vector_helpers import normalize_label
 
+# Tag families stored per user: user table, pivot table, pivot column, master mapping column
+# (the master tables themselves are read through app/db/vocabulary.py)
+TAG_FAMILIES = {
+    "colors": {
+        "table": "Colors",
+        "pivot_table": "ItemColors",
+        "pivot_field": "color_id",
+        "mapped_field": "mapped_color_id",
+    },
+    "materials": {
+        "table": "Materials",
+        "pivot_table": "ItemMaterials",
+        "pivot_field": "material_id",
+        "mapped_field": "mapped_material_id",
+    },
+    "occasions": {
+        "table": "Occasions",
+        "pivot_table": "ItemOccasions",
+        "pivot_field": "occasion_id",
+        "mapped_field": "mapped_occasion_id",
+    },
+}
 
-async def upsert_tags(conn, table_name, pivot_table, pivot_field, mapped_field ,master_table, item_id, user_id, tags):
-    """
-    Inserts tags (like Colors, Materials, Seasons...) OR returns existing ones.
-
-    Then links the tag to the item via pivot table.
-    """
-    if not tags:
-        return
 
-    for tag in tags:
-        original_tag = (tag or "").strip()
-        normalized_tag = original_tag.lower()
-        if not normalized_tag:
-            continue
+def clean_tags(tags) -> list[str]:
+    """Trimmed, non empty tag names (original casing kept, it is what the user sees)."""
+    return [tag.strip() for tag in (tags or []) if tag and tag.strip()]
 
-        mapped_master_id = await get_master_id_by_name(conn, master_table, original_tag)
 
-        # Insert new tag
-        tag_id = await conn.fetchval(
-            f"""
-            INSERT INTO {table_name} (user_id, name, {mapped_field})
-            VALUES ($1, $2, $3)
-            ON CONFLICT(user_id, name)
+def _upsert_and_link_sql(family: dict) -> str:
+    # One statement per family: upsert the user's tags (name + master id pairs)
+    # and link them to the item.
+    # DISTINCT because ON CONFLICT DO UPDATE cannot touch the same row twice.
+    return f"""
+        WITH input AS (
+            SELECT DISTINCT name, master_id
+            FROM unnest($3::text[], $4::uuid[]) AS t(name, master_id)
+        ),
+        tags AS (
+            INSERT INTO {family["table"]} (user_id, name, {family["mapped_field"]})
+            SELECT $2::uuid, name, master_id FROM input
+            ON CONFLICT (user_id, name)
             DO UPDATE SET name = EXCLUDED.name,
-                {mapped_field} = EXCLUDED.{mapped_field}
-            RETURNING id;
-            """,
-            user_id,
-            original_tag,
-            mapped_master_id
+                {family["mapped_field"]} = EXCLUDED.{family["mapped_field"]}
+            RETURNING id
         )
+        INSERT INTO {family["pivot_table"]} (item_id, {family["pivot_field"]})
+        SELECT $1::uuid, id FROM tags
+        ON CONFLICT DO NOTHING;
+    """
+
+
+def _unlink_sql(family: dict) -> str:
+    return f"""
+        DELETE FROM {family["pivot_table"]} p
+        USING {family["table"]} t
+        WHERE p.item_id = $1::uuid
+          AND p.{family["pivot_field"]} = t.id
+          AND t.name = ANY($2::text[]);
+    """
+
+
+_UPSERT_AND_LINK_SQL = {name: _upsert_and_link_sql(family) for name, family in TAG_FAMILIES.items()}
+_UNLINK_SQL = {name: _unlink_sql(family) for name, family in TAG_FAMILIES.items()}
 
-        # Create relation (item ↔ tag)
-        await conn.execute(
-            f"""
-            INSERT INTO {pivot_table} (item_id, {pivot_field})
-            VALUES ($1::uuid, $2)
-            ON CONFLICT DO NOTHING;
-            """,
-            item_id,
-            tag_id
-        )
 
-async def get_master_id_by_name(conn, master_table: str, raw_name: str) -> Optional[str]:
+async def upsert_tags(conn, family: str, item_id, user_id, tags):
     """
-    Find matching master id by normalized name.
-    Falls back to 'other' if exact match does not exist.
+    Inserts the user's tags of one family (colors, materials, occasions) OR updates
+    existing ones, and links them all to the item. One round trip for the whole list;
+    master ids come from the vocabulary cache.
     """
-    normalized = normalize_label(raw_name)
-
-    row = await conn.fetchrow(
-        f"""
-        SELECT id
-        FROM {master_table}
-        WHERE LOWER(name) = $1
-        LIMIT 1;
+    names = clean_tags(tags)
+    if not names:
+        return
+
+    vocab = await vocabulary.get(conn)
+    master_ids = [vocab.master_id(family, name) for name in names]
+
+    await conn.execute(_UPSERT_AND_LINK_SQL[family], item_id, user_id, names, master_ids)
+
+
+async def unlink_tags(conn, family: str, item_id, names):
+    """Removes the item's links to the named tags (the user's tags themselves stay)."""
+    if not names:
+        return
+
+    await conn.execute(_UNLINK_SQL[family], item_id, list(names))
+
+
+async def link_seasons(conn, item_id, season_names):
+    """Seasons are a fixed global list: link the known ones (ids from the cache) in one statement."""
+    vocab = await vocabulary.get(conn)
+    season_ids = [vocab.season_id(name) for name in (season_names or [])]
+    season_ids = [season_id for season_id in season_ids if season_id is not None]
+    if not season_ids:
+        return
+
+    await conn.execute(
+        """
+        INSERT INTO ItemSeasons (item_id, season_id)
+        SELECT $1::uuid, s.id
+        FROM Seasons s
+        WHERE s.id = ANY($2)
+        ON CONFLICT DO NOTHING;
         """,
-        normalized
+        item_id,
+        season_ids,
     )
-    if row:
-        return row["id"]
-
-    other_row = await conn.fetchrow(
-        f"""
-        SELECT id
-        FROM {master_table}
-        WHERE LOWER(name) = 'other'
-        LIMIT 1;
-        """
+
+
+async def unlink_seasons(conn, item_id, season_ids):
+    if not season_ids:
+        return
+
+    await conn.execute(
+        "DELETE FROM ItemSeasons WHERE item_id = $1::uuid AND season_id = ANY($2);",
+        item_id,
+        list(season_ids),
     )
-    return other_row["id"] if other_row else None
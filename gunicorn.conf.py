@@ -0,0 +1,62 @@
+# Production server: gunicorn master + uvicorn workers.
+#   gunicorn main:app -c gunicorn.conf.py
+# Every setting can be overridden with the env vars below.
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Every worker opens its own DB pool, so the app holds up to workers x DB_POOL_MAX_SIZE
+# connections. With DB_CONNECTION_BUDGET set (the share of the Postgres / pooler limit this
+# deployment may use) the worker count is derived from it; WEB_CONCURRENCY still wins.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_CONNECTION_BUDGET = os.getenv("DB_CONNECTION_BUDGET")
+
+if os.getenv("WEB_CONCURRENCY"):
+    workers = int(os.environ["WEB_CONCURRENCY"])
+elif DB_CONNECTION_BUDGET:
+    workers = max(1, int(DB_CONNECTION_BUDGET) // DB_POOL_MAX_SIZE)
+else:
+    workers = 2
+
+# Background removal model: with several workers it is loaded once in the master
+# (when_ready) and shared copy-on-write. onnxruntime thread pools do not survive
+# fork(), and workers x threads would oversubscribe the cores anyway, so the shared
+# session gets BG_MODEL_THREADS intra-op threads (rembg reads OMP_NUM_THREADS).
+# Set here, before the app is preloaded. A single worker loads its own session
+# with onnxruntime's default threading.
+SHARE_BG_MODEL = workers > 1
+if SHARE_BG_MODEL:
+    os.environ.setdefault("OMP_NUM_THREADS", os.getenv("BG_MODEL_THREADS", "1"))
+
+# uvicorn picks uvloop and httptools when they are installed ("auto")
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# import the app (and the heavy state below) once in the master, then fork
+preload_app = True
+
+# a worker that stops heartbeating for this long is killed; above the try-on deadline
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# on SIGTERM / reload, in-flight requests get this long to finish
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# recycle workers now and then, jitter avoids restarting them all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # runs in the master after the app is preloaded and before any worker is forked
+    if SHARE_BG_MODEL:
+        from app.config.bg_model import get_bg_session
+
+        get_bg_session()
+        server.log.info("Background removal model preloaded")
+
+    # move everything allocated so far out of the GC's reach, so collections in the
+    # workers do not touch (and copy) the shared pages
+    gc.freeze()
@@ -1,9 +1,14 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from supabase import create_client
 from app.db.connection import connect_to_db, close_db
-from rembg import  new_session
+from app.db.vocabulary import vocabulary
+from app.config.http_client import create_http_client, close_http_client
+from app.config.storage import create_storage, STORAGE_BACKEND, LOCAL_STORAGE_DIR, LOCAL_STORAGE_MOUNT_PATH
+from app.config.bg_model import get_bg_session
+from app.helpers.json_response import FastJSONResponse
 from app.api.user_api import router as user_router
 from app.api.item_api import router as item_router
 from app.api.bg_api import router as bg_router
@@ -20,6 +25,7 @@ from app.api.outfit_preference_api import router as preference_router
 from app.api.favorites_api import router as favorites_router
 from app.api.virtual_try_on_api import router as tryon_router
 from app.api.consent_api import router as consent_router
+from app.api.internal_api import router as internal_router
 from fastapi.staticfiles import StaticFiles
 
 
@@ -27,12 +33,17 @@ from fastapi.staticfiles import StaticFiles
 
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 import os
 
 os.makedirs("generated_tryons", exist_ok=True)
 app.mount("/generated_tryons", StaticFiles(directory="generated_tryons"), name="generated_tryons")
 
+if STORAGE_BACKEND == "local":
+    # serves files written by the local storage backend (dev / load tests)
+    os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(LOCAL_STORAGE_MOUNT_PATH, StaticFiles(directory=LOCAL_STORAGE_DIR), name="local_storage")
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -40,13 +51,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# compress JSON bodies above GZIP_MIN_SIZE bytes (wardrobe, favorites, ...)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")),
+    compresslevel=int(os.getenv("GZIP_COMPRESS_LEVEL", "6")),
 )
 
 
 @app.on_event("startup")
 async def startup():
     app.state.db = await connect_to_db()
-    app.state.bg_session = new_session("u2net") #Loads the expensive bg removal model once
+    await vocabulary.refresh(app.state.db) #master vocabularies, seasons, categories
+    app.state.http = create_http_client() #shared pooled client for outbound calls
+    app.state.storage = create_storage() #supabase or local directory
+    app.state.bg_session = get_bg_session() #Loads the expensive bg removal model once (preloaded under gunicorn)
 
 
 # Mount routers
@@ -66,10 +88,12 @@ app.include_router(preference_router)
 app.include_router(favorites_router)
 app.include_router(tryon_router)
 app.include_router(consent_router)
+app.include_router(internal_router)
 
 
 @app.on_event("shutdown")
 async def shutdown():
+    await close_http_client(app.state.http)
     await close_db(app.state.db)
 
 
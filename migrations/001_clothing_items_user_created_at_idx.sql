@@ -0,0 +1,5 @@
+-- Keyset pagination for GET /items/user/{user_id}:
+-- ORDER BY created_at DESC, id DESC filtered by user_id walks this index,
+-- so every page costs the same no matter how deep the cursor is.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS clothingitems_user_created_at_id_idx
+    ON ClothingItems (user_id, created_at DESC, id DESC);
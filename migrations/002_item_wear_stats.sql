@@ -0,0 +1,61 @@
+-- Per-item wear statistics, maintained by the wear log services
+-- (app/services/log_outfit_service.py) instead of being recomputed from
+-- OutfitItems x outfit_wear_log on every read.
+--
+-- Logs dated in the future do not count until their time comes. They are parked in
+-- item_wear_pending; reads add the pending rows that are already due, and
+-- the next log / delete for that user folds them into item_wear_stats.
+
+CREATE TABLE IF NOT EXISTS item_wear_stats (
+    item_id       uuid PRIMARY KEY REFERENCES ClothingItems(id) ON DELETE CASCADE,
+    user_id       uuid NOT NULL,
+    wear_count    integer NOT NULL DEFAULT 0,
+    first_worn_at timestamptz,
+    last_worn_at  timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS item_wear_stats_user_idx
+    ON item_wear_stats (user_id);
+
+CREATE TABLE IF NOT EXISTS item_wear_pending (
+    wear_log_id uuid NOT NULL REFERENCES outfit_wear_log(id) ON DELETE CASCADE,
+    item_id     uuid NOT NULL REFERENCES ClothingItems(id) ON DELETE CASCADE,
+    user_id     uuid NOT NULL,
+    worn_at     timestamptz NOT NULL,
+    PRIMARY KEY (wear_log_id, item_id)
+);
+
+CREATE INDEX IF NOT EXISTS item_wear_pending_user_worn_at_idx
+    ON item_wear_pending (user_id, worn_at);
+CREATE INDEX IF NOT EXISTS item_wear_pending_item_idx
+    ON item_wear_pending (item_id, worn_at);
+
+-- ClothingItems.last_worn_at is no longer written: reads take it from the tables
+-- above. Dropped so "ci.*" never sends a stale copy (or a second last_worn_at
+-- column next to the computed one).
+ALTER TABLE ClothingItems DROP COLUMN IF EXISTS last_worn_at;
+
+-- Backfill / rebuild from the full history. Safe to re-run, e.g. right after
+-- deploying the code that maintains the tables. Like the online path, a log
+-- counts once per item even if the outfit lists that item twice.
+BEGIN;
+
+DELETE FROM item_wear_stats;
+DELETE FROM item_wear_pending;
+
+INSERT INTO item_wear_stats (item_id, user_id, wear_count, first_worn_at, last_worn_at)
+SELECT oi.item_id, ci.user_id, COUNT(DISTINCT owl.id), MIN(owl.worn_at), MAX(owl.worn_at)
+FROM outfit_wear_log owl
+JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
+JOIN ClothingItems ci ON ci.id = oi.item_id
+WHERE owl.worn_at <= NOW()
+GROUP BY oi.item_id, ci.user_id;
+
+INSERT INTO item_wear_pending (wear_log_id, item_id, user_id, worn_at)
+SELECT DISTINCT owl.id, oi.item_id, ci.user_id, owl.worn_at
+FROM outfit_wear_log owl
+JOIN OutfitItems oi ON oi.outfit_id = owl.outfit_id
+JOIN ClothingItems ci ON ci.id = oi.item_id
+WHERE owl.worn_at > NOW();
+
+COMMIT;
@@ -0,0 +1,8 @@
+-- Per-user data version behind the ETags of the wardrobe / favorites /
+-- subcategory GET endpoints. Bumped in the same transaction as every item,
+-- outfit, wear log and subcategory mutation (app/services/user_version_service.py).
+CREATE TABLE IF NOT EXISTS user_data_versions (
+    user_id    uuid PRIMARY KEY,
+    version    bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
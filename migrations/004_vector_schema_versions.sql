@@ -0,0 +1,9 @@
+-- Schema version of the derived vectors, so app/jobs/revectorize.py can find
+-- the ones encoded with an older vocabulary (app/models/vector_.py).
+-- Everything stored so far was written with version 1.
+ALTER TABLE Outfits ADD COLUMN IF NOT EXISTS attr_schema_version smallint NOT NULL DEFAULT 1;
+ALTER TABLE Users ADD COLUMN IF NOT EXISTS style_schema_version smallint NOT NULL DEFAULT 1;
+
+-- the job streams stale items by version
+CREATE INDEX IF NOT EXISTS clothingitems_attr_schema_version_idx
+    ON ClothingItems (attr_schema_version);
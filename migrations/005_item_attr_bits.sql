@@ -0,0 +1,5 @@
+-- Bit-packed copy of attr_vector (app/helpers/bit_vectors.py): 7 bytes for
+-- the 54 dims of schema 1, plus the number of set bits. Suggestions score
+-- items from these. Existing rows are filled by `python -m app.jobs.revectorize`.
+ALTER TABLE ClothingItems ADD COLUMN IF NOT EXISTS attr_bits bytea;
+ALTER TABLE ClothingItems ADD COLUMN IF NOT EXISTS attr_bits_count smallint;
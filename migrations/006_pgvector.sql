@@ -0,0 +1,18 @@
+-- Optional: only for VECTOR_BACKEND=pgvector (app/db/pgvector.py). Apply it
+-- together with that setting, the app reads these columns through the
+-- vector codec registered in that mode.
+--
+-- Columns are dimension-less `vector`, so a schema change with a new length
+-- does not need another ALTER (app/jobs/revectorize.py rewrites the values).
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE ClothingItems ALTER COLUMN attr_vector TYPE vector USING attr_vector::real[]::vector;
+ALTER TABLE Outfits ALTER COLUMN outfit_vec TYPE vector USING outfit_vec::real[]::vector;
+ALTER TABLE Users ALTER COLUMN style_vec TYPE vector USING style_vec::real[]::vector;
+
+-- The shortlist (items.shortlist_by_style) ranks one user's items per
+-- category: an exact cosine scan over the rows this index finds. An ANN index
+-- (HNSW / IVFFlat) needs a fixed dimension and would rank across all users
+-- before the user filter, so it does not fit this query.
+CREATE INDEX IF NOT EXISTS clothingitems_user_category_idx
+    ON ClothingItems (user_id, category_id);